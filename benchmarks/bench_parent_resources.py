@@ -0,0 +1,85 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Stress-tests parent resource resolution with thousands of resources.
+
+Every child resource has several patterns whose parents are spread over
+single-pattern resources, and a share of the children have one parent
+pattern that no resource defines, which is the case that made the old
+backtracking search exponential.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_parent_resources.py
+"""
+
+from __future__ import print_function
+
+import argparse
+import random
+import timeit
+
+from plugin.pb2 import resource_pb2
+from plugin.utils import gapic_utils
+
+
+def _resources(count, parents_per_child, seed=0):
+    rng = random.Random(seed)
+    resources = []
+    children = []
+    for i in range(count // (parents_per_child + 1)):
+        parent_patterns = ['p%d/{p}/s%d/{s%d}' % (i, j, j)
+                           for j in range(parents_per_child)]
+        for pattern in parent_patterns:
+            resources.append(resource_pb2.ResourceDescriptor(
+                type='test/Parent%d' % len(resources), pattern=[pattern]))
+        if rng.random() < 0.2:
+            parent_patterns.append('missing%d/{m}' % i)
+        child = resource_pb2.ResourceDescriptor(
+            type='test/Child%d' % i,
+            pattern=[p + '/cs/{c}' for p in parent_patterns])
+        children.append(child)
+    rng.shuffle(resources)
+    return resources + children, children
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 4000, 16000])
+    parser.add_argument('--parents-per-child', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('%10s %10s %10s %14s' % ('resources', 'children', 'index (s)',
+                                   'resolve (s)'))
+    for size in args.sizes:
+        all_resources, children = _resources(size, args.parents_per_child)
+        index_time = min(timeit.repeat(
+            lambda: gapic_utils.ParentResourceIndex(all_resources),
+            number=1, repeat=args.repeat))
+        index = gapic_utils.ParentResourceIndex(all_resources)
+
+        def resolve_all():
+            for child in children:
+                gapic_utils.get_parent_resources(
+                    child, {}, all_resources, index)
+
+        resolve_time = min(timeit.repeat(resolve_all, number=1,
+                                         repeat=args.repeat))
+        print('%10d %10d %10.4f %14.4f' % (
+            len(all_resources), len(children), index_time, resolve_time))
+
+
+if __name__ == '__main__':
+    main()
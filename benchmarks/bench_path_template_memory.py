@@ -0,0 +1,68 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures the memory held by parsed path templates.
+
+Compares the compact representation with the same templates once their
+per-segment tuples have been materialized, as they were before.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_path_template_memory.py
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import tracemalloc
+
+from patterns import generate_patterns
+from plugin.utils import path_template
+
+
+def _allocated(function):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 4000])
+    args = parser.parse_args()
+
+    print('%8s %16s %16s' % ('patterns', 'compact (B/tpl)',
+                             'segments (B/tpl)'))
+    for size in args.sizes:
+        patterns = generate_patterns(size)
+        # Keep the parsers out of the measurement.
+        path_template.clear_template_cache()
+        path_template.PathTemplate('warm/{up}')
+        templates, compact = _allocated(
+            lambda: [path_template.PathTemplate(p)._parsed
+                     for p in patterns])
+        _, segments = _allocated(
+            lambda: [t.segments for t in templates])
+        print('%8d %16.0f %16.0f' % (size, float(compact) / size,
+                                     float(compact + segments) / size))
+
+
+if __name__ == '__main__':
+    main()
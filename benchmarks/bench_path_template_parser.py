@@ -0,0 +1,60 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compares the ply and linear path template parser backends.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_path_template_parser.py
+"""
+
+from __future__ import print_function
+
+import argparse
+import timeit
+
+from patterns import generate_patterns
+from plugin.utils import path_template
+
+
+def _time_backend(parser_class, patterns, repeat):
+    parser = parser_class()
+
+    def parse_all():
+        for pattern in patterns:
+            parser.parse(pattern)
+
+    return min(timeit.repeat(parse_all, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('%8s %12s %12s %8s' % ('patterns', 'ply (s)', 'linear (s)',
+                                 'speedup'))
+    for size in args.sizes:
+        patterns = generate_patterns(size)
+        ply_time = _time_backend(path_template._Parser, patterns,
+                                 args.repeat)
+        linear_time = _time_backend(path_template._LinearParser, patterns,
+                                    args.repeat)
+        print('%8d %12.4f %12.4f %7.1fx' % (
+            size, ply_time, linear_time, ply_time / linear_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures PathTemplate.render throughput against the binding count.
+
+Compares the render plan, the render plan with validation, and the
+previous implementation, which parsed every binding value into a new
+template and always matched the result. Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_path_template_render.py
+"""
+
+from __future__ import print_function
+
+import argparse
+import timeit
+
+from plugin.utils import path_template
+from plugin.utils.path_template import PathTemplate
+
+
+def _legacy_render(template, bindings):
+    out = []
+    binding = False
+    for segment in template.segments:
+        if segment.kind == path_template._BINDING:
+            out.extend(path_template._Parser().parse(
+                bindings[segment.literal]))
+            binding = True
+        elif segment.kind == path_template._END_BINDING:
+            binding = False
+        elif not binding:
+            out.append(segment)
+    path = path_template._format(out)
+    template.match(path)
+    return path
+
+
+def _renders_per_second(render, number):
+    seconds = min(timeit.repeat(render, number=number, repeat=3))
+    return number / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bindings', type=int, nargs='+',
+                        default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--number', type=int, default=2000)
+    parser.add_argument('--legacy-number', type=int, default=20)
+    args = parser.parse_args()
+
+    print('%8s %14s %14s %14s' % ('bindings', 'plan (/s)', 'validate (/s)',
+                                  'legacy (/s)'))
+    for count in args.bindings:
+        pattern = '/'.join('things%d/{thing%d}' % (i, i)
+                           for i in range(count))
+        template = PathTemplate(pattern)
+        bindings = dict(('thing%d' % i, 'value%d' % i)
+                        for i in range(count))
+        assert template.render(bindings) == _legacy_render(template,
+                                                           bindings)
+        plan = _renders_per_second(lambda: template.render(bindings),
+                                   args.number)
+        validated = _renders_per_second(
+            lambda: template.render(bindings, validate=True), args.number)
+        legacy = _renders_per_second(
+            lambda: _legacy_render(template, bindings), args.legacy_number)
+        print('%8d %14.0f %14.0f %14.0f' % (count, plan, validated, legacy))
+
+
+if __name__ == '__main__':
+    main()
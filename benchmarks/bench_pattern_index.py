@@ -0,0 +1,65 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures how pattern overlap and shadowing checks scale.
+
+Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_pattern_index.py
+"""
+
+from __future__ import print_function
+
+import argparse
+import timeit
+
+from patterns import generate_patterns
+from plugin.utils import pattern_index
+
+
+def _build(patterns):
+    index = pattern_index.PatternIndex()
+    for position, pattern in enumerate(patterns):
+        # Group patterns into resources of four, like multi-pattern
+        # resources, so that the shadowing check has work to do.
+        index.add(pattern, position // 4, position % 4)
+    return index
+
+
+def _best(function, repeat):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 4000, 16000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('%8s %10s %12s %12s %10s' % ('patterns', 'build (s)',
+                                       'overlaps (s)', 'shadowed (s)',
+                                       'us/pattern'))
+    for size in args.sizes:
+        patterns = generate_patterns(size)
+        build_time = _best(lambda: _build(patterns), args.repeat)
+        index = _build(patterns)
+        overlap_time = _best(index.find_overlaps, args.repeat)
+        shadow_time = _best(index.find_shadowed, args.repeat)
+        total = build_time + overlap_time + shadow_time
+        print('%8d %10.4f %12.4f %12.4f %10.1f' % (
+            size, build_time, overlap_time, shadow_time, total / size * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Checks the import time and cold start of the protoc plugin entry point.
+
+Each measurement runs in a fresh interpreter: `python -X importtime` for
+the import of plugin.cli.gapic_plugin, and the plugin itself on a request
+for the cold start. The medians are compared with their budgets, and the
+script exits with status 1 when either is over. Before Python 3.7, which
+has no -X importtime, the import is timed as a whole, without the list of
+the slowest imports.
+
+Run from the repository root, or with `tox -e startup`:
+
+    PYTHONPATH=. python benchmarks/bench_startup.py
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from google.protobuf.compiler import plugin_pb2
+
+ENTRY_POINT = 'plugin.cli.gapic_plugin'
+DEFAULT_IMPORT_BUDGET_MS = 150
+DEFAULT_STARTUP_BUDGET_MS = 400
+
+_TIME_IMPORT = (
+    'import time; start = time.time(); import {}; '
+    'print(int((time.time() - start) * 1e6))').format(ENTRY_POINT)
+
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def _small_request():
+    # A request with a java package and no resources or GAPIC YAML, which
+    # is the least work the plugin does.
+    request = plugin_pb2.CodeGeneratorRequest(file_to_generate=['a.proto'])
+    proto_file = request.proto_file.add(name='a.proto', package='a')
+    proto_file.options.java_package = 'com.example.a'
+    return request.SerializeToString()
+
+
+def _import_times(env):
+    # Returns the cumulative import times, in microseconds, by module.
+    if sys.version_info < (3, 7):
+        output = subprocess.check_output(
+            [sys.executable, '-c', _TIME_IMPORT], env=env)
+        return {ENTRY_POINT: int(output)}
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + ENTRY_POINT],
+        stderr=subprocess.STDOUT, env=env).decode('utf-8')
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def _cold_start(env, request):
+    start = time.time()
+    process = subprocess.Popen([sys.executable, '-m', ENTRY_POINT],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               env=env)
+    process.communicate(request)
+    if process.returncode:
+        raise RuntimeError('the plugin failed on the request')
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--import-budget-ms', type=float,
+                        default=DEFAULT_IMPORT_BUDGET_MS)
+    parser.add_argument('--startup-budget-ms', type=float,
+                        default=DEFAULT_STARTUP_BUDGET_MS)
+    parser.add_argument('--request',
+                        help='a serialized CodeGeneratorRequest to run, '
+                        'instead of a request without resources')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--top', type=int, default=10,
+                        help='slowest imports to list')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        p for p in [os.getcwd(), env.get('PYTHONPATH')] if p)
+    if args.request:
+        with open(args.request, 'rb') as f:
+            request = f.read()
+    else:
+        request = _small_request()
+
+    runs = [_import_times(env) for _ in range(args.repeat)]
+    import_ms = _median(r[ENTRY_POINT] for r in runs) / 1000.0
+    startup_ms = _median(_cold_start(env, request)
+                         for _ in range(args.repeat)) * 1000
+
+    print('slowest imports (cumulative ms):')
+    slowest = sorted(runs[-1].items(), key=lambda item: -item[1])
+    for name, cumulative in slowest[:args.top]:
+        print('%10.1f  %s' % (cumulative / 1000.0, name))
+    print()
+    failed = False
+    for label, value, budget in [('import', import_ms, args.import_budget_ms),
+                                 ('cold start', startup_ms,
+                                  args.startup_budget_ms)]:
+        over = value > budget
+        failed = failed or over
+        print('%-10s %8.1f ms  (budget %.0f ms)%s' % (
+            label, value, budget, '  OVER BUDGET' if over else ''))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
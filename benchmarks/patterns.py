@@ -0,0 +1,64 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Synthetic resource name patterns shaped like the googleapis corpus."""
+
+import random
+
+PARENTS = [
+    'projects/{project}',
+    'projects/{project}/locations/{location}',
+    'organizations/{organization}',
+    'organizations/{organization}/locations/{location}',
+    'folders/{folder}',
+    'billingAccounts/{billing_account}',
+]
+
+COLLECTIONS = [
+    'instances', 'databases', 'tables', 'topics', 'subscriptions',
+    'snapshots', 'jobs', 'datasets', 'models', 'endpoints', 'clusters',
+    'nodePools', 'backups', 'keyRings', 'cryptoKeys', 'secrets', 'versions',
+    'services', 'revisions', 'triggers', 'queues', 'tasks', 'buckets',
+    'sinks', 'metrics', 'exclusions', 'notes', 'occurrences', 'policies',
+]
+
+
+def _singular(collection):
+    name = collection[:-1] if collection.endswith('s') else collection
+    return ''.join('_' + c.lower() if c.isupper() else c for c in name)
+
+
+def generate_patterns(count, seed=0):
+    """Returns count distinct patterns, each one to four collections deep.
+
+    Collection names get a numeric suffix once the plain combinations run
+    out, so large sets keep the same shape as small ones.
+    """
+    rng = random.Random(seed)
+    patterns = []
+    seen = set()
+    while len(patterns) < count:
+        segments = [rng.choice(PARENTS)]
+        for depth in range(rng.randint(1, 4)):
+            collection = rng.choice(COLLECTIONS)
+            if len(seen) > 1000:
+                collection += str(rng.randint(0, count))
+            variable = _singular(collection) + ('_id' if depth else '')
+            if rng.random() < 0.05:
+                variable += '=**'
+            segments.append('%s/{%s}' % (collection, variable))
+        pattern = '/'.join(segments)
+        if pattern.count('**') < 2 and pattern not in seen:
+            seen.add(pattern)
+            patterns.append(pattern)
+    return patterns
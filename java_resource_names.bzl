@@ -0,0 +1,96 @@
+"""Generates resource name classes with the gapic_plugin persistent worker.
+
+Example:
+
+    load(
+        "@com_google_protoc_java_resource_names_plugin//:java_resource_names.bzl",
+        "java_resource_names_srcjar",
+    )
+
+    java_resource_names_srcjar(
+        name = "library_resource_names",
+        deps = [":library_proto"],
+        gapic_yaml = "library_gapic.yaml",
+    )
+
+The rule writes <name>.srcjar. Its action runs in a persistent worker,
+multiplexed when Bazel supports it. The worker does not support
+cancellation, so the action does not set supports-worker-cancellation.
+"""
+
+def _import_path(src, proto_source_root):
+    # The path that protoc knows the file by, relative to its source root.
+    if proto_source_root in ("", "."):
+        return src.short_path
+    if src.path.startswith(proto_source_root + "/"):
+        return src.path[len(proto_source_root) + 1:]
+    return src.short_path
+
+def _java_resource_names_srcjar_impl(ctx):
+    descriptor_sets = depset(transitive = [
+        dep[ProtoInfo].transitive_descriptor_sets
+        for dep in ctx.attr.deps
+    ])
+    files_to_generate = []
+    for dep in ctx.attr.deps:
+        info = dep[ProtoInfo]
+        for src in info.direct_sources:
+            files_to_generate.append(
+                _import_path(src, info.proto_source_root),
+            )
+
+    parameter = list(ctx.attr.opts)
+    inputs = [descriptor_sets]
+    if ctx.file.gapic_yaml:
+        parameter.insert(0, ctx.file.gapic_yaml.path)
+        inputs = [depset([ctx.file.gapic_yaml])] + inputs
+
+    args = ctx.actions.args()
+    args.add_joined(
+        "--descriptor_set_in",
+        descriptor_sets,
+        join_with = ctx.configuration.host_path_separator,
+    )
+    args.add_all(files_to_generate, format_each = "--file_to_generate=%s")
+    args.add(",".join(parameter), format = "--parameter=%s")
+    args.add(ctx.outputs.srcjar, format = "--output=%s")
+    # Workers take the arguments of each action from a flagfile.
+    args.use_param_file("@%s", use_always = True)
+    args.set_param_file_format("multiline")
+
+    ctx.actions.run(
+        executable = ctx.executable._plugin,
+        arguments = [args],
+        inputs = depset(transitive = inputs),
+        outputs = [ctx.outputs.srcjar],
+        mnemonic = "JavaResourceNames",
+        progress_message = "Generating resource names for %s" % ctx.label,
+        execution_requirements = {
+            "supports-workers": "1",
+            "supports-multiplex-workers": "1",
+        },
+    )
+
+java_resource_names_srcjar = rule(
+    implementation = _java_resource_names_srcjar_impl,
+    attrs = {
+        "deps": attr.label_list(
+            mandatory = True,
+            providers = [ProtoInfo],
+            doc = "The proto_library targets to generate classes for.",
+        ),
+        "gapic_yaml": attr.label(
+            allow_single_file = [".yaml", ".yml"],
+            doc = "The GAPIC YAML file, if any.",
+        ),
+        "opts": attr.string_list(
+            doc = "More plugin options, such as render_cache_dir=DIR.",
+        ),
+        "_plugin": attr.label(
+            default = Label("//:gapic_plugin"),
+            executable = True,
+            cfg = "host",
+        ),
+    },
+    outputs = {"srcjar": "%{name}.srcjar"},
+)
@@ -0,0 +1,317 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Runs the plugin on many requests in one pool of processes.
+
+Regenerating many APIs with protoc starts the plugin once per API. This
+command instead takes the serialized CodeGeneratorRequests that protoc
+would pass to the plugin, and runs them in a pool whose processes keep
+their caches from one request to the next.
+
+Usage:
+
+    java-resource-names-batch [--jobs N] --output-dir DIR REQUEST [...]
+    java-resource-names-batch [--jobs N] --output-dir DIR --manifest FILE
+
+Each line of a manifest is a request file, optionally followed by the GAPIC
+YAML file to use instead of the one in the request parameter, and by the
+name of the output. Paths are relative to the manifest, and lines starting
+with ``#`` are ignored:
+
+    library/request.pb  library/library_gapic.yaml  library
+
+The output of each request is named after its request file unless the
+manifest names it, and is a directory tree of the generated files, a
+``.srcjar``, or the serialized CodeGeneratorResponse, depending on
+``--layout``. The time taken by each request is reported, and the command
+exits with status 1 if any request fails.
+
+With ``--plugin gapic_v1``, the requests are run by protoc-gen-gapic_v1
+instead, which converts their GAPIC v2 configs to v1.
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+from google.protobuf.compiler import plugin_pb2 as plugin
+
+from plugin.cli import bazel_worker
+from plugin.cli import dump_gapic_v1
+from plugin.cli import gapic_plugin
+from plugin.utils import plugin_options
+
+LAYOUTS = ('tree', 'srcjar', 'response')
+
+# The functions that turn a serialized request into a serialized response.
+PLUGINS = {
+    'java_resource_names': gapic_plugin.main,
+    'gapic_v1': dump_gapic_v1.main,
+}
+
+
+class BatchEntry(object):
+    """A request of a batch.
+
+    Attributes:
+        name (str): The name of the output of the request.
+        request (str): The path of the serialized CodeGeneratorRequest.
+        gapic_yaml (str): The path of the GAPIC YAML file that replaces the
+            one in the request parameter, or None.
+    """
+
+    def __init__(self, name, request, gapic_yaml=None):
+        self.name = name
+        self.request = request
+        self.gapic_yaml = gapic_yaml
+
+
+def _default_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def read_manifest(path):
+    """Returns the BatchEntries of a manifest file.
+
+    Raises:
+        ValueError: If a line has more than three fields.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    entries = []
+    with io.open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            if len(fields) > 3:
+                raise ValueError('{}:{}: expected REQUEST [GAPIC_YAML] '
+                                 '[NAME]'.format(path, number))
+            request = os.path.join(directory, fields[0])
+            gapic_yaml = None
+            if len(fields) > 1 and fields[1] != '-':
+                gapic_yaml = os.path.join(directory, fields[1])
+            name = fields[2] if len(fields) > 2 else _default_name(request)
+            entries.append(BatchEntry(name, request, gapic_yaml))
+    return entries
+
+
+def check_names(entries):
+    """Raises ValueError if two entries would write the same output."""
+    seen = {}
+    for entry in entries:
+        if entry.name in seen:
+            raise ValueError(
+                '{} and {} both write {!r}; name them in a manifest'.format(
+                    seen[entry.name], entry.request, entry.name))
+        seen[entry.name] = entry.request
+
+
+def prepare_request(data, gapic_yaml=None, in_pool=False):
+    """Adapts a serialized CodeGeneratorRequest to the batch.
+
+    Args:
+        data (bytes): The serialized request.
+        gapic_yaml (str): The GAPIC YAML file to use instead of the one in
+            the parameter, or None.
+        in_pool (bool): Whether the request runs in a pool process, which
+            cannot start render workers of its own.
+
+    Returns:
+        bytes: The serialized request to run.
+    """
+    request = plugin.CodeGeneratorRequest.FromString(data)
+    options = plugin_options.parse_parameter(request.parameter)
+    if gapic_yaml is None and not (in_pool and options.render_workers > 1):
+        return data
+    if gapic_yaml is not None:
+        options.gapic_yaml = gapic_yaml
+    if in_pool:
+        options.render_workers = 0
+    request.parameter = options.to_parameter()
+    return request.SerializeToString()
+
+
+def write_tree(directory, response_data):
+    """Writes the files of a serialized CodeGeneratorResponse under directory.
+
+    Returns:
+        int: The number of files written.
+
+    Raises:
+        ValueError: If the response has an error, or a file name leaves
+            the directory.
+    """
+    response = plugin.CodeGeneratorResponse.FromString(response_data)
+    if response.error:
+        raise ValueError(response.error)
+    root = os.path.abspath(directory)
+    for generated in response.file:
+        path = os.path.abspath(os.path.join(root, generated.name))
+        if not path.startswith(root + os.sep):
+            raise ValueError('{!r} is outside the output directory'.format(
+                generated.name))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(generated.content)
+    return len(response.file)
+
+
+def _output_path(output_dir, name, layout):
+    if layout == 'tree':
+        return os.path.join(output_dir, name)
+    return os.path.join(output_dir, name + ('.srcjar' if layout == 'srcjar'
+                                            else '.pb'))
+
+
+def run_entry(entry, output_dir, layout='tree', in_pool=False,
+              plugin_name='java_resource_names'):
+    """Runs a plugin on one entry of a batch and writes its output.
+
+    Returns:
+        dict: The result of the entry: its name, whether it succeeded, the
+            time it took in seconds, and the error if it failed.
+    """
+    start = time.time()
+    error = None
+    try:
+        with open(entry.request, 'rb') as f:
+            data = prepare_request(f.read(), entry.gapic_yaml, in_pool)
+        response_data = PLUGINS[plugin_name](data)
+        output = _output_path(output_dir, entry.name, layout)
+        if layout == 'tree':
+            write_tree(output, response_data)
+        else:
+            bazel_worker.write_output(output, response_data)
+    except Exception:
+        error = traceback.format_exc()
+    return {'name': entry.name,
+            'request': entry.request,
+            'ok': error is None,
+            'seconds': round(time.time() - start, 6),
+            'error': error}
+
+
+def _run_pooled(args):
+    entry, output_dir, layout, plugin_name = args
+    return run_entry(entry, output_dir, layout, True, plugin_name)
+
+
+def run_batch(entries, output_dir, layout='tree', jobs=1,
+              plugin_name='java_resource_names'):
+    """Runs a plugin on every entry, in a pool of jobs processes.
+
+    The processes are kept for the whole batch, so the caches each of them
+    builds serve the later requests it runs.
+
+    Yields:
+        dict: The result of each entry, as returned by run_entry, in the
+            order of entries.
+    """
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    if jobs <= 1 or len(entries) <= 1:
+        for entry in entries:
+            yield run_entry(entry, output_dir, layout,
+                            plugin_name=plugin_name)
+        return
+    pool = multiprocessing.Pool(min(jobs, len(entries)))
+    try:
+        for result in pool.imap(
+                _run_pooled,
+                [(e, output_dir, layout, plugin_name) for e in entries]):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+
+def format_result(result):
+    line = '{:10.3f}s  {}  {}'.format(
+        result['seconds'], 'ok  ' if result['ok'] else 'FAIL', result['name'])
+    if not result['ok']:
+        line += '\n' + result['error'].rstrip()
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('requests', nargs='*', metavar='REQUEST',
+                        help='serialized CodeGeneratorRequests')
+    parser.add_argument('--manifest', action='append', default=[],
+                        help='a file listing requests and GAPIC YAMLs')
+    parser.add_argument('--output-dir', required=True)
+    parser.add_argument('--layout', choices=LAYOUTS, default='tree')
+    parser.add_argument('--plugin', choices=sorted(PLUGINS),
+                        default='java_resource_names')
+    parser.add_argument('--jobs', type=int,
+                        default=multiprocessing.cpu_count(),
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--report', help='write the results as JSON to '
+                        'this file')
+    args = parser.parse_args(argv)
+
+    entries = [BatchEntry(_default_name(path), path)
+               for path in args.requests]
+    for manifest in args.manifest:
+        entries.extend(read_manifest(manifest))
+    if not entries:
+        parser.error('no requests given')
+    check_names(entries)
+
+    start = time.time()
+    results = []
+    for result in run_batch(entries, args.output_dir, args.layout,
+                            max(args.jobs, 1), args.plugin):
+        results.append(result)
+        sys.stdout.write(format_result(result) + '\n')
+        sys.stdout.flush()
+    elapsed = time.time() - start
+    failures = sum(1 for r in results if not r['ok'])
+    sys.stdout.write(
+        '{} request(s), {} failed, in {:.3f}s ({:.3f}s of requests)\n'.format(
+            len(results), failures, elapsed,
+            sum(r['seconds'] for r in results)))
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'seconds': round(elapsed, 6), 'results': results}, f,
+                      indent=2, sort_keys=True)
+    return 1 if failures else 0
+
+
+def entrypoint():
+    sys.exit(main())
+
+
+if __name__ == '__main__':
+    entrypoint()
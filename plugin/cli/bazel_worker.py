@@ -0,0 +1,359 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Runs the plugin as a Bazel persistent worker.
+
+Bazel starts the gapic_plugin binary with ``--persistent_worker`` and sends
+it WorkRequests on stdin, each with the arguments of one action, and reads
+a WorkResponse for each from stdout. The process serves every request, so
+the parsed templates, path templates and other caches are built once.
+
+The arguments of an action describe a plugin run without protoc:
+
+    --descriptor_set_in=FILES  FileDescriptorSets, with imports, separated
+                               by the path separator like with protoc
+    --file_to_generate=NAME    a proto file to generate for, repeated
+    --parameter=PARAMETER      the plugin parameter
+    --request=FILE             a serialized CodeGeneratorRequest, instead
+                               of the three arguments above
+    --output=FILE              a .srcjar or .zip of the generated files,
+                               or else the serialized CodeGeneratorResponse
+
+Arguments may come from a flagfile, given as ``@FILE``. Without
+``--persistent_worker`` the binary runs the action in its arguments once.
+
+Requests are read as length-delimited WorkRequest protos, or as JSON
+objects with ``--worker_protocol=json``. Requests with a request id are
+multiplexed, and run concurrently in a pool of threads. Since forking
+from a threaded process can deadlock, requests never start render
+workers in the worker. The worker does not support cancellation, and
+actions must not set ``supports-worker-cancellation``.
+
+The ``java_resource_names_srcjar`` rule in java_resource_names.bzl runs the
+plugin in workers.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+import traceback
+import zipfile
+from multiprocessing.pool import ThreadPool
+
+from google.protobuf import descriptor_pb2
+from google.protobuf.compiler import plugin_pb2 as plugin
+
+from plugin.cli import gapic_plugin
+from plugin.utils.response_writer import encode_varint
+
+# The time of the entries in generated archives, so that they are
+# reproducible.
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+DEFAULT_MAX_CONCURRENT = 8
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+
+    def error(self, message):
+        raise ValueError(message)
+
+
+def _action_parser():
+    parser = _ArgumentParser(prog='gapic_plugin', add_help=False)
+    parser.add_argument('--descriptor_set_in')
+    parser.add_argument('--file_to_generate', action='append', default=[])
+    parser.add_argument('--parameter', default='')
+    parser.add_argument('--request')
+    parser.add_argument('--output', required=True)
+    return parser
+
+
+def expand_flagfiles(arguments, cwd):
+    """Replaces @FILE arguments with the lines of the file."""
+    expanded = []
+    for argument in arguments:
+        if argument.startswith('@'):
+            with io.open(os.path.join(cwd, argument[1:]), 'r',
+                         encoding='utf-8') as f:
+                expanded.extend(line for line in f.read().splitlines()
+                                if line)
+        else:
+            expanded.append(argument)
+    return expanded
+
+
+def build_request(args, cwd):
+    """Returns the serialized CodeGeneratorRequest of parsed arguments."""
+    if args.request:
+        with open(os.path.join(cwd, args.request), 'rb') as f:
+            return f.read()
+    if not args.descriptor_set_in:
+        raise ValueError('one of --request or --descriptor_set_in is needed')
+    request = plugin.CodeGeneratorRequest(
+        file_to_generate=args.file_to_generate,
+        parameter=args.parameter)
+    # As with protoc, a file in several sets is taken from the first.
+    names = set()
+    for path in args.descriptor_set_in.split(os.pathsep):
+        with open(os.path.join(cwd, path), 'rb') as f:
+            descriptor_set = descriptor_pb2.FileDescriptorSet.FromString(
+                f.read())
+        for proto_file in descriptor_set.file:
+            if proto_file.name not in names:
+                names.add(proto_file.name)
+                request.proto_file.add().CopyFrom(proto_file)
+    return request.SerializeToString()
+
+
+def write_output(output, response_data):
+    """Writes a serialized CodeGeneratorResponse to the output file.
+
+    Raises:
+        ValueError: If the response has an error.
+    """
+    if not output.endswith(('.srcjar', '.zip')):
+        with open(output, 'wb') as f:
+            f.write(response_data)
+        return
+    response = plugin.CodeGeneratorResponse.FromString(response_data)
+    if response.error:
+        raise ValueError(response.error)
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for generated in response.file:
+            info = zipfile.ZipInfo(generated.name, _ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, generated.content.encode('utf-8'))
+
+
+def run_action(arguments, cwd=None, in_worker=False):
+    """Runs the plugin with the arguments of one action.
+
+    Args:
+        arguments (list): The action arguments, which may be flagfiles.
+        cwd (str): The directory that relative paths are relative to, such
+            as the sandbox of a multiplexed request.
+        in_worker (bool): Whether the action runs in a worker, whose
+            threads rule out starting render workers.
+
+    Returns:
+        tuple: The exit code, and the output to show the user.
+    """
+    cwd = cwd or os.getcwd()
+    try:
+        args = _action_parser().parse_args(expand_flagfiles(arguments, cwd))
+        request_data = build_request(args, cwd)
+        if in_worker:
+            # batch imports this module.
+            from plugin.cli import batch
+            request_data = batch.prepare_request(request_data, in_pool=True)
+        response_data = gapic_plugin.main(request_data, cwd=cwd)
+        write_output(os.path.join(cwd, args.output), response_data)
+    except Exception:
+        return 1, traceback.format_exc()
+    return 0, ''
+
+
+def _read_varint(stream):
+    # Returns None at the end of the stream.
+    value = shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise EOFError('truncated varint')
+            return None
+        byte = ord(byte)
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value
+        shift += 7
+
+
+def _iter_fields(data):
+    # Yields the (field number, value) pairs of an encoded message, with
+    # varints as ints and length-delimited fields as bytes.
+    stream = io.BytesIO(data)
+    while True:
+        key = _read_varint(stream)
+        if key is None:
+            return
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            yield number, _read_varint(stream)
+        elif wire_type == 2:
+            yield number, stream.read(_read_varint(stream))
+        elif wire_type in (1, 5):
+            stream.read(8 if wire_type == 1 else 4)
+        else:
+            raise ValueError('unsupported wire type {}'.format(wire_type))
+
+
+def _work_request(arguments=(), request_id=0, cancel=False, sandbox_dir=''):
+    return {'arguments': list(arguments), 'request_id': request_id,
+            'cancel': cancel, 'sandbox_dir': sandbox_dir}
+
+
+def read_proto_request(stream):
+    """Reads a length-delimited WorkRequest, or returns None at the end."""
+    size = _read_varint(stream)
+    if size is None:
+        return None
+    data = stream.read(size)
+    if len(data) != size:
+        raise EOFError('truncated WorkRequest')
+    request = _work_request()
+    for number, value in _iter_fields(data):
+        if number == 1:
+            request['arguments'].append(value.decode('utf-8'))
+        elif number == 3:
+            request['request_id'] = value
+        elif number == 4:
+            request['cancel'] = bool(value)
+        elif number == 6:
+            request['sandbox_dir'] = value.decode('utf-8')
+    return request
+
+
+def write_proto_response(stream, exit_code, output, request_id):
+    """Writes a length-delimited WorkResponse."""
+    output = output.encode('utf-8')
+    data = b''
+    if exit_code:
+        # Negative int32 values are encoded as ten-byte varints.
+        data += b'\x08' + encode_varint(exit_code & 0xffffffffffffffff)
+    if output:
+        data += b'\x12' + encode_varint(len(output)) + output
+    if request_id:
+        data += b'\x18' + encode_varint(request_id)
+    stream.write(encode_varint(len(data)) + data)
+
+
+def read_json_request(stream):
+    """Reads a JSON WorkRequest, or returns None at the end."""
+    text = ''
+    while True:
+        line = stream.readline()
+        if not line:
+            if text.strip():
+                raise EOFError('truncated WorkRequest')
+            return None
+        text += line.decode('utf-8')
+        try:
+            message = json.loads(text)
+        except ValueError:
+            continue
+        return _work_request(message.get('arguments', ()),
+                             message.get('requestId', 0),
+                             message.get('cancel', False),
+                             message.get('sandboxDir', ''))
+
+
+def write_json_response(stream, exit_code, output, request_id):
+    """Writes a JSON WorkResponse on a line of its own."""
+    response = {'exitCode': exit_code, 'output': output}
+    if request_id:
+        response['requestId'] = request_id
+    stream.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+_PROTOCOLS = {
+    'proto': (read_proto_request, write_proto_response),
+    'json': (read_json_request, write_json_response),
+}
+
+
+def run_worker(stdin, stdout, protocol='proto',
+               max_concurrent=DEFAULT_MAX_CONCURRENT):
+    """Serves WorkRequests from stdin until it ends.
+
+    Requests without a request id run one at a time, in the order they
+    arrive. Multiplexed requests run in a pool of threads, and their
+    responses are written as they finish.
+    """
+    read_request, write_response = _PROTOCOLS[protocol]
+    lock = threading.Lock()
+    pool = ThreadPool(max_concurrent)
+
+    def respond(request):
+        exit_code, output = run_action(request['arguments'],
+                                       request['sandbox_dir'] or None,
+                                       in_worker=True)
+        with lock:
+            write_response(stdout, exit_code, output, request['request_id'])
+            stdout.flush()
+
+    try:
+        while True:
+            request = read_request(stdin)
+            if request is None:
+                break
+            if request['cancel']:
+                # Cancellation is not supported, and Bazel only sends
+                # cancel requests to workers of actions that set
+                # supports-worker-cancellation, which ours must not. The
+                # request runs on and is answered as usual.
+                continue
+            if request['request_id']:
+                pool.apply_async(respond, (request,))
+            else:
+                respond(request)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def main(argv):
+    """Runs as a persistent worker, or runs the action in argv once.
+
+    Returns:
+        int: The exit status.
+    """
+    if '--persistent_worker' not in argv:
+        exit_code, output = run_action(argv)
+        sys.stderr.write(output)
+        return exit_code
+
+    parser = argparse.ArgumentParser(prog='gapic_plugin')
+    parser.add_argument('--persistent_worker', action='store_true')
+    parser.add_argument('--worker_protocol', choices=sorted(_PROTOCOLS),
+                        default='proto')
+    parser.add_argument('--max_concurrent', type=int,
+                        default=DEFAULT_MAX_CONCURRENT)
+    args = parser.parse_args(argv)
+    try:
+        stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    except AttributeError:  # Python 2
+        stdin, stdout = sys.stdin, sys.stdout
+    # Only WorkResponses may be written to stdout.
+    sys.stdout = sys.stderr
+    run_worker(stdin, stdout, args.worker_protocol,
+               max(args.max_concurrent, 1))
+    return 0
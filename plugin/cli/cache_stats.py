@@ -0,0 +1,78 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Shows the statistics of the plugin's cache directories, and trims them.
+
+Works on the directories of the render_cache_dir, yaml_cache_dir and
+response_cache_dir options.
+
+Usage:
+
+    java-resource-names-cache-stats [--max-mb N] DIR [DIR...]
+
+Prints the number of entries and the size of each directory as JSON. With
+``--max-mb``, the least recently used entries are removed first until each
+directory fits in that size.
+"""
+
+import argparse
+import json
+import sys
+
+from plugin.utils.disk_cache import DiskCache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('directories', nargs='+', metavar='DIR')
+    parser.add_argument('--max-mb', type=int,
+                        help='trim each directory to this size first')
+    args = parser.parse_args(argv)
+
+    report = {}
+    for directory in args.directories:
+        max_bytes = args.max_mb * 1024 * 1024 if args.max_mb is not None \
+            else None
+        cache = DiskCache(directory, max_bytes)
+        stats = {}
+        if max_bytes is not None:
+            stats['removed'] = cache.trim()
+        stats.update(cache.stats())
+        # Hits and misses are only counted by the processes using a cache.
+        del stats['hits'], stats['misses']
+        report[directory] = stats
+    sys.stdout.write(json.dumps(report, indent=2, sort_keys=True) + '\n')
+    return 0
+
+
+def entrypoint():
+    sys.exit(main())
+
+
+if __name__ == '__main__':
+    entrypoint()
@@ -27,15 +27,55 @@
 # THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Writes the GAPIC v1 config that the plugin builds from a GAPIC v2 config.
 
+The plugin parameter is the GAPIC v2 YAML file, as for
+protoc-gen-java_resource_names. The v1 config is made of its collections
+and those of the resources in the proto annotations of the files to
+generate, and is written next to it, named with ``.v1``.
+"""
+
+import os
 import re
 import sys
 
-import yaml
-
 from google.protobuf.compiler import plugin_pb2
 
 from plugin.utils import gapic_utils
+from plugin.utils import plugin_options
+from plugin.utils import yaml_loader
+
+
+def output_filename(gapic_yaml):
+    """Returns the name of the v1 config of a GAPIC YAML file."""
+    if not gapic_yaml:
+        return 'gapic.v1.yaml'
+    if os.path.isabs(gapic_yaml):
+        # protoc only writes files under its output directory.
+        gapic_yaml = os.path.basename(gapic_yaml)
+    filename = re.sub(r'[._]v[\d]', '.v1', gapic_yaml)
+    if '.v1' not in filename:
+        filename = re.sub(r'\.ya?ml$', '.v1.yaml', filename)
+    return filename
+
+
+def main(data):
+    """Returns the serialized response to a serialized CodeGeneratorRequest.
+    """
+    request = plugin_pb2.CodeGeneratorRequest.FromString(data)
+    options = plugin_options.parse_parameter(request.parameter)
+    gapic_v2 = {}
+    if options.gapic_yaml:
+        gapic_v2 = yaml_loader.load_file(options.gapic_yaml) or {}
+
+    # Create a GAPIC v1 YAML.
+    gapic_v1 = gapic_utils.reconstruct_gapic_yaml(gapic_v2, request)
+
+    F = plugin_pb2.CodeGeneratorResponse.File
+    return plugin_pb2.CodeGeneratorResponse(file=[
+        F(name=output_filename(options.gapic_yaml),
+          content=yaml_loader.dump(gapic_v1))
+    ]).SerializeToString()
 
 
 def entrypoint():
@@ -46,26 +86,10 @@ def entrypoint():
         source = sys.stdin
         dest = sys.stdout
 
-    # Read request message from stdin
-    r = plugin_pb2.CodeGeneratorRequest.FromString(source.read())
-    output_filename = 'gapic.v1.yaml'
-    if r.parameter:
-        with open(r.parameter, 'r') as f:
-            gapic_v2 = yaml.load(f)
-        output_filename = re.sub(r'[._]v[\d]', '.v1', r.parameter)
-        if '.v1' not in output_filename:
-            output_filename = re.sub(r'\.ya?ml$', '.v1.yaml', output_filename)
-    else:
-        gapic_v2 = {}
+    # Read request message from stdin, and write the response to stdout.
+    dest.write(main(source.read()))
+    dest.flush()
 
-    # Create a GAPIC v1 YAML.
-    gapic_v1 = gapic_utils.reconstruct_gapic_yaml(gapic_v2, r)
 
-    # Write to stdout
-    F = plugin_pb2.CodeGeneratorResponse.File
-    dest.write(plugin_pb2.CodeGeneratorResponse(file=[
-        F(name=output_filename, content=yaml.dump(
-            gapic_v1,
-            default_flow_style=False,
-        ))
-    ]).SerializeToString())
+if __name__ == '__main__':
+    entrypoint()
@@ -29,71 +29,166 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import io
 import os
 import sys
-import chevron
+import time
 
 from google.protobuf.compiler import plugin_pb2 as plugin
 
-from plugin.utils import proto_utils, gapic_utils
-
-
-def render_new_file(response, resource):
-    f = response.file.add()
-    f.name = resource.filename()
-    templ_path = resource.template_path()
-    with open(templ_path, 'r') as templ:
-        f.content = chevron.render(templ, resource)
-
-
-def generate_resource_name_types(response, gapic_config, java_package):
-    resources = gapic_utils.collect_resource_name_types(
-        gapic_config, java_package)
+from plugin.templates import registry, resource_name
+from plugin.utils import gapic_utils
+from plugin.utils import plugin_options
+from plugin.utils import profiling
+from plugin.utils.descriptor_index import DescriptorIndex
+from plugin.utils.response_writer import ResponseWriter
+
+
+def generate_resource_name_types(writer, gapic_config, java_package,
+                                 model_cache=None, pool=None, cache=None):
+    with profiling.phase('build_models'):
+        resources = gapic_utils.collect_resource_name_types(
+            gapic_config, java_package, model_cache)
+    # Files are written in the order of resources, whether they are
+    # rendered in this process, in the pool, or read from the cache.
+    contents = iter(registry.render_all(resources, pool, cache))
     for resource in resources:
-        render_new_file(response, resource)
+        template_name = os.path.basename(resource.template_path())
+        with profiling.phase('render:' + template_name):
+            content = next(contents)
+        with profiling.phase('serialize'):
+            writer.add_file(resource.filename(), content)
 
 
-def get_protos_to_generate_for(request):
-    proto_files = dict((pf.name, pf) for pf in request.proto_file)
-    for pf_name in request.file_to_generate:
-        if pf_name in proto_files:
-            yield proto_files[pf_name]
-
-
-def resolve_java_package_names(request):
-    java_packages = set()
-    for pf in get_protos_to_generate_for(request):
-        for opt in proto_utils.get_named_options(pf, 'java_package'):
-            if opt[1]:
-                java_packages.add(opt[1])
-                break
-    if not java_packages:
+def resolve_java_package_names(request, index=None):
+    if index is None:
+        index = DescriptorIndex(request)
+    if not index.java_packages:
         raise ValueError('java package not defined')
-    return java_packages
+    return index.java_packages
+
+
+def _get_response_cache(options, index):
+    # Returns the response cache and the key of the request, or Nones.
+    if not options.response_cache_dir:
+        return None, None
+    from plugin.utils import response_cache
+    gapic_yaml_data = None
+    if options.gapic_yaml:
+        with open(options.gapic_yaml, 'rb') as f:
+            gapic_yaml_data = f.read()
+    cache = response_cache.get_cache(
+        options.response_cache_dir,
+        options.response_cache_max_mb * 1024 * 1024)
+    return cache, response_cache.fingerprint(index, gapic_yaml_data)
+
+
+def main(data, dest=None, cwd=None):
+    """Runs the plugin on a serialized CodeGeneratorRequest.
+
+    Each generated file is written to dest as soon as it is rendered. If
+    dest is None, the serialized CodeGeneratorResponse is returned instead.
+    Relative paths in the plugin parameter are relative to cwd, if given,
+    and to the working directory otherwise.
+    """
+    if dest is None:
+        output = io.BytesIO()
+        main(data, output, cwd)
+        return output.getvalue()
 
-
-def main(data):
     # Parse request
-    request = plugin.CodeGeneratorRequest()
-    request.ParseFromString(data)
-
-    java_packages = resolve_java_package_names(request)
-    gapic_config = gapic_utils.read_from_gapic_yaml(request)
-    # Generate output
-    response = plugin.CodeGeneratorResponse()
-
-    for java_package in java_packages:
-        generate_resource_name_types(response, gapic_config, java_package)
+    profiler = profiling.from_environment()
+    start = time.time()
+    with profiling.activate(profiler), profiling.phase('parse_request'):
+        request = plugin.CodeGeneratorRequest()
+        request.ParseFromString(data)
+        options = plugin_options.parse_parameter(request.parameter)
+    if cwd is not None:
+        options.resolve_paths(cwd)
+    if profiler is None and options.profile:
+        profiler = profiling.Profiler(
+            options.profile, profiling.parse_details(options.profile_detail))
+        profiler.record('parse_request', time.time() - start)
+    if profiler is None:
+        _generate(request, options, dest)
+        return
+    try:
+        with profiling.activate(profiler):
+            _generate(request, options, dest)
+    finally:
+        profiler.write_report()
+
+
+def _generate(request, options, dest):
+    with profiling.phase('resolve_java_packages'):
+        index = DescriptorIndex(request)
+        java_packages = resolve_java_package_names(request, index)
+    if options.pattern_conflicts:
+        with profiling.phase('check_pattern_conflicts'):
+            gapic_utils.check_pattern_conflicts(
+                request, index, options.pattern_conflicts == 'error')
+    with profiling.phase('response_cache'):
+        response_cache, response_key = _get_response_cache(options, index)
+        response = None
+        if response_cache is not None:
+            response = response_cache.get_bytes(response_key)
+    if response is not None:
+        dest.write(response)
+        return
+    if response_cache is None:
+        _write_response(request, index, java_packages, options, dest)
+        return
+    # The response is copied into the cache entry as it is written.
+    from plugin.utils.response_cache import TeeWriter
+    dest = TeeWriter(dest, response_cache.open_entry(response_key))
+    try:
+        _write_response(request, index, java_packages, options, dest)
+    except BaseException:
+        dest.entry.abort()
+        raise
+    with profiling.phase('response_cache'):
+        dest.entry.commit()
+        response_cache.maybe_trim()
 
-    response.supported_features = plugin.CodeGeneratorResponse.FEATURE_PROTO3_OPTIONAL
 
-    # Serialise response message
-    output = response.SerializeToString()
+def _write_response(request, index, java_packages, options, dest):
+    gapic_config = gapic_utils.read_from_gapic_yaml(request, index, options)
+    # Generate output
+    writer = ResponseWriter(dest)
+
+    model_cache = resource_name.ResourceModelCache()
+    # The modules that only some options need are imported for them.
+    cache = None
+    if options.render_cache_dir:
+        from plugin.utils.disk_cache import DiskCache
+        cache = DiskCache(options.render_cache_dir,
+                          options.render_cache_max_mb * 1024 * 1024)
+    pool = None
+    if options.render_workers > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(options.render_workers)
+    try:
+        for java_package in java_packages:
+            generate_resource_name_types(writer, gapic_config, java_package,
+                                         model_cache, pool, cache)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    if cache is not None and cache.misses:
+        cache.maybe_trim()
 
-    return output
+    with profiling.phase('serialize'):
+        writer.set_supported_features(
+            plugin.CodeGeneratorResponse.FEATURE_PROTO3_OPTIONAL)
 
 
 def entrypoint():
+    if len(sys.argv) > 1:
+        # Run by Bazel, as a persistent worker or for a single action.
+        from plugin.cli import bazel_worker
+        sys.exit(bazel_worker.main(sys.argv[1:]))
+
     try:
         source = sys.stdin.buffer
         dest = sys.stdout.buffer
@@ -104,10 +199,9 @@ def entrypoint():
     # Read request message from stdin
     data = source.read()
 
-    output = main(data)
-
-    # Write to stdout
-    dest.write(output)
+    # Write the response to stdout
+    main(data, dest)
+    dest.flush()
 
 
 if __name__ == '__main__':
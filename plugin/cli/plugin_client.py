@@ -0,0 +1,147 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""A protoc plugin that hands requests to java-resource-names-server.
+
+It forwards the CodeGeneratorRequest on stdin to the server listening on a
+Unix domain socket, and writes the server's response to stdout. If no
+server answers, it runs the plugin in this process instead, so it can
+always stand in for protoc-gen-java_resource_names:
+
+    protoc --plugin=protoc-gen-java_resource_names=CLIENT_PATH ...
+
+This module only imports the standard library modules it needs to talk to
+the server, so that forwarding a request starts quickly.
+"""
+
+import os
+import socket
+import struct
+import sys
+
+SOCKET_ENV = 'JAVA_RESOURCE_NAMES_SOCKET'
+
+# A request is the lengths of the working directory and of the serialized
+# CodeGeneratorRequest, followed by both. A response is a status and the
+# length of the payload, followed by the payload: the serialized
+# CodeGeneratorResponse, or the error message.
+REQUEST_HEADER = struct.Struct('>IQ')
+RESPONSE_HEADER = struct.Struct('>BQ')
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+
+def default_socket_path():
+    """Returns the socket path from the environment, or a per-user one."""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    user = getattr(os, 'getuid', lambda: 0)()
+    return os.path.join(os.environ.get('TMPDIR', '/tmp'),
+                        'java-resource-names-{}.sock'.format(user))
+
+
+def recv_exactly(sock, size):
+    """Reads size bytes from a socket.
+
+    Raises:
+        EOFError: If the peer closes the connection first.
+    """
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise EOFError('connection closed with {} bytes left'.format(size))
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def send_request(socket_path, data, cwd):
+    """Sends a serialized CodeGeneratorRequest to the server.
+
+    Args:
+        socket_path (str): The socket of the server.
+        data (bytes): The serialized request.
+        cwd (str): The directory that relative paths in the plugin
+            parameter are relative to.
+
+    Returns:
+        tuple: The status and payload of the response.
+
+    Raises:
+        EnvironmentError: If the server cannot be reached.
+        EOFError: If the server closes the connection before responding.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        cwd = cwd.encode('utf-8')
+        sock.sendall(REQUEST_HEADER.pack(len(cwd), len(data)) + cwd + data)
+        status, size = RESPONSE_HEADER.unpack(
+            recv_exactly(sock, RESPONSE_HEADER.size))
+        return status, recv_exactly(sock, size)
+    finally:
+        sock.close()
+
+
+def main(data, dest, socket_path=None):
+    """Writes the response to a serialized request to dest.
+
+    Returns:
+        int: The exit status of the plugin.
+    """
+    try:
+        status, payload = send_request(
+            socket_path or default_socket_path(), data, os.getcwd())
+    except (EnvironmentError, EOFError):
+        from plugin.cli import gapic_plugin
+        gapic_plugin.main(data, dest)
+        return 0
+    if status != STATUS_OK:
+        sys.stderr.write(payload.decode('utf-8', 'replace'))
+        return 1
+    dest.write(payload)
+    return 0
+
+
+def entrypoint():
+    try:
+        source = sys.stdin.buffer
+        dest = sys.stdout.buffer
+    except AttributeError:
+        source = sys.stdin
+        dest = sys.stdout
+
+    status = main(source.read(), dest)
+    dest.flush()
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    entrypoint()
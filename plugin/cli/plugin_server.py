@@ -0,0 +1,260 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Serves protoc plugin requests from a long-lived process.
+
+The server keeps the plugin modules loaded and its caches warm, and runs
+CodeGeneratorRequests that protoc-gen-java_resource_names_client forwards
+to it over a Unix domain socket.
+
+Usage:
+
+    java-resource-names-server [--socket PATH] [--max-concurrent N]
+                               [--idle-timeout SECONDS]
+
+SIGTERM and SIGINT stop the server once the requests it is running have
+finished. SIGHUP restarts it the same way, which reloads the plugin code.
+Clients run the plugin themselves while the server is down. When it
+stops, the server writes the statistics of the response caches that its
+requests used to stderr.
+
+Only the response goes back to the client. What requests write to stderr,
+such as pattern_conflicts warnings and profile=stderr reports, goes to the
+stderr of the server, and the profiling environment variables of the
+client are not forwarded: set them on the server, or use profile=FILE.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+try:
+    import socketserver
+except ImportError:  # Python 2
+    import SocketServer as socketserver
+
+from plugin.cli import gapic_plugin
+from plugin.cli import plugin_client
+from plugin.templates import registry
+
+DEFAULT_IDLE_TIMEOUT = 1800
+# How often the server checks for signals and for the idle timeout.
+POLL_INTERVAL = 0.5
+
+STOP = 'stop'
+RESTART = 'restart'
+IDLE = 'idle'
+
+
+class _Handler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        try:
+            header = plugin_client.recv_exactly(
+                self.request, plugin_client.REQUEST_HEADER.size)
+            cwd_size, data_size = plugin_client.REQUEST_HEADER.unpack(header)
+            cwd = plugin_client.recv_exactly(self.request, cwd_size)
+            data = plugin_client.recv_exactly(self.request, data_size)
+        except (EnvironmentError, EOFError):
+            return
+        with self.server.slots:
+            try:
+                status = plugin_client.STATUS_OK
+                payload = gapic_plugin.main(data, cwd=cwd.decode('utf-8'))
+            except Exception:
+                status = plugin_client.STATUS_ERROR
+                payload = traceback.format_exc().encode('utf-8')
+        try:
+            self.request.sendall(plugin_client.RESPONSE_HEADER.pack(
+                status, len(payload)) + payload)
+        except EnvironmentError:
+            # The client gave up, and will run the request itself.
+            pass
+
+
+class PluginServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Runs plugin requests, each in its own thread.
+
+    Args:
+        socket_path (str): The path of the socket to listen on.
+        max_concurrent (int): The number of requests run at once. Others
+            wait for a slot.
+        idle_timeout (float): The number of seconds without requests after
+            which the server stops, or 0 to never stop.
+    """
+
+    daemon_threads = False
+
+    def __init__(self, socket_path, max_concurrent=4,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        _claim_socket_path(socket_path)
+        # Only the user running the server may connect to it.
+        umask = os.umask(0o077)
+        try:
+            socketserver.UnixStreamServer.__init__(self, socket_path,
+                                                   _Handler)
+        finally:
+            os.umask(umask)
+        self.socket_path = socket_path
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.idle_timeout = idle_timeout
+        self.timeout = POLL_INTERVAL
+        self.stop_reason = None
+        # Notified when a request finishes.
+        self._lock = threading.Condition()
+        self._active = 0
+        self._last_request = time.time()
+
+    def serve(self):
+        """Serves requests until the server is stopped, then closes it.
+
+        Returns:
+            str: Why the server stopped: STOP, RESTART or IDLE.
+        """
+        try:
+            while self.stop_reason is None:
+                self.handle_request()
+                if self._idle():
+                    self.stop_reason = IDLE
+        finally:
+            self.server_close()
+        return self.stop_reason
+
+    def stop(self, reason=STOP):
+        """Makes serve() return once running requests have finished."""
+        self.stop_reason = reason
+
+    def wait_for_requests(self):
+        """Waits until no request is running."""
+        with self._lock:
+            while self._active:
+                self._lock.wait(POLL_INTERVAL)
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self._active += 1
+            self._last_request = time.time()
+        socketserver.ThreadingMixIn.process_request(
+            self, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            socketserver.ThreadingMixIn.process_request_thread(
+                self, request, client_address)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._last_request = time.time()
+                self._lock.notify_all()
+
+    def server_close(self):
+        """Stops listening, then waits for the running requests.
+
+        ThreadingMixIn only joins the request threads from Python 3.7 on,
+        so the server counts the running requests itself.
+        """
+        # New clients run the plugin themselves from here on.
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+        socketserver.ThreadingMixIn.server_close(self)
+        self.wait_for_requests()
+
+    def _idle(self):
+        with self._lock:
+            return (self.idle_timeout and not self._active and
+                    time.time() - self._last_request > self.idle_timeout)
+
+
+def _claim_socket_path(socket_path):
+    # Removes the socket of a server that is gone, and refuses to take over
+    # the socket of one that is still listening.
+    if not os.path.exists(socket_path):
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except EnvironmentError:
+        os.remove(socket_path)
+    else:
+        raise RuntimeError(
+            'a server is already listening on {}'.format(socket_path))
+    finally:
+        sock.close()
+
+
+def _dump_response_cache_stats():
+    # The plugin imports response_cache when a request uses the cache.
+    response_cache = sys.modules.get('plugin.utils.response_cache')
+    if response_cache is not None:
+        sys.stderr.write('response cache: {}\n'.format(
+            json.dumps(response_cache.stats(), sort_keys=True)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0])
+    parser.add_argument('--socket',
+                        default=plugin_client.default_socket_path(),
+                        help='the socket to listen on (default: %(default)s)')
+    parser.add_argument('--max-concurrent', type=int, default=4,
+                        help='requests run at once (default: %(default)s)')
+    parser.add_argument('--idle-timeout', type=float,
+                        default=DEFAULT_IDLE_TIMEOUT,
+                        help='seconds without requests before stopping, or '
+                        '0 to never stop (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    registry.preload()
+    server = PluginServer(args.socket, max(args.max_concurrent, 1),
+                          args.idle_timeout)
+    signal.signal(signal.SIGTERM, lambda *_: server.stop())
+    signal.signal(signal.SIGINT, lambda *_: server.stop())
+    signal.signal(signal.SIGHUP, lambda *_: server.stop(RESTART))
+    reason = server.serve()
+    _dump_response_cache_stats()
+    if reason == RESTART:
+        argv = sys.argv[1:] if argv is None else argv
+        os.execv(sys.executable, [sys.executable, '-m',
+                                  'plugin.cli.plugin_server'] + argv)
+    return 0
+
+
+def entrypoint():
+    sys.exit(main())
+
+
+if __name__ == '__main__':
+    entrypoint()
@@ -0,0 +1,317 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Validates the resource name patterns of many APIs in one run.
+
+Reads FileDescriptorSets (built with protoc -o, ideally with
+--include_imports) and GAPIC YAML files, and reports every pattern that
+the plugin would fail on: patterns that do not parse and patterns whose
+last segment has unmatched braces, and patterns whose derived parent
+pattern is not valid. It also reports the resources that fields
+reference as a child_type but whose parent patterns no set of resources
+covers, for which the plugin generates no parent classes.
+
+Usage:
+
+    java-resource-names-validate [--jobs N] [--format json] PATH [PATH...]
+
+Directories are searched recursively. Exits with status 1 if any problem
+is found.
+"""
+
+import argparse
+import functools
+import json
+import multiprocessing
+import os
+import sys
+from collections import OrderedDict
+
+import yaml
+
+from google.protobuf import descriptor_pb2
+from google.protobuf.message import DecodeError
+
+from plugin.pb2 import resource_pb2
+from plugin.templates import resource_name
+from plugin.utils import gapic_utils, path_template, pattern_index
+from plugin.utils import yaml_loader
+
+DESCRIPTOR_SET_EXTENSIONS = ('.desc', '.pb', '.protoset', '.binpb')
+GAPIC_YAML_EXTENSIONS = ('.yaml', '.yml')
+
+# Files handed to a worker process at a time.
+DEFAULT_CHUNK_SIZE = 8
+
+
+def find_inputs(paths):
+    """Returns the input files under paths, in a stable order.
+
+    Files named explicitly are always included. Files found in directories
+    are included if they have a descriptor set or YAML extension.
+    """
+    inputs = []
+    for path in paths:
+        if not os.path.isdir(path):
+            inputs.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            inputs.extend(
+                os.path.join(root, name) for name in sorted(files)
+                if name.endswith(DESCRIPTOR_SET_EXTENSIONS
+                                 + GAPIC_YAML_EXTENSIONS))
+    return inputs
+
+
+def load_file(path):
+    """Returns the resources defined in a descriptor set or GAPIC YAML, and
+    the resource types that fields reference as a child_type.
+
+    Raises:
+        ValueError: If the file cannot be decoded.
+    """
+    if path.endswith(GAPIC_YAML_EXTENSIONS):
+        return _load_yaml_resources(path), set()
+    with open(path, 'rb') as f:
+        try:
+            file_set = descriptor_pb2.FileDescriptorSet.FromString(f.read())
+        except DecodeError as e:
+            raise ValueError('not a FileDescriptorSet: {}'.format(e))
+    resources = OrderedDict()
+    child_types = set()
+    for proto_file in file_set.file:
+        extensions = proto_file.options.Extensions
+        found = list(extensions[resource_pb2.resource_definition])
+        for message in proto_file.message_type:
+            found.append(message.options.Extensions[resource_pb2.resource])
+            for field in message.field:
+                ref = field.options.Extensions[resource_pb2.resource_reference]
+                if ref.child_type:
+                    child_types.add(ref.child_type)
+        for res in found:
+            if res.type and res.type not in resources:
+                resources[res.type] = res
+    return list(resources.values()), child_types
+
+
+def _load_yaml_resources(path):
+    try:
+        gapic_yaml = yaml_loader.load_file(path) or {}
+    except yaml.YAMLError as e:
+        raise ValueError('not a YAML file: {}'.format(e))
+    if not isinstance(gapic_yaml, dict):
+        raise ValueError('not a GAPIC YAML file')
+    collections = OrderedDict()
+    for config in [gapic_yaml] + list(gapic_yaml.get('interfaces', ())):
+        for collection in config.get('collections', ()):
+            if 'name_pattern' in collection:
+                collections.setdefault(collection.get('entity_name'),
+                                       collection['name_pattern'])
+    return [resource_pb2.ResourceDescriptor(type=name, pattern=[pattern])
+            for name, pattern in collections.items()]
+
+
+def check_pattern(pattern):
+    """Returns the problems of a single pattern as (kind, message) pairs."""
+    if not resource_name.is_fixed_pattern(pattern):
+        try:
+            path_template.PathTemplate(pattern)
+        except path_template.ValidationException as e:
+            return [('parse', str(e))]
+    try:
+        resource_name.get_pattern_name(pattern)
+    except ValueError as e:
+        return [('braces', str(e))]
+    except StopIteration:
+        return [('name', 'pattern has no letters to name it after')]
+    return []
+
+
+def check_parents(resources, child_types):
+    """Returns the resources whose parents cannot be resolved.
+
+    The parent pattern derived from every pattern must itself be a valid
+    pattern. The plugin only looks for the parent resources of the types
+    that fields reference as a child_type, so only those are checked for
+    resources covering their parent patterns, and only if their patterns
+    all have a parent pattern, since a top-level pattern can never be
+    covered by a parent resource.
+
+    Returns:
+        list: (resource, message) pairs.
+    """
+    parent_index = gapic_utils.ParentResourceIndex(resources)
+    failures = []
+    for res in resources:
+        try:
+            parent_patterns = gapic_utils.build_parent_patterns(res.pattern)
+        except ValueError as e:
+            failures.append((res, str(e)))
+            continue
+        invalid = [message for parent in parent_patterns
+                   if parent not in ('', '*')
+                   for _, message in check_pattern(parent)]
+        if invalid:
+            failures.append((res, 'invalid parent pattern: {}'.format(
+                invalid[0])))
+            continue
+        if res.type not in child_types or not parent_patterns or \
+                '' in parent_patterns or '*' in parent_patterns:
+            continue
+        if not parent_index.find_parents(res):
+            failures.append((res, 'no resources cover the parent patterns: '
+                             '{}'.format(', '.join(parent_patterns))))
+    return failures
+
+
+def check_overlaps(resources):
+    """Returns shadowed and overlapping patterns as (kind, entry, message)."""
+    index = pattern_index.PatternIndex()
+    for res in resources:
+        for position, pattern in enumerate(res.pattern):
+            try:
+                index.add(pattern, res.type, position)
+            except ValueError:
+                continue  # Reported by check_pattern already.
+    return [(kind, entry, pattern_index.describe_conflict(kind, other))
+            for kind, entry, other in pattern_index.find_conflicts(index)]
+
+
+def validate_file(path, overlaps=False):
+    """Validates every pattern in one input file.
+
+    Returns:
+        tuple: The number of patterns checked, and a list of problems, each
+            a dict with file, kind, resource, pattern and message keys.
+    """
+    def problem(kind, message, resource=None, pattern=None):
+        return {'file': path, 'kind': kind, 'resource': resource,
+                'pattern': pattern, 'message': message}
+
+    try:
+        resources, child_types = load_file(path)
+    except (IOError, ValueError) as e:
+        return 0, [problem('load', str(e))]
+
+    problems = []
+    pattern_count = 0
+    for res in resources:
+        for pattern in res.pattern:
+            pattern_count += 1
+            problems.extend(problem(kind, message, res.type, pattern)
+                            for kind, message in check_pattern(pattern))
+    if not path.endswith(GAPIC_YAML_EXTENSIONS):
+        # Resources with bad patterns have been reported already.
+        broken = set(p['resource'] for p in problems)
+        problems.extend(problem('parent', message, res.type)
+                        for res, message in check_parents(resources,
+                                                          child_types)
+                        if res.type not in broken)
+    if overlaps:
+        problems.extend(problem(kind, message, entry.owner, entry.pattern)
+                        for kind, entry, message in check_overlaps(resources))
+    return pattern_count, problems
+
+
+def validate_files(paths, jobs=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                   overlaps=False):
+    """Validates many files, spreading them over a pool of processes.
+
+    Returns:
+        tuple: The number of patterns checked, and the problems of all
+            files, in the order of paths.
+    """
+    validate = functools.partial(validate_file, overlaps=overlaps)
+    if jobs == 1 or len(paths) <= 1:
+        results = [validate(path) for path in paths]
+    else:
+        pool = multiprocessing.Pool(jobs)
+        try:
+            results = list(pool.imap(validate, paths, chunk_size))
+        finally:
+            pool.close()
+            pool.join()
+    problems = [p for _, file_problems in results for p in file_problems]
+    return sum(count for count, _ in results), problems
+
+
+def format_text(problems, file_count, pattern_count):
+    lines = []
+    for p in problems:
+        subject = ' '.join(s for s in (p['resource'], p['pattern']) if s)
+        lines.append('{}: {}: {}{}'.format(
+            p['file'], p['kind'], subject + ': ' if subject else '',
+            p['message']))
+    lines.append('{} problem(s) in {} pattern(s) from {} file(s)'.format(
+        len(problems), pattern_count, file_count))
+    return '\n'.join(lines) + '\n'
+
+
+def format_json(problems, file_count, pattern_count):
+    return json.dumps({'files': file_count,
+                       'patterns': pattern_count,
+                       'problems': problems}, indent=2, sort_keys=True) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', metavar='PATH',
+                        help='descriptor sets, GAPIC YAMLs or directories')
+    parser.add_argument('--jobs', type=int,
+                        default=multiprocessing.cpu_count(),
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='files handed to a worker at a time')
+    parser.add_argument('--format', choices=('text', 'json'), default='text')
+    parser.add_argument('--overlaps', action='store_true',
+                        help='also report shadowed patterns and patterns '
+                        'of different resources that overlap')
+    parser.add_argument('--output', help='write the report to this file')
+    args = parser.parse_args(argv)
+
+    paths = find_inputs(args.paths)
+    pattern_count, problems = validate_files(
+        paths, max(args.jobs, 1), max(args.chunk_size, 1), args.overlaps)
+    formatter = format_json if args.format == 'json' else format_text
+    report = formatter(problems, len(paths), pattern_count)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report)
+    else:
+        sys.stdout.write(report)
+    return 1 if problems else 0
+
+
+def entrypoint():
+    sys.exit(main())
+
+
+if __name__ == '__main__':
+    entrypoint()
@@ -0,0 +1,716 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Use of this source code is governed by the BSD-style license in the
+# LICENSE file at the root of this repository.
+# flake8: noqa
+"""
+Render functions compiled from the mustache templates of this package.
+
+This file is generated by plugin/templates/compiler.py. Do not edit it.
+"""
+
+from plugin.templates.runtime import (FallbackRequired, escape, get_key,
+                                      no_escape, section, variable)
+
+
+def render_deprecated_parent_resource_name(data):
+    if type(data) is not dict:
+        raise FallbackRequired('data is not a dict')
+    out = []
+    append = out.append
+    append('/*\n * Copyright 2018 Google LLC\n *\n * Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except\n * in compliance with the License. You may obtain a copy of the License at\n *\n * http://www.apache.org/licenses/LICENSE-2.0\n *\n * Unless required by applicable law or agreed to in writing, software distributed under the License\n * is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express\n * or implied. See the License for the specific language governing permissions and limitations under\n * the License.\n */\n\npackage ')
+    append(escape(data['package']))
+    append(';\n\nimport ')
+    append(escape(data['resource_name_global_package_name']))
+    append('.ResourceName;\n\n/**\n * AUTO-GENERATED DOCUMENTATION AND CLASS\n */\n@javax.annotation.Generated("by GAPIC protoc plugin")\npublic abstract class ')
+    append(escape(data['class_name']))
+    append(' implements ResourceName {\n  protected ')
+    append(escape(data['class_name']))
+    append('() {}\n}\n')
+    return ''.join(out)
+
+
+def render_multi_pattern_resource_name(data):
+    if type(data) is not dict:
+        raise FallbackRequired('data is not a dict')
+    out = []
+    append = out.append
+    append('/*\n * Copyright 2018 Google LLC\n *\n * Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except\n * in compliance with the License. You may obtain a copy of the License at\n *\n * http://www.apache.org/licenses/LICENSE-2.0\n *\n * Unless required by applicable law or agreed to in writing, software distributed under the License\n * is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express\n * or implied. See the License for the specific language governing permissions and limitations under\n * the License.\n */\n\npackage ')
+    append(escape(data['package']))
+    append(';\n\nimport com.google.common.base.Preconditions;\nimport com.google.common.collect.ImmutableMap;\nimport com.google.api.core.BetaApi;\nimport com.google.api.pathtemplate.PathTemplate;\nimport com.google.api.pathtemplate.ValidationException;\nimport ')
+    append(escape(data['resource_name_global_package_name']))
+    append('.ResourceName;\nimport java.util.Map;\nimport java.util.ArrayList;\nimport java.util.List;\nimport java.util.Objects;\n\n/**\n * AUTO-GENERATED DOCUMENTATION AND CLASS\n */\n@javax.annotation.Generated("by GAPIC protoc plugin")\npublic class ')
+    append(escape(data['class_name']))
+    append(' implements ResourceName {\n  \n  @Deprecated\n  protected ')
+    append(escape(data['class_name']))
+    append('() { }\n\n')
+    for scope1 in data['patterns']:
+        scope2 = scope1['is_formattable']
+        if scope2:
+            append('  private static final PathTemplate ')
+            append(escape(scope1['upper_underscore']))
+            append('_PATH_TEMPLATE =\n      PathTemplate.createWithoutUrlEncoding("')
+            append(escape(scope1['pattern_string']))
+            append('");\n')
+        scope2 = scope1['is_fixed']
+        if scope2:
+            append('  private static final String ')
+            append(escape(scope1['upper_underscore']))
+            append('_FIXED_VALUE =\n      "')
+            append(escape(scope1['pattern_string']))
+            append('";\n  private static final ')
+            append(escape(data['class_name']))
+            append(' ')
+            append(escape(scope1['upper_underscore']))
+            append('_INSTANCE =\n      new ')
+            append(escape(data['class_name']))
+            append('("')
+            append(escape(scope1['pattern_string']))
+            append('");\n')
+    append('\n  private volatile Map<String, String> fieldValuesMap;\n  private PathTemplate pathTemplate;\n  private String fixedValue;\n\n')
+    for scope1 in data['format_fields']:
+        append('  private String ')
+        append(escape(scope1['lower_camel_symbol']))
+        append(';\n')
+    append('\n')
+    for scope1 in data['format_fields']:
+        append('  public String get')
+        append(escape(scope1['upper_camel']))
+        append('() {\n    return ')
+        append(escape(scope1['lower_camel_symbol']))
+        append(';\n  }\n\n')
+    append('\n')
+    for scope1 in data['patterns']:
+        scope2 = scope1['is_formattable']
+        if scope2:
+            append('  private ')
+            append(escape(data['class_name']))
+            append('(')
+            scope3 = scope1['not_first']
+            if scope3:
+                append(escape(scope1['upper_camel']))
+            append('Builder builder) {\n')
+            for scope3 in scope1['format_fields']:
+                append('    ')
+                append(escape(scope3['lower_camel']))
+                append(' = Preconditions.checkNotNull(builder.get')
+                append(escape(scope3['upper_camel']))
+                append('());\n')
+            append('    pathTemplate = ')
+            append(escape(scope1['upper_underscore']))
+            append('_PATH_TEMPLATE;\n  }\n\n')
+    scope1 = data['has_fixed_patterns']
+    if scope1:
+        append('  private ')
+        append(escape(data['class_name']))
+        append('(String fixedValue) {\n    this.fixedValue = fixedValue;\n    fieldValuesMap = ImmutableMap.of("", fixedValue);\n  }\n\n')
+    scope1 = data['first_pattern']
+    if scope1:
+        scope2 = scope1['is_formattable']
+        if scope2:
+            append('  public static Builder newBuilder() {\n    return new Builder();\n  }\n\n')
+    for scope1 in data['patterns']:
+        scope2 = scope1['is_formattable']
+        if scope2:
+            append('  @BetaApi("The per-pattern Builders are not stable yet and may be changed in the future.")\n  public static ')
+            scope3 = scope1['not_first']
+            if scope3:
+                append(escape(scope1['upper_camel']))
+            append('Builder new')
+            append(escape(scope1['upper_camel']))
+            append('Builder() {\n    return new ')
+            scope3 = scope1['not_first']
+            if scope3:
+                append(escape(scope1['upper_camel']))
+            append('Builder();\n  }\n\n')
+    scope1 = data['first_pattern']['is_formattable']
+    if scope1:
+        append('  public Builder toBuilder() {\n    return new Builder(this);\n  }\n')
+    append('  ')
+    scope1 = data['first_pattern']
+    if scope1:
+        scope2 = scope1['is_formattable']
+        if scope2:
+            append('\n  public static ')
+            append(escape(data['class_name']))
+            append(' of(')
+            for scope3 in scope1['format_fields']:
+                append('String ')
+                append(escape(scope3['lower_camel_symbol']))
+                scope4 = scope3['not_last']
+                if scope4:
+                    append(', ')
+            append(') {\n    return new')
+            append(escape(scope1['upper_camel']))
+            append('Builder()')
+            for scope3 in scope1['format_fields']:
+                append('\n        .set')
+                append(escape(scope3['upper_camel']))
+                append('(')
+                append(escape(scope3['lower_camel_symbol']))
+                append(')')
+            append('\n        .build();\n  }\n\n')
+        scope2 = scope1['is_fixed']
+        if scope2:
+            append('  public static ')
+            append(escape(data['class_name']))
+            append(' of(String ')
+            append(escape(scope1['pattern_string']))
+            append(') {\n    return ')
+            append(escape(scope1['upper_underscore']))
+            append('_INSTANCE;\n  }\n')
+    for scope1 in data['patterns']:
+        append('  @BetaApi("The static create methods are not stable yet and may be changed in the future.")\n  public static ')
+        append(escape(data['class_name']))
+        append(' of')
+        append(escape(scope1['upper_camel']))
+        append('Name(')
+        for scope2 in scope1['format_fields']:
+            append('String ')
+            append(escape(scope2['lower_camel_symbol']))
+            scope3 = scope2['not_last']
+            if scope3:
+                append(', ')
+        append(') {\n    ')
+        scope2 = scope1['is_formattable']
+        if scope2:
+            append('return new')
+            append(escape(scope1['upper_camel']))
+            append('Builder()')
+            for scope3 in scope1['format_fields']:
+                append('\n        .set')
+                append(escape(scope3['upper_camel']))
+                append('(')
+                append(escape(scope3['lower_camel_symbol']))
+                append(')')
+            append('\n        .build();')
+        scope2 = scope1['is_fixed']
+        if scope2:
+            append('return ')
+            append(escape(scope1['upper_underscore']))
+            append('_INSTANCE;')
+        append('\n  }\n\n')
+    scope1 = data['first_pattern']['is_formattable']
+    if scope1:
+        append('  public static String format(')
+        for scope2 in data['first_pattern']['format_fields']:
+            append('String ')
+            append(escape(scope2['lower_camel_symbol']))
+            scope3 = scope2['not_last']
+            if scope3:
+                append(', ')
+        append(') {\n    return new')
+        append(variable([scope1, data], 'upper_camel', ('upper_camel',)))
+        append('Builder()')
+        for scope2 in data['first_pattern']['format_fields']:
+            append('\n        .set')
+            append(escape(scope2['upper_camel']))
+            append('(')
+            append(escape(scope2['lower_camel_symbol']))
+            append(')')
+        append('\n        .build()\n        .toString();\n  }\n\n')
+    for scope1 in data['patterns']:
+        append('  @BetaApi("The static format methods are not stable yet and may be changed in the future.")\n  public static String format')
+        append(escape(scope1['upper_camel']))
+        append('Name(')
+        for scope2 in scope1['format_fields']:
+            append('String ')
+            append(escape(scope2['lower_camel_symbol']))
+            scope3 = scope2['not_last']
+            if scope3:
+                append(', ')
+        append(') {\n    return')
+        scope2 = scope1['is_formattable']
+        if scope2:
+            append(' new')
+            scope3 = scope1['not_first']
+            if scope3:
+                append(escape(scope1['upper_camel']))
+            append('Builder()')
+            for scope3 in scope1['format_fields']:
+                append('\n        .set')
+                append(escape(scope3['upper_camel']))
+                append('(')
+                append(escape(scope3['lower_camel_symbol']))
+                append(')')
+            append('\n        .build()\n        .toString();')
+        scope2 = scope1['is_fixed']
+        if scope2:
+            append(' ')
+            append(escape(scope1['upper_underscore']))
+            append('_FIXED_VALUE;')
+        append('\n  }\n\n')
+    append('  public static ')
+    append(escape(data['class_name']))
+    append(' parse(String formattedString) {\n    if (formattedString.isEmpty()) {\n      return null;\n    }\n    ')
+    for scope1 in data['patterns']:
+        scope2 = scope1['is_formattable']
+        if scope2:
+            scope3 = scope1['not_first']
+            if scope3:
+                append(' else ')
+            append('if (')
+            append(escape(scope1['upper_underscore']))
+            append('_PATH_TEMPLATE.matches(formattedString)) {\n      Map<String, String> matchMap = ')
+            append(escape(scope1['upper_underscore']))
+            append('_PATH_TEMPLATE.match(formattedString);\n      return of')
+            append(escape(scope1['upper_camel']))
+            append('Name(')
+            for scope3 in scope1['format_fields']:
+                append('\n          matchMap.get("')
+                append(escape(scope3['lower_underscore']))
+                append('")')
+                scope4 = scope3['not_last']
+                if scope4:
+                    append(', ')
+            append(');\n    }')
+        scope2 = scope1['is_fixed']
+        if scope2:
+            scope3 = scope1['not_first']
+            if scope3:
+                append(' else ')
+            append('if(')
+            append(escape(scope1['upper_underscore']))
+            append('_FIXED_VALUE.equals(formattedString)) {\n      return ')
+            append(escape(scope1['upper_underscore']))
+            append('_INSTANCE;\n    }')
+    append('\n    throw new ValidationException("JobName.parse: formattedString not in valid format");\n  }\n\n')
+    scope1 = data['has_no_single_pattern_subclasses']
+    if scope1:
+        append('  public static List<')
+        append(escape(data['class_name']))
+        append('> parseList(List<String> formattedStrings) {\n    List<')
+        append(escape(data['class_name']))
+        append('> list = new ArrayList<>(formattedStrings.size());\n    for (String formattedString : formattedStrings) {\n      list.add(parse(formattedString));\n    }\n    return list;\n  }\n\n  public static List<String> toStringList(List<')
+        append(escape(data['class_name']))
+        append('> values) {\n    List<String> list = new ArrayList<>(values.size());\n    for (')
+        append(escape(data['class_name']))
+        append(' value : values) {\n      if (value == null) {\n        list.add("");\n      } else {\n        list.add(value.toString());\n      }\n    }\n    return list;\n  }\n')
+    append('\n  public static boolean isParsableFrom(String formattedString) {\n    return ')
+    for scope1 in data['patterns']:
+        scope2 = scope1['is_formattable']
+        if scope2:
+            append(escape(scope1['upper_underscore']))
+            append('_PATH_TEMPLATE.matches(formattedString)')
+        scope2 = scope1['is_fixed']
+        if scope2:
+            append(escape(scope1['upper_underscore']))
+            append('_FIXED_VALUE.equals(formattedString)')
+        scope2 = scope1['not_last']
+        if scope2:
+            append('    \n        || ')
+    append(';\n  }\n  \n  @Override\n  public Map<String, String> getFieldValuesMap() {\n    if (fieldValuesMap == null) {\n      synchronized (this) {\n        if (fieldValuesMap == null) {\n          ImmutableMap.Builder<String, String> fieldMapBuilder = ImmutableMap.builder();')
+    for scope1 in data['format_fields']:
+        append('\n          if (')
+        append(escape(scope1['lower_camel_symbol']))
+        append(' != null) {\n            fieldMapBuilder.put("')
+        append(escape(scope1['lower_underscore']))
+        append('", ')
+        append(escape(scope1['lower_camel_symbol']))
+        append(');\n          }')
+    append('\n          fieldValuesMap = fieldMapBuilder.build();\n        }\n      }\n    }\n    return fieldValuesMap;\n  }\n\n  public String getFieldValue(String fieldName) {\n    return getFieldValuesMap().get(fieldName);\n  }\n\n  @Override\n  public String toString() {\n    return fixedValue != null ? fixedValue : pathTemplate.instantiate(getFieldValuesMap());\n  }\n\n  ')
+    for scope1 in data['patterns']:
+        scope2 = scope1['is_formattable']
+        if scope2:
+            append('/** Builder for ')
+            append(escape(scope1['pattern_string']))
+            append('. */')
+            scope3 = scope1['not_first']
+            if scope3:
+                append('\n  @BetaApi("The per-pattern Builders are not stable yet and may be changed in the future.")')
+            append('\n  public static class ')
+            scope3 = scope1['not_first']
+            if scope3:
+                append(escape(scope1['upper_camel']))
+            append('Builder {\n\n')
+            for scope3 in scope1['format_fields']:
+                append('    private String ')
+                append(escape(scope3['lower_camel_symbol']))
+                append(';\n')
+            append('\n    ')
+            scope3 = scope1['is_first']
+            if scope3:
+                append('protected')
+            scope3 = scope1['not_first']
+            if scope3:
+                append('private')
+            append(' ')
+            scope3 = scope1['not_first']
+            if scope3:
+                append(escape(scope1['upper_camel']))
+            append('Builder() { }\n\n')
+            for scope3 in scope1['format_fields']:
+                append('    public String get')
+                append(escape(scope3['upper_camel']))
+                append('() {\n      return ')
+                append(escape(scope3['lower_camel_symbol']))
+                append(';\n    }\n\n')
+            for scope3 in scope1['format_fields']:
+                append('    public ')
+                append(escape(scope3['pattern_builder_name']))
+                append(' set')
+                append(escape(scope3['upper_camel']))
+                append('(String ')
+                append(escape(scope3['lower_camel_symbol']))
+                append(') {\n      this.')
+                append(escape(scope3['lower_camel_symbol']))
+                append(' = ')
+                append(escape(scope3['lower_camel_symbol']))
+                append(';\n      return this;\n    }\n\n')
+            scope3 = scope1['is_first']
+            if scope3:
+                append('    private Builder(')
+                append(escape(data['class_name']))
+                append(' ')
+                append(escape(data['var_name']))
+                append(') {\n        Preconditions.checkArgument(\n            ')
+                append(escape(data['var_name']))
+                append('.pathTemplate == ')
+                append(escape(scope1['upper_underscore']))
+                append('_PATH_TEMPLATE,\n            "toBuilder is only supported when ')
+                append(escape(data['class_name']))
+                append(' has the pattern of "\n            + "')
+                append(escape(scope1['pattern_string']))
+                append('.");\n')
+                for scope4 in scope1['format_fields']:
+                    append('      ')
+                    append(escape(scope4['lower_camel_symbol']))
+                    append(' = ')
+                    append(escape(data['var_name']))
+                    append('.')
+                    append(escape(scope4['lower_camel_symbol']))
+                    append(';\n')
+                append('    }\n\n')
+            append('    public ')
+            append(escape(data['class_name']))
+            append(' build() {\n      return new ')
+            append(escape(data['class_name']))
+            append('(this);\n    }\n  }\n\n  ')
+    append('@Override\n  public boolean equals(Object o) {\n    if (o == this) {\n      return true;\n    }\n    if (o != null || getClass() == o.getClass()) {\n      ')
+    append(escape(data['class_name']))
+    append(' that = (')
+    append(escape(data['class_name']))
+    append(') o;\n      return ')
+    for scope1 in data['format_fields']:
+        scope2 = scope1['not_first']
+        if scope2:
+            append('\n          && ')
+        append('(Objects.equals(this.')
+        append(escape(scope1['lower_camel_symbol']))
+        append(', that.')
+        append(escape(scope1['lower_camel_symbol']))
+        append('))')
+    append(';\n    }\n    return false;\n  }\n\n  @Override\n  public int hashCode() {\n    int h = 1;\n    h *= 1000003;\n    h ^= Objects.hashCode(fixedValue);\n')
+    for scope1 in data['format_fields']:
+        append('    h *= 1000003;\n    h ^= Objects.hashCode(')
+        append(escape(scope1['lower_camel_symbol']))
+        append(');\n')
+    append('    return h;\n  }\n}\n')
+    return ''.join(out)
+
+
+def render_resource_name(data):
+    if type(data) is not dict:
+        raise FallbackRequired('data is not a dict')
+    out = []
+    append = out.append
+    append('/*\n * Copyright 2018 Google LLC\n *\n * Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except\n * in compliance with the License. You may obtain a copy of the License at\n *\n * http://www.apache.org/licenses/LICENSE-2.0\n *\n * Unless required by applicable law or agreed to in writing, software distributed under the License\n * is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express\n * or implied. See the License for the specific language governing permissions and limitations under\n * the License.\n */\n\npackage ')
+    append(escape(data['package']))
+    append(';\n\nimport com.google.common.base.Preconditions;\nimport com.google.common.collect.ImmutableMap;\nimport com.google.api.pathtemplate.PathTemplate;\nimport ')
+    append(escape(data['resource_name_global_package_name']))
+    append('.ResourceName;\nimport java.util.Map;\nimport java.util.ArrayList;\nimport java.util.List;\n\n/**\n * AUTO-GENERATED DOCUMENTATION AND CLASS\n */\n@javax.annotation.Generated("by GAPIC protoc plugin")\npublic class ')
+    append(escape(data['class_name']))
+    append(' ')
+    append(escape(data['extension_keyword']))
+    append(' ')
+    append(escape(data['parent_interface']))
+    append(' {\n\n  private static final PathTemplate PATH_TEMPLATE =\n      PathTemplate.createWithoutUrlEncoding("')
+    append(escape(data['format_string']))
+    append('");\n\n  private volatile Map<String, String> fieldValuesMap;\n\n')
+    for scope1 in data['format_fields']:
+        append('  private final String ')
+        append(escape(scope1['lower']))
+        append(';\n')
+    append('\n')
+    for scope1 in data['format_fields']:
+        append('  public String get')
+        append(escape(scope1['upper']))
+        append('() {\n    return ')
+        append(escape(scope1['lower']))
+        append(';\n  }\n\n')
+    append('  public static Builder newBuilder() {\n    return new Builder();\n  }\n\n  public Builder toBuilder() {\n    return new Builder(this);\n  }\n\n  private ')
+    append(escape(data['class_name']))
+    append('(Builder builder) {\n')
+    for scope1 in data['format_fields']:
+        append('    ')
+        append(escape(scope1['lower']))
+        append(' = Preconditions.checkNotNull(builder.get')
+        append(escape(scope1['upper']))
+        append('());\n')
+    append('  }\n\n  public static ')
+    append(escape(data['class_name']))
+    append(' of(')
+    for scope1 in data['parameter_list']:
+        append('String ')
+        append(escape(scope1['parameter']))
+        scope2 = scope1['not_last']
+        if scope2:
+            append(', ')
+    append(') {\n    return newBuilder()')
+    for scope1 in data['format_fields']:
+        append('\n      .set')
+        append(escape(scope1['upper']))
+        append('(')
+        append(escape(scope1['lower']))
+        append(')')
+    append('\n      .build();\n  }\n\n  public static String format(')
+    for scope1 in data['parameter_list']:
+        append('String ')
+        append(escape(scope1['parameter']))
+        scope2 = scope1['not_last']
+        if scope2:
+            append(', ')
+    append(') {\n    return newBuilder()')
+    for scope1 in data['format_fields']:
+        append('\n      .set')
+        append(escape(scope1['upper']))
+        append('(')
+        append(escape(scope1['lower']))
+        append(')')
+    append('\n      .build()\n      .toString();\n  }\n\n  public static ')
+    append(escape(data['class_name']))
+    append(' parse(String formattedString) {\n    if (formattedString.isEmpty()) {\n      return null;\n    }\n    Map<String, String> matchMap =\n        PATH_TEMPLATE.validatedMatch(formattedString, "')
+    append(escape(data['class_name']))
+    append('.parse: formattedString not in valid format");\n    return of(')
+    for scope1 in data['parameter_list']:
+        append('matchMap.get("')
+        append(escape(scope1['parameter_name']))
+        append('")')
+        scope2 = scope1['not_last']
+        if scope2:
+            append(', ')
+    append(');\n  }\n\n  public static List<')
+    append(escape(data['class_name']))
+    append('> parseList(List<String> formattedStrings) {\n    List<')
+    append(escape(data['class_name']))
+    append('> list = new ArrayList<')
+    append(variable([data], 'resourceTypeFullClassName', ('resourceTypeFullClassName',)))
+    append('>(formattedStrings.size());\n    for (String formattedString : formattedStrings) {\n      list.add(parse(formattedString));\n    }\n    return list;\n  }\n\n  public static List<String> toStringList(List<')
+    append(escape(data['class_name']))
+    append('> values) {\n    List<String> list = new ArrayList<String>(values.size());\n    for (')
+    append(escape(data['class_name']))
+    append(' value : values) {\n      if (value == null) {\n        list.add("");\n      } else {\n        list.add(value.toString());\n      }\n    }\n    return list;\n  }\n\n  public static boolean isParsableFrom(String formattedString) {\n    return PATH_TEMPLATE.matches(formattedString);\n  }\n\n  public Map<String, String> getFieldValuesMap() {\n    if (fieldValuesMap == null) {\n      synchronized (this) {\n        if (fieldValuesMap == null) {\n          ImmutableMap.Builder<String, String> fieldMapBuilder = ImmutableMap.builder();\n')
+    for scope1 in data['format_fields']:
+        append('          fieldMapBuilder.put("')
+        append(escape(scope1['parameter_name_in_map']))
+        append('", ')
+        append(escape(scope1['lower']))
+        append(');\n')
+    append('          fieldValuesMap = fieldMapBuilder.build();\n        }\n      }\n    }\n    return fieldValuesMap;\n  }\n\n  public String getFieldValue(String fieldName) {\n    return getFieldValuesMap().get(fieldName);\n  }\n\n  @Override\n  public String toString() {\n    return PATH_TEMPLATE.instantiate(')
+    for scope1 in data['parameter_list']:
+        append('"')
+        append(escape(scope1['parameter_name']))
+        append('", ')
+        append(escape(scope1['parameter']))
+        scope2 = scope1['not_last']
+        if scope2:
+            append(', ')
+    append(');\n  }\n\n  /** Builder for ')
+    append(escape(data['class_name']))
+    append('. */\n  public static class Builder ')
+    scope1 = data['builder_parent_class']
+    if scope1:
+        append('extends ')
+        append(escape(data['builder_parent_class']))
+        append('.Builder ')
+    append('{\n\n')
+    for scope1 in data['format_fields']:
+        append('    private String ')
+        append(escape(scope1['lower']))
+        append(';\n')
+    append('\n')
+    for scope1 in data['format_fields']:
+        append('    public String get')
+        append(escape(scope1['upper']))
+        append('() {\n      return ')
+        append(escape(scope1['lower']))
+        append(';\n    }\n\n')
+    for scope1 in data['format_fields']:
+        append('    public Builder set')
+        append(escape(scope1['upper']))
+        append('(String ')
+        append(escape(scope1['lower']))
+        append(') {\n      this.')
+        append(escape(scope1['lower']))
+        append(' = ')
+        append(escape(scope1['lower']))
+        append(';\n      return this;\n    }\n\n')
+    append('    private Builder() {\n    }\n\n    private Builder(')
+    append(escape(data['class_name']))
+    append(' ')
+    append(escape(data['var_name']))
+    append(') {\n')
+    for scope1 in data['format_fields']:
+        append('      ')
+        append(escape(scope1['lower']))
+        append(' = ')
+        append(escape(data['var_name']))
+        append('.')
+        append(escape(scope1['lower']))
+        append(';\n')
+    append('    }\n\n    public ')
+    append(escape(data['class_name']))
+    append(' build() {\n      return new ')
+    append(escape(data['class_name']))
+    append('(this);\n    }\n  }\n\n  @Override\n  public boolean equals(Object o) {\n    if (o == this) {\n      return true;\n    }\n    if (o instanceof ')
+    append(escape(data['class_name']))
+    append(') {\n      ')
+    append(escape(data['class_name']))
+    append(' that = (')
+    append(escape(data['class_name']))
+    append(') o;\n      return ')
+    for scope1 in data['parameter_list']:
+        scope2 = scope1['not_first']
+        if scope2:
+            append('\n          && ')
+        append('(this.')
+        append(escape(scope1['parameter']))
+        append('.equals(that.')
+        append(escape(scope1['parameter']))
+        append('))')
+    append(';\n    }\n    return false;\n  }\n\n  @Override\n  public int hashCode() {\n    int h = 1;\n')
+    for scope1 in data['parameter_list']:
+        append('    h *= 1000003;\n    h ^= ')
+        append(escape(scope1['parameter']))
+        append('.hashCode();\n')
+    append('    return h;\n  }\n}\n\n')
+    return ''.join(out)
+
+
+def render_resource_name_factory(data):
+    if type(data) is not dict:
+        raise FallbackRequired('data is not a dict')
+    out = []
+    append = out.append
+    append('/*\n * Copyright 2018 Google LLC\n *\n * Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except\n * in compliance with the License. You may obtain a copy of the License at\n *\n * http://www.apache.org/licenses/LICENSE-2.0\n *\n * Unless required by applicable law or agreed to in writing, software distributed under the License\n * is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express\n * or implied. See the License for the specific language governing permissions and limitations under\n * the License.\n */\n\npackage ')
+    append(escape(data['package']))
+    append(';\n\nimport ')
+    append(escape(data['resource_name_global_package_name']))
+    append('.ResourceName;\n\n/**\n * AUTO-GENERATED DOCUMENTATION AND CLASS\n *\n * @deprecated This resource name class will be removed in the next major version.\n */\n@javax.annotation.Generated("by GAPIC protoc plugin")\n@Deprecated\npublic class ')
+    append(escape(data['class_name']))
+    append(' {\n  private ')
+    append(escape(data['class_name']))
+    append('() {}\n\n  public static ')
+    append(escape(data['resource_class_name']))
+    append(' parse(String resourceNameString) {\n')
+    for scope1 in data['single_resource_types']:
+        append('    if (')
+        append(escape(scope1['resource_type_class_name']))
+        append('.isParsableFrom(resourceNameString)) {\n      return ')
+        append(escape(scope1['resource_type_class_name']))
+        append('.parse(resourceNameString);\n    }\n')
+    for scope1 in data['fixed_resource_types']:
+        append('    if (')
+        append(escape(scope1['resource_type_class_name']))
+        append('.matches(resourceNameString)) {\n      return ')
+        append(escape(scope1['resource_type_class_name']))
+        append('.instance();\n    }\n')
+    append('    return ')
+    append(escape(data['untyped_class_name']))
+    append('.parse(resourceNameString);\n  }\n}\n')
+    return ''.join(out)
+
+
+def render_resource_name_fixed(data):
+    if type(data) is not dict:
+        raise FallbackRequired('data is not a dict')
+    out = []
+    append = out.append
+    append('/*\n * Copyright 2018 Google LLC\n *\n * Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except\n * in compliance with the License. You may obtain a copy of the License at\n *\n * http://www.apache.org/licenses/LICENSE-2.0\n *\n * Unless required by applicable law or agreed to in writing, software distributed under the License\n * is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express\n * or implied. See the License for the specific language governing permissions and limitations under\n * the License.\n */\n\npackage ')
+    append(escape(data['package']))
+    append(';\n\nimport ')
+    append(escape(data['resource_name_global_package_name']))
+    append('.ResourceName;\nimport com.google.common.collect.ImmutableMap;\nimport java.util.Map;\n\n/**\n * AUTO-GENERATED DOCUMENTATION AND CLASS\n */\n@javax.annotation.Generated("by GAPIC protoc plugin")\npublic class ')
+    append(escape(data['class_name']))
+    append(' ')
+    append(escape(data['extension_keyword']))
+    append(' ')
+    append(escape(data['parent_interface']))
+    append(' {\n\n  private static final String FIXED_VALUE = "')
+    append(escape(data['fixed_value']))
+    append('";\n  private static final Map<String, String> valueMap = ImmutableMap.of("", FIXED_VALUE);\n\n  private static final ')
+    append(escape(data['class_name']))
+    append(' instance = new ')
+    append(escape(data['class_name']))
+    append('();\n\n  private ')
+    append(escape(data['class_name']))
+    append('() {}\n\n  public static ')
+    append(escape(data['class_name']))
+    append(' instance() {\n    return instance;\n  }\n\n  public static boolean matches(String value) {\n    return FIXED_VALUE.equals(value);\n  }\n\n  /**\n   * Return a map with a single value FIXED_VALUE keyed on an empty String "".\n   */\n  public Map<String, String> getFieldValuesMap() {\n    return valueMap;\n  }\n\n  /**\n   * Return the FIXED_VALUE if @param fieldName is an empty String "", else return null.\n   */\n  public String getFieldValue(String fieldName) {\n    return valueMap.get(fieldName);\n  }\n\n  @Override\n  public String toString() {\n    return FIXED_VALUE;\n  }\n}\n\n')
+    return ''.join(out)
+
+
+def render_untyped_resource_name(data):
+    if type(data) is not dict:
+        raise FallbackRequired('data is not a dict')
+    out = []
+    append = out.append
+    append('/*\n * Copyright 2018 Google LLC\n *\n * Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except\n * in compliance with the License. You may obtain a copy of the License at\n *\n * http://www.apache.org/licenses/LICENSE-2.0\n *\n * Unless required by applicable law or agreed to in writing, software distributed under the License\n * is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express\n * or implied. See the License for the specific language governing permissions and limitations under\n * the License.\n */\n\npackage ')
+    append(escape(data['package']))
+    append(';\n\nimport com.google.common.base.Preconditions;\nimport ')
+    append(escape(data['resource_name_global_package_name']))
+    append('.ResourceName;\nimport com.google.common.collect.ImmutableMap;\nimport java.util.ArrayList;\nimport java.util.List;\nimport java.util.Map;\n\n/**\n * AUTO-GENERATED DOCUMENTATION AND CLASS\n *\n * @deprecated This resource name class will be removed in the next major version.\n */\n@javax.annotation.Generated("by GAPIC protoc plugin")\n@Deprecated\npublic class ')
+    append(escape(data['class_name']))
+    append(' ')
+    append(escape(data['extension_keyword']))
+    append(' ')
+    append(escape(data['parent_interface']))
+    append(' {\n\n  private final String rawValue;\n  private Map<String, String> valueMap;\n\n  private ')
+    append(escape(data['class_name']))
+    append('(String rawValue) {\n    this.rawValue = Preconditions.checkNotNull(rawValue);\n    this.valueMap = ImmutableMap.of("", rawValue);\n  }\n\n  public static ')
+    append(escape(data['class_name']))
+    append(' from(ResourceName resourceName) {\n    return new ')
+    append(escape(data['class_name']))
+    append('(resourceName.toString());\n  }\n\n  public static ')
+    append(escape(data['class_name']))
+    append(' parse(String formattedString) {\n    return new ')
+    append(escape(data['class_name']))
+    append('(formattedString);\n  }\n\n  public static List<')
+    append(escape(data['class_name']))
+    append('> parseList(List<String> formattedStrings) {\n    List<')
+    append(escape(data['class_name']))
+    append('> list = new ArrayList<')
+    append(variable([data], 'resourceTypeFullClassName', ('resourceTypeFullClassName',)))
+    append('>(formattedStrings.size());\n    for (String formattedString : formattedStrings) {\n      list.add(parse(formattedString));\n    }\n    return list;\n  }\n\n  public static List<String> toStringList(List<')
+    append(escape(data['class_name']))
+    append('> values) {\n    List<String> list = new ArrayList<String>(values.size());\n    for (')
+    append(escape(data['class_name']))
+    append(' value : values) {\n      if (value == null) {\n        list.add("");\n      } else {\n        list.add(value.toString());\n      }\n    }\n    return list;\n  }\n\n  public static boolean isParsableFrom(String formattedString) {\n    return true;\n  }\n\n  /**\n   * Return a map with a single value rawValue keyed on an empty String "".\n   */\n  public Map<String, String> getFieldValuesMap() {\n    return valueMap;\n  }\n\n  /**\n   * Return the initial rawValue if @param fieldName is an empty String, else return null.\n   */\n  public String getFieldValue(String fieldName) {\n    return valueMap.get(fieldName);\n  }\n\n  @Override\n  public String toString() {\n    return rawValue;\n  }\n\n  @Override\n  public boolean equals(Object o) {\n    if (o == this) {\n      return true;\n    }\n    if (o instanceof ')
+    append(escape(data['class_name']))
+    append(') {\n      ')
+    append(escape(data['class_name']))
+    append(' that = (')
+    append(escape(data['class_name']))
+    append(') o;\n      return this.rawValue.equals(that.rawValue);\n    }\n    return false;\n  }\n\n  @Override\n  public int hashCode() {\n    return rawValue.hashCode();\n  }\n}\n')
+    return ''.join(out)
+
+
+TEMPLATE_HASHES = {
+    'deprecated_parent_resource_name.mustache': '3b414706ea96605388d89a4e5fd7ed375b5f983c6bdc243685039174a2158318',
+    'multi_pattern_resource_name.mustache': '88d398c505c6d62abc98cc0dd9542d77df3f8158c931a51d65331aa89afe299f',
+    'resource_name.mustache': '87a807cae7da33a599fb68bf70263583d5c972c8777bc7113873b105e6536c5f',
+    'resource_name_factory.mustache': 'f80af46b4a6f1552085ef8c7cd9a0a9af0b655b95ee1c07d51d8aab9165c520f',
+    'resource_name_fixed.mustache': '0fb73dcd1d0a1db957ede37438c0aab70b294ace9016ebe1c7d660775e901e32',
+    'untyped_resource_name.mustache': '22bf9da252959f35a89ff2e5c449cf39b8b9b975d65ec39a7a145741eee55458',
+}
+
+
+RENDERERS = {
+    'deprecated_parent_resource_name.mustache': render_deprecated_parent_resource_name,
+    'multi_pattern_resource_name.mustache': render_multi_pattern_resource_name,
+    'resource_name.mustache': render_resource_name,
+    'resource_name_factory.mustache': render_resource_name_factory,
+    'resource_name_fixed.mustache': render_resource_name_fixed,
+    'untyped_resource_name.mustache': render_untyped_resource_name,
+}
@@ -0,0 +1,410 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Compiles the mustache templates of this package into Python functions.
+
+The functions are written to compiled_templates.py, which is checked in.
+Run this after changing a template:
+
+    python -m plugin.templates.compiler
+
+Each template becomes a straight-line function that appends literals and
+looked up values to a list. CONTEXT_SCHEMAS describes the render context
+of each template, so that keys it knows are read straight from the dicts
+of the context, and sections over its lists become for loops. Any other
+key is looked up through the scopes as chevron does, and the body of a
+section over it becomes a function of its own. The generated module
+records a hash of every template, so that the registry can tell when a
+template has changed since it was compiled.
+"""
+
+from __future__ import print_function
+
+import io
+import os
+import sys
+
+from chevron.tokenizer import tokenize
+
+from plugin.templates.runtime import template_hash
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_EXTENSION = '.mustache'
+COMPILED_MODULE = os.path.join(TEMPLATE_DIR, 'compiled_templates.py')
+
+_HEADER = '''# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Use of this source code is governed by the BSD-style license in the
+# LICENSE file at the root of this repository.
+# flake8: noqa
+"""
+Render functions compiled from the mustache templates of this package.
+
+This file is generated by plugin/templates/compiler.py. Do not edit it.
+"""
+
+from plugin.templates.runtime import (FallbackRequired, escape, get_key,
+                                      no_escape, section, variable)
+'''
+
+# The keys of the render contexts built in resource_name.py. Each key maps
+# to the type of its value: str, bool, the schema of a dict, or a list
+# holding the schema of its items. Every key is set in every context, and
+# a context sets no other key.
+_BASE_CONTEXT = {
+    'class_name': str,
+    'package': str,
+    'resource_name_global_package_name': str,
+    'var_name': str,
+}
+_FORMAT_FIELD_CONTEXT = {
+    'lower_underscore': str,
+    'lower_camel': str,
+    'lower_camel_symbol': str,
+    'upper_underscore': str,
+    'upper_camel': str,
+    'not_first': bool,
+    'not_last': bool,
+}
+_PATTERN_CONTEXT = {
+    'is_fixed': bool,
+    'is_formattable': bool,
+    'pattern_string': str,
+    'lower_camel': str,
+    'upper_camel': str,
+    'upper_underscore': str,
+    'format_fields': [dict(_FORMAT_FIELD_CONTEXT, pattern_builder_name=str)],
+    'not_first': bool,
+    'is_first': bool,
+    'not_last': bool,
+}
+_PARENT_CONTEXT = dict(
+    _BASE_CONTEXT,
+    has_fixed_patterns=bool,
+    format_fields=[_FORMAT_FIELD_CONTEXT],
+    patterns=[_PATTERN_CONTEXT],
+    has_no_single_pattern_subclasses=bool)
+_RESOURCE_TYPE_CONTEXT = {
+    'resource_type_class_name': str,
+    'resource_type_var_name': str,
+    'resource_package': str,
+}
+
+CONTEXT_SCHEMAS = {
+    'deprecated_parent_resource_name.mustache': _PARENT_CONTEXT,
+    'multi_pattern_resource_name.mustache': dict(
+        _PARENT_CONTEXT, first_pattern=_PATTERN_CONTEXT),
+    'resource_name.mustache': dict(
+        _BASE_CONTEXT,
+        builder_parent_class=str,
+        parent_interface=str,
+        extension_keyword=str,
+        parameter_list=[{
+            'parameter': str,
+            'parameter_name': str,
+            'not_first': bool,
+            'not_last': bool,
+        }],
+        format_fields=[{
+            'upper': str,
+            'lower': str,
+            'parameter_name_in_map': str,
+        }],
+        format_string=str),
+    'resource_name_factory.mustache': dict(
+        _BASE_CONTEXT,
+        resource_class_name=str,
+        untyped_class_name=str,
+        single_resource_types=[_RESOURCE_TYPE_CONTEXT],
+        fixed_resource_types=[_RESOURCE_TYPE_CONTEXT]),
+    'resource_name_fixed.mustache': dict(
+        _BASE_CONTEXT,
+        fixed_value=str,
+        parent_interface=str,
+        extension_keyword=str),
+    'untyped_resource_name.mustache': dict(
+        _BASE_CONTEXT,
+        parent_interface=str,
+        extension_keyword=str),
+}
+
+
+def function_name(template_name):
+    """Returns the name of the render function of a template file."""
+    return 'render_' + template_name[:-len(TEMPLATE_EXTENSION)]
+
+
+class _Compiler(object):
+    """Compiles the tokens of one template into Python source.
+
+    Args:
+        name (str): The file name of the template.
+        text (str): The template.
+        schema (dict): The schema of the render context, if known.
+    """
+
+    def __init__(self, name, text, schema=None):
+        self.name = name
+        self.schema = schema
+        self.tokens = list(tokenize(text))
+        self.functions = []
+        self._pos = 0
+
+    def compile(self):
+        """Returns the source of the template's functions.
+
+        Raises:
+            ValueError: If the template uses a tag that is not supported.
+        """
+        lines = ['def {}(data):'.format(function_name(self.name))]
+        if self.schema is None:
+            body = self._block(None, [])
+            lines.append('    scopes = [data]')
+        else:
+            body = self._block(None, [], [('data', self.schema)])
+            lines.extend([
+                '    if type(data) is not dict:',
+                "        raise FallbackRequired('data is not a dict')"])
+        lines.extend(['    out = []',
+                      '    append = out.append'])
+        lines.extend('    ' + line for line in body)
+        lines.append("    return ''.join(out)")
+        self.functions.append('\n'.join(lines))
+        return '\n\n\n'.join(self.functions)
+
+    def _block(self, end_key, sections, levels=None):
+        # Returns the lines rendering the tokens up to the end tag of
+        # end_key. Without levels, the scopes are in a variable named
+        # scopes. Otherwise levels holds the expression and the schema of
+        # each scope, innermost first.
+        lines = []
+        literal = []
+        while self._pos < len(self.tokens):
+            tag, key = self.tokens[self._pos]
+            self._pos += 1
+            if tag != 'literal' and literal:
+                lines.append('append({!r})'.format(''.join(literal)))
+                literal = []
+            if tag == 'literal':
+                literal.append(key)
+            elif tag == 'end':
+                if key != end_key:
+                    raise ValueError('unexpected end of section ' + key)
+                return lines
+            elif tag in ('variable', 'no escape'):
+                lines.append(self._variable(tag, key, levels))
+            elif tag == 'section':
+                lines.extend(self._section(key, sections + [key], levels))
+            elif tag == 'inverted section':
+                if key in sections:
+                    # chevron ends a looped section at the end of a nested
+                    # inverted section with the same key.
+                    raise ValueError('inverted section nested in a section '
+                                     'with the same key: ' + key)
+                lines.extend(self._inverted_section(key, sections, levels))
+            elif tag != 'comment':
+                raise ValueError('unsupported tag: ' + tag)
+        if literal:
+            lines.append('append({!r})'.format(''.join(literal)))
+        if end_key is not None:
+            raise ValueError('unclosed section ' + end_key)
+        return lines
+
+    def _variable(self, tag, key, levels):
+        found = _resolve(levels, key)
+        if found is None or found[1] not in (str, bool):
+            function = 'variable' if tag == 'variable' else 'no_escape'
+            return 'append({}({}, {!r}, {!r}))'.format(
+                function, _scopes(levels), key, tuple(key.split('.')))
+        expression, value_type = found
+        if tag == 'variable':
+            return 'append(escape({}))'.format(expression)
+        if value_type is str:
+            return 'append({})'.format(expression)
+        return 'append(str({}))'.format(expression)
+
+    def _nested_block(self, key, sections, levels):
+        # Returns the indented lines of a section body over levels.
+        body = self._block(key, sections, levels) or ['pass']
+        return ['    ' + line for line in body]
+
+    def _body_function(self, key, sections):
+        # Compiles a section body into a function and returns its name.
+        name = '_{}_{}'.format(function_name(self.name),
+                               len(self.functions))
+        # Reserve the slot, so that nested functions are numbered after it.
+        index = len(self.functions)
+        self.functions.append(None)
+        body = self._block(key, sections) or ['pass']
+        lines = ['def {}(scopes, append):'.format(name),
+                 '    # {{{{#{}}}}}'.format(key)]
+        lines.extend('    ' + line for line in body)
+        self.functions[index] = '\n'.join(lines)
+        return name
+
+    def _section(self, key, sections, levels):
+        found = _resolve(levels, key)
+        if found is not None:
+            expression, value_type = found
+            scope = 'scope{}'.format(len(levels))
+            if isinstance(value_type, list):
+                # Items are dicts with keys, so none of them is falsy.
+                lines = ['for {} in {}:'.format(scope, expression)]
+                value_type = value_type[0]
+            else:
+                lines = ['{} = {}'.format(scope, expression),
+                         'if {}:'.format(scope)]
+            return lines + self._nested_block(
+                key, sections, [(scope, value_type)] + levels)
+        name = self._body_function(key, sections)
+        lines = [] if levels is None else \
+            ['scopes = {}'.format(_scopes(levels))]
+        return lines + [
+            'value, loop = section(scopes, {!r}, {!r})'.format(
+                key, tuple(key.split('.'))),
+            'if loop:',
+            '    for item in value:',
+            '        if item:',
+            '            {}([item] + scopes, append)'.format(name),
+            'else:',
+            '    scopes.insert(0, value)',
+            '    if value:',
+            '        {}(scopes, append)'.format(name),
+            '    del scopes[0]',
+        ]
+
+    def _inverted_section(self, key, sections, levels):
+        found = _resolve(levels, key)
+        if found is not None:
+            # chevron renders the body with True as its innermost scope.
+            return ['if not {}:'.format(found[0])] + self._nested_block(
+                key, sections, [('True', bool)] + levels)
+        name = self._body_function(key, sections)
+        lines = [] if levels is None else \
+            ['scopes = {}'.format(_scopes(levels))]
+        return lines + [
+            'value = not get_key(scopes, {!r}, {!r})'.format(
+                key, tuple(key.split('.'))),
+            'scopes.insert(0, value)',
+            'if value:',
+            '    {}(scopes, append)'.format(name),
+            'del scopes[0]',
+        ]
+
+
+def _scopes(levels):
+    # Returns the expression of the scopes list that chevron would hold.
+    if levels is None:
+        return 'scopes'
+    return '[{}]'.format(', '.join(expression for expression, _ in levels))
+
+
+def _resolve(levels, key):
+    # Returns the expression and the type of the value of a key, or None
+    # when the value is not known from the schemas of the scopes.
+    if levels is None or key == '.':
+        return None
+    parts = key.split('.')
+    for expression, value_type in levels:
+        if not isinstance(value_type, dict):
+            # chevron looks the key up as an attribute of a str or bool
+            # scope, or as an index of a str scope.
+            if hasattr(value_type, parts[0]) or _is_int(parts[0]):
+                return None
+            continue
+        for part in parts:
+            if not isinstance(value_type, dict):
+                return None
+            if part not in value_type:
+                break
+            expression += '[{!r}]'.format(part)
+            value_type = value_type[part]
+        else:
+            return expression, value_type
+    return None
+
+
+def _is_int(text):
+    try:
+        int(text)
+    except ValueError:
+        return False
+    return True
+
+
+def compile_template(name, text, schema=None):
+    """Returns the Python source of the render functions of a template.
+
+    Args:
+        name (str): The file name of the template.
+        text (str): The template.
+        schema (dict): The schema of the render context, in the form of
+            CONTEXT_SCHEMAS. Without one, every key is looked up through
+            the scopes.
+
+    Raises:
+        ValueError: If the template uses a tag that is not supported.
+    """
+    return _Compiler(name, text, schema).compile()
+
+
+def generate_module(template_dir=TEMPLATE_DIR):
+    """Returns the source of the compiled templates module."""
+    names = sorted(n for n in os.listdir(template_dir)
+                   if n.endswith(TEMPLATE_EXTENSION))
+    hashes = []
+    functions = []
+    renderers = []
+    for name in names:
+        with io.open(os.path.join(template_dir, name), 'r',
+                     encoding='utf-8') as f:
+            text = f.read()
+        functions.append(compile_template(
+            name, text, CONTEXT_SCHEMAS.get(name)))
+        hashes.append('    {!r}: {!r},'.format(name, template_hash(text)))
+        renderers.append('    {!r}: {},'.format(name, function_name(name)))
+    parts = [_HEADER.rstrip('\n')]
+    parts.extend(functions)
+    parts.append('\n'.join(['TEMPLATE_HASHES = {'] + hashes + ['}']))
+    parts.append('\n'.join(['RENDERERS = {'] + renderers + ['}']))
+    return '\n\n\n'.join(parts) + '\n'
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    output = argv[0] if argv else COMPILED_MODULE
+    source = generate_module()
+    with io.open(output, 'w', encoding='utf-8') as f:
+        f.write(source)
+    print('wrote {}'.format(output))
+
+
+if __name__ == '__main__':
+    main()
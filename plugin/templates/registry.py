@@ -0,0 +1,232 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+A registry of the mustache templates in this package, each read from disk
+and tokenized once per process.
+
+Templates are rendered by the functions in compiled_templates.py when the
+template on disk is the one that was compiled, and by chevron otherwise.
+chevron is only imported, and templates only tokenized, when needed.
+"""
+
+import hashlib
+import io
+import os
+import sys
+import threading
+
+from plugin import __version__
+from plugin.templates.runtime import FallbackRequired, template_hash
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_EXTENSION = '.mustache'
+
+# The number of models sent to a render worker at a time.
+RENDER_CHUNK_SIZE = 8
+
+
+class TemplateRegistry(object):
+    """Keeps the tokenized form of templates and renders from it.
+
+    Args:
+        template_dir (str): The directory that preload() reads.
+        use_compiled (bool): Whether to render with compiled templates.
+            The compiled templates reproduce chevron's output, but rely on
+            Python 3 string semantics.
+    """
+
+    def __init__(self, template_dir=TEMPLATE_DIR, use_compiled=True):
+        self.template_dir = template_dir
+        self.use_compiled = use_compiled and sys.version_info[0] >= 3
+        self._texts = {}
+        self._tokens = {}
+        self._compiled = {}
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def get_tokens(self, template_path):
+        """Returns the chevron tokens of a template, loading it once.
+
+        Args:
+            template_path (str): The path to the template file.
+
+        Returns:
+            list: The (tag, key) tokens of the template.
+        """
+        template_path = os.path.abspath(template_path)
+        tokens = self._tokens.get(template_path)
+        if tokens is None:
+            text = self._get_text(template_path)
+            with self._lock:
+                tokens = self._tokens.get(template_path)
+                if tokens is None:
+                    from chevron.tokenizer import tokenize
+                    tokens = self._tokens[template_path] = \
+                        list(tokenize(text))
+        return tokens
+
+    def get_compiled(self, template_path):
+        """Returns the compiled render function of a template, or None.
+
+        A template has no compiled function when it was not compiled, or
+        when it changed after it was compiled.
+        """
+        template_path = os.path.abspath(template_path)
+        self._get_text(template_path)
+        return self._compiled.get(template_path)
+
+    def get_hash(self, template_path):
+        """Returns the sha256 of the text of a template."""
+        template_path = os.path.abspath(template_path)
+        self._get_text(template_path)
+        return self._hashes[template_path]
+
+    def render(self, template_path, data):
+        """Renders a template with data, using its cached tokens."""
+        if self.use_compiled:
+            render_compiled = self.get_compiled(template_path)
+            if render_compiled is not None:
+                try:
+                    return render_compiled(data)
+                except FallbackRequired:
+                    pass
+        import chevron
+        return chevron.render(self.get_tokens(template_path), data)
+
+    def preload(self):
+        """Loads every template in the template directory."""
+        for name in sorted(os.listdir(self.template_dir)):
+            if name.endswith(TEMPLATE_EXTENSION):
+                self._get_text(os.path.join(self.template_dir, name))
+
+    def loaded_templates(self):
+        """Returns the paths of the templates loaded so far."""
+        return sorted(self._texts)
+
+    def _get_text(self, template_path):
+        # Reads a template once, and finds its compiled function.
+        text = self._texts.get(template_path)
+        if text is not None:
+            return text
+        with self._lock:
+            text = self._texts.get(template_path)
+            if text is not None:
+                return text
+            with io.open(template_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            text_hash = self._hashes[template_path] = template_hash(text)
+            if self.use_compiled:
+                from plugin.templates import compiled_templates
+                name = os.path.basename(template_path)
+                if compiled_templates.TEMPLATE_HASHES.get(name) == text_hash:
+                    self._compiled[template_path] = \
+                        compiled_templates.RENDERERS[name]
+            self._texts[template_path] = text
+        return text
+
+
+_registry = TemplateRegistry()
+
+
+def render(resource):
+    """Renders the template of a resource name model."""
+    return _registry.render(resource.template_path(),
+                            resource.render_context())
+
+
+def preload():
+    """Loads every template of this package ahead of the first render."""
+    _registry.preload()
+
+
+def templates_hash():
+    """Returns a sha256 of the names and texts of every template."""
+    _registry.preload()
+    digest = hashlib.sha256()
+    for template_path in _registry.loaded_templates():
+        digest.update('{} {}\n'.format(
+            os.path.basename(template_path),
+            _registry.get_hash(template_path)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def render_all(resources, pool=None, cache=None):
+    """Renders resource name models, yielding their contents in order.
+
+    Args:
+        resources (list): The models to render.
+        pool (multiprocessing.Pool): If given, the models are rendered by
+            its worker processes, which receive their render contexts.
+        cache (~.DiskCache): If given, models found in the cache are not
+            rendered, and the others are stored in it.
+    """
+    if cache is None:
+        return _render_all(resources, pool)
+    return _render_all_cached(resources, pool, cache)
+
+
+def _render_all(resources, pool):
+    if pool is None or len(resources) <= 1:
+        return (render(resource) for resource in resources)
+    tasks = [(resource.template_path(), resource.render_context())
+             for resource in resources]
+    return pool.imap(_render_task, tasks, RENDER_CHUNK_SIZE)
+
+
+def _render_all_cached(resources, pool, cache):
+    keys = [render_key(resource) for resource in resources]
+    cached = [cache.get(key) for key in keys]
+    rendered = _render_all(
+        [r for r, content in zip(resources, cached) if content is None], pool)
+    for key, content in zip(keys, cached):
+        if content is None:
+            content = next(rendered)
+            cache.put(key, content)
+        yield content
+
+
+def _render_task(task):
+    template_path, context = task
+    return _registry.render(template_path, context)
+
+
+def render_key(resource):
+    """Returns a hash that identifies the rendered text of a model.
+
+    The hash covers the plugin version, the template text and the render
+    context, which holds everything that the template reads from the
+    model, such as its class name, package, patterns and oneof.
+    """
+    import json
+    template_path = resource.template_path()
+    data = json.dumps([__version__, os.path.basename(template_path),
+                       _registry.get_hash(template_path),
+                       resource.render_context()],
+                      sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
@@ -27,9 +27,11 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import copy
 import os
 import re
-from collections import OrderedDict
+import threading
+from collections import OrderedDict, namedtuple
 from plugin.utils import path_template
 from plugin.utils import casing_utils
 from plugin.utils.symbol_table import SymbolTable
@@ -39,13 +41,41 @@ RESOURCE_NAMES_GLOBAL_PACKAGE_JAVA = 'com.google.api.resourcenames'
 
 class ResourceNameBase(object):
 
+    __slots__ = ('class_name', 'package', 'full_class_name', 'var_name',
+                 '_context')
+
+    resource_name_global_package_name = RESOURCE_NAMES_GLOBAL_PACKAGE_JAVA
+
+    # The attributes that the template of the model reads.
+    render_keys = ('class_name', 'package',
+                   'resource_name_global_package_name', 'var_name')
+
     def __init__(self, class_name, package):
         self.class_name = class_name
         self.package = package
-        self.resource_name_global_package_name = \
-            RESOURCE_NAMES_GLOBAL_PACKAGE_JAVA
         self.full_class_name = self.package + '.' + self.class_name
         self.var_name = casing_utils.get_lower(self.class_name)
+        self._context = None
+
+    def with_package(self, package):
+        """Returns this model, or a copy of it, in the given java package."""
+        if package == self.package:
+            return self
+        model = copy.copy(self)
+        model.package = package
+        model.full_class_name = package + '.' + self.class_name
+        model._context = None
+        return model
+
+    def render_context(self):
+        """Returns the data of the template as dicts, lists and scalars.
+
+        The context is built on the first call and kept, so the model must
+        not change afterwards.
+        """
+        if self._context is None:
+            self._context = get_render_context(self)
+        return self._context
 
     def filename(self):
         class_dir = self.package.replace('.', os.path.sep)
@@ -61,6 +91,15 @@ class ResourceNameBase(object):
 
 class ResourceName(ResourceNameBase):
 
+    __slots__ = ('format_name_lower', 'type_name_upper',
+                 'builder_parent_class', 'parent_interface',
+                 'extension_keyword', 'parameter_list', 'format_fields',
+                 'format_string')
+
+    render_keys = ResourceNameBase.render_keys + (
+        'builder_parent_class', 'parent_interface', 'extension_keyword',
+        'parameter_list', 'format_fields', 'format_string')
+
     def __init__(self, collection_config, java_package, oneof):
         super(ResourceName, self).__init__(
             casing_utils.get_resource_type_class_name(
@@ -85,23 +124,23 @@ class ResourceName(ResourceNameBase):
         else:
             self.parent_interface = 'ResourceName'
             self.extension_keyword = 'implements'
-        self.parameter_list = [{
-            'parameter': symbol_table.getNewSymbol(
-                casing_utils.lower_underscore_to_lower_camel(lit)),
-            'parameter_name': lit,
-            'not_first': True,
-            'not_last': True,
-        } for lit in id_segments]
-        self.parameter_list[0]['not_first'] = False
-        self.parameter_list[-1]['not_last'] = False
-        self.format_fields = [{
-            'upper': casing_utils.lower_underscore_to_upper_camel(
-                f['parameter_name']),
-            'lower': f['parameter'],
-            'parameter_name_in_map':
-                casing_utils.lower_underscore_to_lower_camel(
-                    f['parameter_name']),
-        } for f in self.parameter_list]
+        last = len(id_segments) - 1
+        self.parameter_list = []
+        self.format_fields = []
+        for i, lit in enumerate(id_segments):
+            field = get_format_field(lit, symbol_table.getNewSymbol(
+                casing_utils.lower_underscore_to_lower_camel(lit)))
+            self.parameter_list.append({
+                'parameter': field.lower_camel_symbol,
+                'parameter_name': lit,
+                'not_first': i > 0,
+                'not_last': i < last,
+            })
+            self.format_fields.append({
+                'upper': field.upper_camel,
+                'lower': field.lower_camel_symbol,
+                'parameter_name_in_map': field.lower_camel,
+            })
         self.format_string = collection_config.name_pattern
 
     def template_name(self):
@@ -110,6 +149,14 @@ class ResourceName(ResourceNameBase):
 
 class ParentResourceName(ResourceNameBase):
 
+    __slots__ = ('has_fixed_patterns', 'has_formattable_patterns',
+                 'format_fields', 'patterns',
+                 'has_no_single_pattern_subclasses', 'first_pattern')
+
+    render_keys = ResourceNameBase.render_keys + (
+        'has_fixed_patterns', 'format_fields', 'patterns',
+        'has_no_single_pattern_subclasses', 'first_pattern')
+
     def __init__(self, oneof, java_package, pattern_strings):
         super(ParentResourceName, self).__init__(
             casing_utils.get_parent_resource_name_class_name(
@@ -136,105 +183,127 @@ class ParentResourceName(ResourceNameBase):
                     casing_utils.lower_underscore_to_lower_camel(seg))
                 segment_to_segment_symbols[seg] = symbol
 
-        self.format_fields = [
+        self.format_fields = get_format_field_contexts([
             get_format_field(segment, segment_symbol)
             for segment, segment_symbol in segment_to_segment_symbols.items()
-        ]
-        if self.format_fields:
-            self.format_fields[0]['not_first'] = False
-            self.format_fields[-1]['not_last'] = False
+        ])
 
+        last = len(pattern_strings) - 1
         self.patterns = [
             ResourceNamePattern(pattern,
                                 get_format_fields_for_pattern(
                                     pattern,
                                     pattern_to_id_segments,
-                                    segment_to_segment_symbols))
-            for pattern in pattern_strings]
+                                    segment_to_segment_symbols),
+                                is_first=i == 0, is_last=i == last)
+            for i, pattern in enumerate(pattern_strings)]
 
         self.has_no_single_pattern_subclasses = \
             not oneof.has_deprecated_collections
 
         if len(self.patterns) > 0:
             self.first_pattern = self.patterns[0]
-            self.patterns[0].set_first()
-            self.patterns[0].set_short_builder_name()
-            self.patterns[-1].set_last()
 
     def template_name(self):
         return "multi_pattern_resource_name.mustache" if self.patterns \
             else "deprecated_parent_resource_name.mustache"
 
 
-class ResourceNamePattern:
+class ResourceNamePattern(object):
+
+    __slots__ = ('is_fixed', 'is_formattable', 'pattern_string',
+                 'lower_camel', 'upper_camel', 'upper_underscore',
+                 'format_fields', 'builder_name', 'not_first', 'is_first',
+                 'not_last', '_context')
+
+    render_keys = ('is_fixed', 'is_formattable', 'pattern_string',
+                   'lower_camel', 'upper_camel', 'upper_underscore',
+                   'format_fields', 'not_first', 'is_first', 'not_last')
 
     def __init__(self, pattern_string,
-                 format_fields):
+                 format_fields, is_first=False, is_last=False):
         self.is_fixed = len(format_fields) == 0
         self.is_formattable = not self.is_fixed
         self.pattern_string = pattern_string
         pattern_id = get_pattern_name(pattern_string)
         pattern_naming_styles = get_format_field(pattern_id, "")
-        self.lower_camel = pattern_naming_styles['lower_camel']
-        self.upper_camel = pattern_naming_styles['upper_camel']
-        self.upper_underscore = pattern_naming_styles['upper_underscore']
-        self.format_fields = format_fields
-        self.builder_name = self.upper_camel + 'Builder'
-        if format_fields:
-            self.format_fields[0]['not_first'] = False
-            self.format_fields[-1]['not_last'] = False
-        for format_field in self.format_fields:
-            format_field['pattern_builder_name'] = self.builder_name
-        self.not_first = True
-        self.is_first = False
-        self.not_last = True
-
-    def set_first(self):
-        self.not_first = False
-        self.is_first = True
-
-    def set_last(self):
-        self.not_last = False
-
-    def set_short_builder_name(self):
-        self.builder_name = 'Builder'
-        for format_field in self.format_fields:
-            format_field['pattern_builder_name'] = self.builder_name
+        self.lower_camel = pattern_naming_styles.lower_camel
+        self.upper_camel = pattern_naming_styles.upper_camel
+        self.upper_underscore = pattern_naming_styles.upper_underscore
+        # The first pattern is built by the short-named Builder.
+        self.builder_name = \
+            'Builder' if is_first else self.upper_camel + 'Builder'
+        self.format_fields = get_format_field_contexts(
+            format_fields, pattern_builder_name=self.builder_name)
+        self.not_first = not is_first
+        self.is_first = is_first
+        self.not_last = not is_last
+        self._context = None
+
+    def render_context(self):
+        """Returns the data that templates read from the pattern."""
+        if self._context is None:
+            self._context = get_render_context(self)
+        return self._context
 
 
 class ResourceNameFactory(ResourceNameBase):
 
-    def __init__(self, oneof, java_package):
+    __slots__ = ('resource_class_name', 'untyped_class_name',
+                 'single_resource_types', 'fixed_resource_types',
+                 'resource_types')
+
+    render_keys = ResourceNameBase.render_keys + (
+        'resource_class_name', 'untyped_class_name',
+        'single_resource_types', 'fixed_resource_types')
+
+    def __init__(self, oneof, java_package, model_cache=None):
         super(ResourceNameFactory, self).__init__(
             casing_utils.get_resource_name_factory_class_name(
                 oneof.oneof_name),
             java_package)
 
+        if model_cache is None:
+            model_cache = ResourceModelCache()
         self.resource_class_name = \
             casing_utils.get_parent_resource_name_class_name(oneof.oneof_name)
         self.untyped_class_name = \
             casing_utils.get_untyped_resource_name_class_name(oneof.oneof_name)
-        self.single_resource_types = [{
-            'resource_type_class_name': resource.class_name,
-            'resource_type_var_name': resource.var_name,
-            'resource_package': resource.package,
-        } for resource in (ResourceName(x, java_package, oneof)
-                           for x in oneof.legacy_resource_list)]
-        self.fixed_resource_types = [{
-            'resource_type_class_name': resource.class_name,
-            'resource_type_var_name': resource.var_name,
-            'resource_package': resource.package,
-        } for resource in (ResourceNameFixed(x, java_package, oneof)
-                           for x in oneof.legacy_fixed_resource_list)]
+        self.single_resource_types = [
+            get_resource_type(model_cache.get(ResourceName, x, java_package,
+                                              oneof))
+            for x in oneof.legacy_resource_list]
+        self.fixed_resource_types = [
+            get_resource_type(model_cache.get(ResourceNameFixed, x,
+                                              java_package, oneof))
+            for x in oneof.legacy_fixed_resource_list]
         self.resource_types = (self.single_resource_types
                                + self.fixed_resource_types)
 
+    def with_package(self, package):
+        model = super(ResourceNameFactory, self).with_package(package)
+        if model is not self:
+            model.single_resource_types = [
+                dict(t, resource_package=package)
+                for t in self.single_resource_types]
+            model.fixed_resource_types = [
+                dict(t, resource_package=package)
+                for t in self.fixed_resource_types]
+            model.resource_types = (model.single_resource_types
+                                    + model.fixed_resource_types)
+        return model
+
     def template_name(self):
         return "resource_name_factory.mustache"
 
 
 class UntypedResourceName(ResourceNameBase):
 
+    __slots__ = ('parent_interface', 'extension_keyword')
+
+    render_keys = ResourceNameBase.render_keys + (
+        'parent_interface', 'extension_keyword')
+
     def __init__(self, oneof, java_package):
         super(UntypedResourceName, self).__init__(
             casing_utils.get_untyped_resource_name_class_name(
@@ -251,6 +320,11 @@ class UntypedResourceName(ResourceNameBase):
 
 class ResourceNameFixed(ResourceNameBase):
 
+    __slots__ = ('fixed_value', 'parent_interface', 'extension_keyword')
+
+    render_keys = ResourceNameBase.render_keys + (
+        'fixed_value', 'parent_interface', 'extension_keyword')
+
     def __init__(self, fixed_config, java_package, oneof):
         super(ResourceNameFixed, self).__init__(
             casing_utils.get_fixed_resource_type_class_name(
@@ -270,39 +344,124 @@ class ResourceNameFixed(ResourceNameBase):
         return "resource_name_fixed.mustache"
 
 
-def get_id_segments(pattern):
-    name_template = path_template.PathTemplate(pattern)
-    return [
-        seg.literal for seg in name_template.segments
-        if seg.kind == path_template._BINDING
-    ]
+class ResourceModelCache(object):
+    """Builds each resource name model once per run.
 
+    Models only depend on their java package through their package and
+    full class name, so a model built for one package is copied and rebound
+    when another package asks for it.
+    """
 
-def get_format_field(lower_underscore, symbol):
+    def __init__(self):
+        self._models = {}
+
+    def get(self, model_class, config, java_package, *args):
+        """Returns the model_class model of config in java_package.
+
+        The remaining arguments are passed to model_class the first time
+        the model is built. Models are keyed on the identity of config and
+        of each argument, since configs and pattern lists are not hashable.
+        """
+        key = (model_class, id(config)) + tuple(id(arg) for arg in args)
+        entry = self._models.get(key)
+        if entry is None:
+            # Keep config and args alive, so that their ids are not reused.
+            entry = self._models[key] = (
+                config, args, model_class(config, java_package, *args))
+        return entry[2].with_package(java_package)
+
+
+def get_resource_type(resource):
     return {
-        'lower_underscore': lower_underscore,
-        'lower_camel': casing_utils.lower_underscore_to_lower_camel(
-                       lower_underscore),
-        'lower_camel_symbol': symbol,
-        'upper_underscore': casing_utils.lower_underscore_to_upper_underscore(
-                            lower_underscore),
-        'upper_camel': casing_utils.lower_underscore_to_upper_camel(
-                       lower_underscore),
-        'not_first': True,
-        'not_last': True
+        'resource_type_class_name': resource.class_name,
+        'resource_type_var_name': resource.var_name,
+        'resource_package': resource.package,
     }
 
 
+def get_id_segments(pattern):
+    return list(path_template.PathTemplate(pattern).binding_names)
+
+
+# The casings of a format field. Fields are shared by every pattern and
+# resource that uses the same segment and symbol, so they are immutable.
+FormatField = namedtuple('FormatField', [
+    'lower_underscore', 'lower_camel', 'lower_camel_symbol',
+    'upper_underscore', 'upper_camel'])
+
+# The least recently used fields are evicted past this many, so that
+# long-lived plugin servers and workers do not grow without bound.
+FORMAT_FIELD_CACHE_SIZE = 4096
+
+_format_fields = OrderedDict()
+_format_fields_lock = threading.Lock()
+
+
+def _new_format_field(lower_underscore, symbol):
+    return FormatField(
+        lower_underscore=lower_underscore,
+        lower_camel=casing_utils.lower_underscore_to_lower_camel(
+            lower_underscore),
+        lower_camel_symbol=symbol,
+        upper_underscore=casing_utils.lower_underscore_to_upper_underscore(
+            lower_underscore),
+        upper_camel=casing_utils.lower_underscore_to_upper_camel(
+            lower_underscore))
+
+
+def get_format_field(lower_underscore, symbol):
+    key = (lower_underscore, symbol)
+    with _format_fields_lock:
+        field = _format_fields.pop(key, None)
+        if field is None:
+            field = _new_format_field(lower_underscore, symbol)
+            if len(_format_fields) >= FORMAT_FIELD_CACHE_SIZE:
+                _format_fields.popitem(last=False)
+        _format_fields[key] = field
+    return field
+
+
+def get_format_field_contexts(format_fields, **extra):
+    """Returns the template data of a list of format fields.
+
+    Each field gets the not_first and not_last flags of its position, and
+    the extra keys.
+    """
+    last = len(format_fields) - 1
+    contexts = []
+    for i, field in enumerate(format_fields):
+        context = dict(zip(FormatField._fields, field))
+        context.update(extra, not_first=i > 0, not_last=i < last)
+        contexts.append(context)
+    return contexts
+
+
 def get_format_fields_for_pattern(pattern,
                                   pattern_to_id_segments,
                                   segment_to_segment_symbols):
     if pattern not in pattern_to_id_segments:
         return []
-    format_fields = [get_format_field(seg, segment_to_segment_symbols[seg])
-                     for seg in pattern_to_id_segments[pattern]]
-    format_fields[0]['not_first'] = False
-    format_fields[-1]['not_last'] = False
-    return format_fields
+    return [get_format_field(seg, segment_to_segment_symbols[seg])
+            for seg in pattern_to_id_segments[pattern]]
+
+
+def get_render_context(model):
+    """Returns the render_keys of a model as a dict of plain data."""
+    context = {}
+    for key in model.render_keys:
+        try:
+            value = getattr(model, key)
+        except AttributeError:
+            continue
+        if isinstance(value, list):
+            value = [_plain(v) for v in value]
+        context[key] = _plain(value)
+    return context
+
+
+def _plain(value):
+    render_context = getattr(value, 'render_context', None)
+    return value if render_context is None else render_context()
 
 
 def is_fixed_pattern(pattern):
@@ -0,0 +1,129 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Helpers for the render functions in compiled_templates.py. They reproduce
+how chevron looks up keys, escapes values and treats section values, so
+that compiled templates render exactly what chevron renders.
+"""
+
+import hashlib
+
+try:
+    from collections.abc import Callable, Iterator, Sequence
+except ImportError:  # Python 2
+    from collections import Callable, Iterator, Sequence
+
+
+def template_hash(text):
+    """Returns the hash of a template recorded in the compiled module."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class FallbackRequired(Exception):
+    """Raised when a template needs chevron to render some data."""
+    pass
+
+
+def get_key(scopes, key, parts):
+    """Looks up a key in the scopes, as chevron does.
+
+    Args:
+        scopes (list): The scopes, innermost first.
+        key (str): The key as written in the template.
+        parts (tuple): The key split on dots.
+    """
+    if key == '.':
+        return scopes[0]
+
+    for scope in scopes:
+        try:
+            scope = _lookup(scope, parts)
+        except (AttributeError, KeyError, IndexError, ValueError):
+            continue
+
+        # Falsy values render as '', except 0 and False.
+        if scope in (0, False):
+            return scope
+
+        try:
+            if scope._CHEVRON_return_scope_when_falsy:
+                return scope
+        except AttributeError:
+            return scope or ''
+    return ''
+
+
+def _lookup(scope, parts):
+    for child in parts:
+        try:
+            scope = scope[child]
+        except (TypeError, AttributeError):
+            try:
+                scope = getattr(scope, child)
+            except (TypeError, AttributeError):
+                scope = scope[int(child)]
+    return scope
+
+
+def escape(value):
+    """Returns a looked up value as escaped text."""
+    if not isinstance(value, str):
+        value = str(value)
+    return value.replace('&', '&amp;').replace('"', '&quot;') \
+        .replace('<', '&lt;').replace('>', '&gt;')
+
+
+def variable(scopes, key, parts):
+    """Returns the escaped text of a variable tag."""
+    value = get_key(scopes, key, parts)
+    if value is True and key == '.':
+        value = scopes[1]
+    return escape(value)
+
+
+def no_escape(scopes, key, parts):
+    """Returns the text of a triple mustache variable tag."""
+    value = get_key(scopes, key, parts)
+    if not isinstance(value, str):
+        value = str(value)
+    return value
+
+
+def section(scopes, key, parts):
+    """Returns the value of a section and whether to loop over it.
+
+    Raises:
+        FallbackRequired: If the value is a lambda.
+    """
+    value = get_key(scopes, key, parts)
+    if isinstance(value, Callable):
+        raise FallbackRequired('section {} is a lambda'.format(key))
+    loop = isinstance(value, (Sequence, Iterator)) and \
+        not isinstance(value, str)
+    return value, loop
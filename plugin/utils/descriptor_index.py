@@ -0,0 +1,147 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+An index of the resource annotations and options of a
+CodeGeneratorRequest, built in a single pass over the files to generate.
+"""
+
+from plugin.pb2 import resource_pb2
+from plugin.utils import proto_utils
+
+
+class DescriptorIndex(object):
+    """Collects what the plugin reads from the files to generate.
+
+    Attributes:
+        files_to_generate (set): The names of the files to generate.
+        types_with_ref (set): Resource types referenced by a field.
+        types_with_child_references (set): Resource types referenced as the
+            child type of a field.
+        message_resources (list): The google.api.resource annotations of
+            messages that set a type, in file and message order.
+        java_packages (set): The java_package options of the files.
+    """
+
+    def __init__(self, request):
+        self.files_to_generate = set(request.file_to_generate)
+        self.types_with_ref = set()
+        self.types_with_child_references = set()
+        self.message_resources = []
+        self.java_packages = set()
+        self._type_resource_map = {}
+        self._pattern_resource_map = {}
+        self._error = None
+        self._files = []
+
+        for proto_file in request.proto_file:
+            # We only want to collect things from files we were
+            # explicitly asked to generate. Ignore the rest.
+            if proto_file.name in self.files_to_generate:
+                self._files.append(proto_file)
+                self._index_file(proto_file)
+
+    def fingerprint_parts(self):
+        """Yields, as bytes, everything that the index was built from.
+
+        These are the names of the files to generate, and their
+        java_package options and resource annotations, but not the rest of
+        the files, such as source info, which the plugin does not read.
+        """
+        for name in sorted(self.files_to_generate):
+            yield name.encode('utf-8')
+        for proto_file in self._files:
+            yield proto_file.name.encode('utf-8')
+            for _, value in proto_utils.get_named_options(proto_file,
+                                                          'java_package'):
+                yield value.encode('utf-8')
+            annotations = list(proto_file.options.Extensions[
+                resource_pb2.resource_definition])
+            for message in proto_file.message_type:
+                annotations.append(
+                    message.options.Extensions[resource_pb2.resource])
+                annotations.extend(
+                    field.options.Extensions[resource_pb2.resource_reference]
+                    for field in message.field)
+            for annotation in annotations:
+                yield annotation.SerializeToString(deterministic=True)
+
+    def get_resources(self):
+        """Returns all resources defined in proto annotations.
+
+        Returns:
+            tuple: A map of type to resource and a map of pattern to the
+                list of resources with that pattern.
+
+        Raises:
+            ValueError: If a resource type is defined more than once. This
+                is only raised here, so that requests which never look at
+                annotated resources are not rejected.
+        """
+        if self._error is not None:
+            raise self._error
+        return self._type_resource_map, self._pattern_resource_map
+
+    def _index_file(self, proto_file):
+        for _, value in proto_utils.get_named_options(proto_file,
+                                                      'java_package'):
+            if value:
+                self.java_packages.add(value)
+                break
+
+        extensions = proto_file.options.Extensions
+        for res in extensions[resource_pb2.resource_definition]:
+            self._collect_resource(res)
+
+        for message in proto_file.message_type:
+            res = message.options.Extensions[resource_pb2.resource]
+            self._collect_resource(res)
+            if res.type:
+                self.message_resources.append(res)
+            for field in message.field:
+                ref = field.options.Extensions[resource_pb2.resource_reference]
+                if ref.type:
+                    self.types_with_ref.add(ref.type)
+                if ref.child_type:
+                    self.types_with_child_references.add(ref.child_type)
+
+    def _collect_resource(self, res):
+        # Populate the pattern and type maps with this resource. Remember
+        # the first type that is defined twice.
+        if not res.pattern or self._error is not None:
+            return
+        if res.type in self._type_resource_map:
+            self._error = ValueError('same resource defined multiple times: '
+                                     '{}'.format(res.type))
+            return
+        self._type_resource_map[res.type] = res
+        # It is very likely that we will have multiple resources that
+        # supports a same pattern in the future (for example, Firestore),
+        # so let's put the resources in a list preemptively.
+        for ptn in res.pattern:
+            self._pattern_resource_map.setdefault(ptn, []).append(res)
@@ -0,0 +1,268 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+A directory of files keyed by hash, shared by concurrent processes.
+
+Entries are written to a temporary file and renamed into place, so readers
+see either a whole entry or none. A hit updates the modification time of
+the entry, and trim() removes the least recently used entries until the
+directory fits in its size bound.
+
+Walking the directory costs as much as the cache is large, so writers use
+maybe_trim() instead: it adds what they wrote to an estimate of the total
+size kept in the directory, and only trims once the estimate passes the
+bound.
+"""
+
+import errno
+import io
+import os
+import tempfile
+import threading
+import time
+
+# Temporary files older than this were left by a process that died while
+# writing them.
+_STALE_TEMP_SECONDS = 3600
+
+# The file in the cache directory that holds the size estimate.
+_SIZE_FILE = '.size'
+
+try:
+    _replace = os.replace
+except AttributeError:  # Python 2
+    _replace = os.rename
+
+
+class DiskCache(object):
+    """Stores text or bytes under hex keys in a directory.
+
+    Args:
+        directory (str): The cache directory, created if missing.
+        max_bytes (int): The size that trim() keeps the entries under.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # The bytes written since the size estimate was last updated.
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def get(self, key):
+        """Returns the text stored under key, or None."""
+        data = self.get_bytes(key)
+        return None if data is None else data.decode('utf-8')
+
+    def put(self, key, text):
+        """Stores text under key, replacing any previous entry."""
+        self.put_bytes(key, text.encode('utf-8'))
+
+    def get_bytes(self, key):
+        """Returns the bytes stored under key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except (IOError, OSError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            # The entry was trimmed by another process after it was read.
+            pass
+        self.hits += 1
+        return data
+
+    def put_bytes(self, key, data):
+        """Stores bytes under key, replacing any previous entry."""
+        entry = self.open_entry(key)
+        try:
+            entry.write(data)
+            entry.commit()
+        except BaseException:
+            entry.abort()
+            raise
+
+    def open_entry(self, key):
+        """Returns a PendingEntry that writes an entry under key in place.
+
+        The bytes written to it go to a temporary file, which commit()
+        renames into place, so large entries are never held in memory.
+        """
+        return PendingEntry(self, key)
+
+    def trim(self):
+        """Removes the least recently used entries over the size bound.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            self._pending_bytes = 0
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            if _remove(path):
+                total -= size
+                removed += 1
+        self._write_size(total)
+        return removed
+
+    def maybe_trim(self):
+        """Trims the cache if its estimated size is over the bound.
+
+        Adds the bytes this process wrote since the last call to the
+        estimate. The estimate is measured again by trim(), so updates lost
+        to concurrent writers and replaced entries only delay or hasten a
+        trim.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            size = self._read_size()
+            if size is not None:
+                size += self._pending_bytes
+                self._pending_bytes = 0
+                if size <= self.max_bytes:
+                    self._write_size(size)
+                    return 0
+        return self.trim()
+
+    def stats(self):
+        """Returns the statistics of the cache.
+
+        Returns:
+            dict: The number of entries and their total size in bytes, and
+                the hits and misses of this process.
+        """
+        entries = list(self._entries())
+        return {'entries': len(entries),
+                'bytes': sum(size for _, _, size in entries),
+                'hits': self.hits,
+                'misses': self.misses}
+
+    def _add_pending_bytes(self, size):
+        with self._lock:
+            self._pending_bytes += size
+
+    def _read_size(self):
+        # Returns the size estimate, or None if there is none yet.
+        try:
+            with open(os.path.join(self.directory, _SIZE_FILE)) as f:
+                return int(f.read())
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _write_size(self, size):
+        _makedirs(self.directory)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp')
+        try:
+            with io.open(fd, 'w') as f:
+                f.write(u'{}'.format(size))
+            _replace(temp_path, os.path.join(self.directory, _SIZE_FILE))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def _entries(self):
+        # Yields the (mtime, path, size) of every entry, and removes stale
+        # temporary files on the way.
+        stale = time.time() - _STALE_TEMP_SECONDS
+        for directory, _, names in os.walk(self.directory):
+            for name in names:
+                if name == _SIZE_FILE:
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if not name.startswith('.tmp'):
+                    yield stat.st_mtime, path, stat.st_size
+                elif stat.st_mtime < stale:
+                    _remove(path)
+
+
+class PendingEntry(object):
+    """A cache entry being written, returned by DiskCache.open_entry().
+
+    Call commit() to store the bytes written, or abort() to drop them.
+    """
+
+    def __init__(self, cache, key):
+        self._cache = cache
+        self._path = cache._path(key)
+        directory = os.path.dirname(self._path)
+        _makedirs(directory)
+        fd, self._temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp')
+        self._file = io.open(fd, 'wb')
+        self.size = 0
+
+    def write(self, data):
+        self._file.write(data)
+        self.size += len(data)
+
+    def commit(self):
+        """Renames the entry into place."""
+        self._file.close()
+        _replace(self._temp_path, self._path)
+        self._cache._add_pending_bytes(self.size)
+
+    def abort(self):
+        """Removes the temporary file of the entry."""
+        self._file.close()
+        _remove(self._temp_path)
+
+
+def _makedirs(directory):
+    try:
+        os.makedirs(directory)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+
+def _remove(path):
+    # Another process may have removed the file already.
+    try:
+        os.remove(path)
+    except OSError:
+        return False
+    return True
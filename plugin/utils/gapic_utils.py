@@ -28,10 +28,12 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from collections import OrderedDict
-import copy
-import yaml
+import sys
 
-from plugin.pb2 import resource_pb2
+from plugin.utils import pattern_index
+from plugin.utils import plugin_options
+from plugin.utils import profiling
+from plugin.utils.descriptor_index import DescriptorIndex
 from plugin.utils.casing_utils import to_snake
 from plugin.templates import resource_name
 
@@ -80,21 +82,40 @@ def create_gapic_config(gapic_yaml):
     return GapicConfig(collections, fixed_collections, oneofs)
 
 
-def read_from_gapic_yaml(request):
+def _load_gapic_yaml(yaml_file, cache_dir):
+    # yaml is slow to import, and most requests have no GAPIC YAML.
+    from plugin.utils import yaml_loader
+    if not cache_dir:
+        return yaml_loader.load_file(yaml_file)
+    from plugin.utils.disk_cache import DiskCache
+    cache = DiskCache(cache_dir, yaml_loader.CACHE_MAX_BYTES)
+    gapic_yaml = yaml_loader.load_file(yaml_file, cache)
+    if cache.misses:
+        cache.maybe_trim()
+    return gapic_yaml
+
+
+def read_from_gapic_yaml(request, index=None, options=None):
     """Read the GAPIC YAML from disk and process it.
 
     Args:
         request (~.plugins_pb2.CodeGeneratorRequest): A code generator
             request received from protoc. The name of the YAML file
             is in ``request.parameter``.
+        index (~.DescriptorIndex): The index of the request, if one has
+            been built already.
+        options (~.PluginOptions): The parsed ``request.parameter``, if
+            it has been parsed already.
     Returns:
         A final GapicConfig object containing all resource information.
     """
+    if options is None:
+        options = plugin_options.parse_parameter(request.parameter)
     # Load the YAML file from disk.
-    yaml_file = request.parameter
+    yaml_file = options.gapic_yaml
     if yaml_file:
-        with open(yaml_file) as f:
-            gapic_yaml = yaml.load(f, Loader=yaml.SafeLoader)
+        with profiling.phase('load_yaml'):
+            gapic_yaml = _load_gapic_yaml(yaml_file, options.yaml_cache_dir)
     else:
         gapic_yaml = {}
 
@@ -102,59 +123,54 @@ def read_from_gapic_yaml(request):
     # proto annotations have diverged. If we got a "GAPIC v2" or no GAPIC
     # YAML at all, we build an instance of the GapicConfig from both GAPIC
     # YAML and annotations.
-    if not gapic_yaml or gapic_yaml.get(
-            'config_schema_version', '1.0.0') != '1.0.0':
-        return create_gapic_config_v2(gapic_yaml, request)
-
-    return create_gapic_config(gapic_yaml)
-
+    with profiling.phase('scan_resources'):
+        if not gapic_yaml or gapic_yaml.get(
+                'config_schema_version', '1.0.0') != '1.0.0':
+            return create_gapic_config_v2(gapic_yaml, request, index)
 
-def create_gapic_config_v2(gapic_v2, request):  # noqa: C901
-    """Create a GAPIC config from GAPIC YAML V2 and proto annotations.
+        return create_gapic_config(gapic_yaml)
 
-    Args:
-        gapic_config (dict): A dictionary representing the GAPIC config
-            read from disk. This is must be a GAPIC config with a schema
-            version other than 1.0.0. It may be an empty dictionary
-            if no GAPIC config was present.
-        request (~.plugin_pb2.CodeGeneratorRequest): A code generator
-            request received from protoc.
-
-    Returns:
-        dict: A reconstructed GAPIC v1 config (at least as far as resource
-            names are concerned).
-    """
-    # Make a shallow copy of the GAPIC config, so that we are not
-    # modifying the passed dictionary in-place.
-    gapic_v2 = copy.copy(gapic_v2)
 
-    # For debugability, set the schema version to something new and exciting.
-    gapic_v2.setdefault('config_schema_version', 'unspecified')
-    gapic_v2['config_schema_version'] += '-reconstructed'
+def _scan_gapic_v2(gapic_v2, request, index=None):  # noqa: C901
+    # Collects the collections and collection oneofs of a GAPIC v2 config
+    # and of the resources in proto annotations, as GAPIC v1 dictionaries
+    # ordered by entity and oneof name.
 
     # Sort existing collections in a dictionary so we can look up by
     # name patterns. (This makes it easier to avoid plowing over stuff that
-    # is explicitly defined in YAML.)
-    collections = OrderedDict([(i['entity_name'], i)
+    # is explicitly defined in YAML.) The dictionaries are copied, so
+    # that the passed config is not modified.
+    collections = OrderedDict([(i['entity_name'], dict(i))
                                for i in gapic_v2.get('collections', ())])
     for interface in gapic_v2.get('interfaces', ()):
-        collections.update([(i['entity_name'], i)
+        collections.update([(i['entity_name'], dict(i))
                             for i in interface.get('collections', ())])
 
     # Do the same thing for collection oneofs, but order by entity names.
     collection_oneofs = OrderedDict([
-        (i['oneof_name'], i) for i in gapic_v2.get('collection_oneofs', ())
+        (i['oneof_name'], dict(i))
+        for i in gapic_v2.get('collection_oneofs', ())
     ])
     for interface in gapic_v2.get('interfaces', ()):
         collection_oneofs.update([
-            (i['oneof_name'], i)
+            (i['oneof_name'], dict(i))
             for i in interface.get('collection_oneofs', ())
         ])
 
     # Load all resources and resource references to make it easier to look up.
+    if index is None:
+        index = DescriptorIndex(request)
     types_with_ref, types_with_child_references = get_all_resource_references(
-        request)
-    type_resource_map, pattern_resource_map = get_all_resources(request)
+        request, index)
+    type_resource_map, pattern_resource_map = get_all_resources(request, index)
+    with profiling.phase('resolve_parents'):
+        parent_index = ParentResourceIndex(type_resource_map.values())
+        parents = dict(
+            (type, get_parent_resources(res, pattern_resource_map,
+                                        parent_index.all_resources,
+                                        parent_index))
+            for type, res in type_resource_map.items()
+            if type in types_with_child_references)
 
     # Put all referenced single-pattern resources defined in protos to
     # collections and all multi-pattern resources defined in protos to
@@ -168,29 +184,71 @@ def create_gapic_config_v2(gapic_v2, request):  # noqa: C901
         if type in types_with_ref:
             update_collections(res, collections, collection_oneofs)
 
-        if type in types_with_child_references:
-            parent_resources = \
-                get_parent_resources(res, pattern_resource_map,
-                                     list(type_resource_map.values()))
-            for parent_res in parent_resources:
-                update_collections(parent_res, collections, collection_oneofs)
+        for parent_res in parents.get(type, ()):
+            update_collections(parent_res, collections, collection_oneofs)
 
     # Collect all message-level resources regardless of whether they
     # are referenced.
-    for proto_file in request.proto_file:
-        if proto_file.name not in request.file_to_generate:
-            continue
-
-        # Iterate over all of the messages in the file.
-        for message in proto_file.message_type:
-            res = message.options.Extensions[resource_pb2.resource]
-            if res.type:
-                update_collections(res, collections, collection_oneofs)
+    for res in index.message_resources:
+        update_collections(res, collections, collection_oneofs)
 
     update_collections_with_deprecated_resources(
         gapic_v2,
         pattern_resource_map,
         collection_oneofs)
+    return collections, collection_oneofs
+
+
+def reconstruct_gapic_yaml(gapic_v2, request, index=None):
+    """Reconstruct a GAPIC v1 config from GAPIC YAML V2 and proto annotations.
+
+    The collections and collection oneofs of the interfaces are moved to
+    the top level, next to those found in proto annotations, so that
+    create_gapic_config builds the same GapicConfig from the result as
+    create_gapic_config_v2 does from the arguments.
+
+    Args:
+        gapic_v2 (dict): The GAPIC config read from disk, as passed to
+            create_gapic_config_v2. It is not modified.
+        request (~.plugin_pb2.CodeGeneratorRequest): A code generator
+            request received from protoc.
+        index (~.DescriptorIndex): The index of the request, if one has
+            been built already.
+
+    Returns:
+        dict: A GAPIC v1 config (at least as far as resource names are
+            concerned), made of plain dictionaries and lists.
+    """
+    collections, collection_oneofs = _scan_gapic_v2(gapic_v2, request, index)
+    gapic_v1 = dict(gapic_v2)
+    gapic_v1['config_schema_version'] = '1.0.0'
+    gapic_v1['collections'] = list(collections.values())
+    gapic_v1['collection_oneofs'] = list(collection_oneofs.values())
+    if 'interfaces' in gapic_v2:
+        gapic_v1['interfaces'] = [
+            dict((key, value) for key, value in interface.items()
+                 if key not in ('collections', 'collection_oneofs'))
+            for interface in gapic_v2['interfaces']]
+    return gapic_v1
+
+
+def create_gapic_config_v2(gapic_v2, request, index=None):
+    """Create a GAPIC config from GAPIC YAML V2 and proto annotations.
+
+    Args:
+        gapic_config (dict): A dictionary representing the GAPIC config
+            read from disk. This is must be a GAPIC config with a schema
+            version other than 1.0.0. It may be an empty dictionary
+            if no GAPIC config was present.
+        request (~.plugin_pb2.CodeGeneratorRequest): A code generator
+            request received from protoc.
+        index (~.DescriptorIndex): The index of the request, if one has
+            been built already.
+
+    Returns:
+        GapicConfig: The resource name configuration.
+    """
+    collections, collection_oneofs = _scan_gapic_v2(gapic_v2, request, index)
 
     single_resource_names, fixed_resource_names = \
         find_single_and_fixed_entities(collections.values())
@@ -225,119 +283,69 @@ def create_gapic_config_v2(gapic_v2, request):  # noqa: C901
                        oneof_configs)
 
 
-# Populate pattern_resource_map and type_resource_map with this resource.
-# Error if a pattern or a type already exist.
-def _collect_resource(res, type_resource_map, pattern_resource_map):
-    if not res.pattern:
-        return
-    if res.type in type_resource_map:
-        raise ValueError('same resource defined multiple times: {}'
-                         .format(res.type))
-    type_resource_map[res.type] = res
-    # It is very likely that we will have multiple resources that
-    # supports a same pattern in the future (for example, Firestore),
-    # so let's put the resources in a list preemptively.
-    for ptn in res.pattern:
-        pattern_resource_map.setdefault(ptn, [])
-        pattern_resource_map[ptn].append(res)
-
-
-def get_all_resources(request):
+def get_all_resources(request, index=None):
     """ Returns all resources defined in proto annotions.
     Iterate over the files to be generated looking for google.api.resource
     and google.api.resource_definition annotations that define resources.
     Put the pattern-to-resource and type-to-resource relations in two maps
     to make lookup easier.
     """
-    pattern_resource_map = {}
-    type_resource_map = {}
+    if index is None:
+        index = DescriptorIndex(request)
+    return index.get_resources()
 
-    for proto_file in request.proto_file:
-        # We only want to collect resources from files we were
-        # explicitly asked to generate. Ignore the rest.
-        if proto_file.name not in request.file_to_generate:
-            continue
 
-        extensions = proto_file.options.Extensions
-        for res in extensions[resource_pb2.resource_definition]:
-            _collect_resource(res, type_resource_map, pattern_resource_map)
+def build_pattern_index(request, index=None):
+    """ Returns a PatternIndex of the patterns of all resources defined in
+    proto annotations, to find patterns that can match the same name.
+    """
+    type_resource_map, _ = get_all_resources(request, index)
+    return pattern_index.index_resources(type_resource_map.values())
 
-        # Iterate over all of the messages in the file.
-        for message in proto_file.message_type:
-            res = message.options.Extensions[resource_pb2.resource]
-            _collect_resource(res, type_resource_map, pattern_resource_map)
 
-    return type_resource_map, pattern_resource_map
+def check_pattern_conflicts(request, index=None, fail=False):
+    """ Reports the patterns of proto annotations that are shadowed by an
+    earlier pattern of their resource, or that can match the same names as
+    a pattern of another resource.
 
+    Each conflict is written to stderr as a warning, unless fail is set.
 
-def get_all_resource_references(request):
+    Raises:
+        ValueError: If fail is set and there are conflicts.
+    """
+    conflicts = [
+        '{} of {}: {}'.format(entry.pattern, entry.owner,
+                              pattern_index.describe_conflict(kind, other))
+        for kind, entry, other in pattern_index.find_conflicts(
+            build_pattern_index(request, index))]
+    if conflicts and fail:
+        raise ValueError('conflicting resource name patterns:\n' +
+                         '\n'.join(conflicts))
+    for conflict in conflicts:
+        sys.stderr.write('warning: {}\n'.format(conflict))
+    return conflicts
+
+
+def get_all_resource_references(request, index=None):
     # Find all unified resource types that have references or child references.
     # We only generate resource names classes for those referenced.
-    types_with_child_references = set()
-    types_with_ref = set()
-    for proto_file in request.proto_file:
-        # We only want to do stuff with files we were explicitly asked to
-        # generate. Ignore the rest.
-        if proto_file.name not in request.file_to_generate:
-            continue
-
-        for message in proto_file.message_type:
-            for field in message.field:
-                # Get the resource reference for this field, if any.
-                ref_annotation = resource_pb2.resource_reference
-                ref = field.options.Extensions[ref_annotation]
-                if ref.type:
-                    types_with_ref.add(ref.type)
-                if ref.child_type:
-                    types_with_child_references.add(ref.child_type)
-    return types_with_ref, types_with_child_references
+    if index is None:
+        index = DescriptorIndex(request)
+    return index.types_with_ref, index.types_with_child_references
 
 
-def get_parent_resources(res, pattern_map, all_resources):
+def get_parent_resources(res, pattern_map, all_resources, parent_index=None):
     """ Return the parent resources of res.
     We consider the list of resources to be another resource Foo's parents
     if the union of all patterns in the list have one-to-one parent-child
     mapping with Foo's patterns.
+
+    Pass a ParentResourceIndex of all_resources as parent_index to reuse it
+    across calls.
     """
-    parent_patterns = build_parent_patterns(res.pattern)
-    parent_patterns_map = {pattern: False for pattern in parent_patterns}
-
-    for i in range(0, len(all_resources)):
-        parent_resources = _match_parent_resources(
-            parent_patterns_map, all_resources, [],
-            len(res.pattern), i)
-        if parent_resources is not None:
-            return parent_resources
-
-    return []
-
-
-def _match_parent_resources(parent_patterns_map, all_resources,
-                            matched_parent_resources, unmatched_count, i):
-    # We make a copy to advance in the depth-first search. There won't be
-    # too many patterns in a resource so performance-wise it is not a problem.
-    parent_patterns_map_copy = copy.copy(parent_patterns_map)
-    resource_to_match = all_resources[i]
-    for pattern in resource_to_match.pattern:
-        if pattern not in parent_patterns_map_copy:
-            return None
-        if not parent_patterns_map_copy[pattern]:
-            unmatched_count -= 1
-            parent_patterns_map_copy[pattern] = True
-    matched_parent_resources.append(resource_to_match)
-    if unmatched_count == 0:
-        return copy.copy(matched_parent_resources)
-    for j in range(i + 1, len(all_resources)):
-        answer = _match_parent_resources(parent_patterns_map_copy,
-                                         all_resources,
-                                         matched_parent_resources,
-                                         unmatched_count,
-                                         j)
-        # We stop when we find the first list of matched parent resources
-        if answer is not None:
-            return answer
-    matched_parent_resources.pop()
-    return None
+    if parent_index is None:
+        parent_index = ParentResourceIndex(all_resources)
+    return parent_index.find_parents(res)
 
 
 def update_collections(res, collections, collection_oneofs):
@@ -568,28 +576,38 @@ def load_collection_oneofs(config_list, existing_collections,
     return existing_oneofs
 
 
-def collect_resource_name_types(gapic_config, java_package):
+def collect_resource_name_types(gapic_config, java_package,
+                                model_cache=None):
+    """Returns the resource name models to generate in java_package.
+
+    Pass the same ResourceModelCache for every java package of a run, so
+    that models are only built once.
+    """
+    if model_cache is None:
+        model_cache = resource_name.ResourceModelCache()
     resources = []
 
     for collection_config in gapic_config.collection_configs.values():
         oneof = get_oneof_for_resource(collection_config, gapic_config)
-        resource = resource_name.ResourceName(
-            collection_config, java_package, oneof)
+        resource = model_cache.get(resource_name.ResourceName,
+                                   collection_config, java_package, oneof)
         resources.append(resource)
 
     for fixed_config in gapic_config.fixed_collections.values():
         oneof = get_oneof_for_resource(fixed_config, gapic_config)
-        resource = resource_name.ResourceNameFixed(
-            fixed_config, java_package, oneof)
+        resource = model_cache.get(resource_name.ResourceNameFixed,
+                                   fixed_config, java_package, oneof)
         resources.append(resource)
 
     for oneof_config in gapic_config.collection_oneofs.values():
-        parent_resource = resource_name.ParentResourceName(
-            oneof_config, java_package, oneof_config.pattern_strings)
-        untyped_resource = resource_name.UntypedResourceName(
-            oneof_config, java_package)
-        resource_factory = resource_name.ResourceNameFactory(
-            oneof_config, java_package)
+        parent_resource = model_cache.get(
+            resource_name.ParentResourceName, oneof_config, java_package,
+            oneof_config.pattern_strings)
+        untyped_resource = model_cache.get(
+            resource_name.UntypedResourceName, oneof_config, java_package)
+        resource_factory = model_cache.get(
+            resource_name.ResourceNameFactory, oneof_config, java_package,
+            model_cache)
         resources.append(parent_resource)
         # Only generate untyped resource class and factory class
         # when generating libraries from gapic config
@@ -601,15 +619,7 @@ def collect_resource_name_types(gapic_config, java_package):
 
 
 def get_oneof_for_resource(collection_config, gapic_config):
-    oneof = None
-    for oneof_config in gapic_config.collection_oneofs.values():
-        for collection_name in oneof_config.legacy_collection_names:
-            if collection_name == collection_config.entity_name:
-                if oneof:
-                    raise ValueError(
-                        "A collection cannot be part of multiple oneofs")
-                oneof = oneof_config
-    return oneof
+    return gapic_config.get_oneof(collection_config.entity_name)
 
 
 def create_field_name(message_name, field):
@@ -655,3 +665,58 @@ class GapicConfig(object):
         self.collection_configs = collection_configs
         self.fixed_collections = fixed_collections
         self.collection_oneofs = collection_oneofs
+        # Map each collection name to the oneof that lists it.
+        self._collection_oneofs = {}
+        for oneof_config in collection_oneofs.values():
+            for collection_name in oneof_config.legacy_collection_names:
+                if collection_name in self._collection_oneofs:
+                    raise ValueError(
+                        "A collection cannot be part of multiple oneofs")
+                self._collection_oneofs[collection_name] = oneof_config
+
+    def get_oneof(self, entity_name):
+        """Returns the CollectionOneof listing a collection, or None."""
+        return self._collection_oneofs.get(entity_name)
+
+
+class ParentResourceIndex(object):
+    """Finds the parent resources of a resource among a list of resources.
+
+    The parents of a resource are the first resources, in list order, whose
+    patterns are all parent patterns of the resource and which together
+    cover every one of them. Resources are indexed by pattern, so a lookup
+    only visits the resources that share a pattern with the parent patterns.
+    """
+
+    def __init__(self, all_resources):
+        self.all_resources = list(all_resources)
+        self._positions = {}
+        # Resources without patterns are parents of anything.
+        self._patternless = []
+        for position, res in enumerate(self.all_resources):
+            if not res.pattern:
+                self._patternless.append(position)
+            for pattern in set(res.pattern):
+                self._positions.setdefault(pattern, []).append(position)
+
+    def find_parents(self, res):
+        """Returns the parent resources of res, or [] if there are none."""
+        parent_patterns = set(build_parent_patterns(res.pattern))
+        # Fixed patterns and patterns that share a parent can never all be
+        # matched one-to-one.
+        if len(parent_patterns) != len(res.pattern):
+            return []
+        candidates = set(self._patternless)
+        for pattern in parent_patterns:
+            candidates.update(self._positions.get(pattern, ()))
+        parents = []
+        covered = set()
+        for position in sorted(candidates):
+            candidate = self.all_resources[position]
+            if not parent_patterns.issuperset(candidate.pattern):
+                continue
+            parents.append(candidate)
+            covered.update(candidate.pattern)
+            if len(covered) == len(parent_patterns):
+                return parents
+        return []
@@ -29,17 +29,44 @@
 
 """Implements a utility for parsing and formatting path templates."""
 from __future__ import absolute_import
-from collections import namedtuple
-
-from ply import lex, yacc
+from array import array
+from collections import namedtuple, OrderedDict
 
 import re
+import threading
+
+try:
+    from sys import intern
+except ImportError:  # Python 2 has intern as a builtin.
+    pass
+
+
+def _intern(literal):
+    # Python 2 only interns byte strings, and patterns from protobuf and
+    # YAML are unicode there, so those are kept as they are.
+    return intern(literal) if isinstance(literal, str) else literal
+
 
 _BINDING = 1
 _END_BINDING = 2
 _TERMINAL = 3
 _Segment = namedtuple('_Segment', ['kind', 'literal'])
 
+# The maximum number of distinct patterns kept in the parsed template cache.
+_TEMPLATE_CACHE_SIZE = 4096
+
+# The parser backend used unless set_parser_backend() picks another one.
+_DEFAULT_PARSER_BACKEND = 'linear'
+
+_LITERAL = r'(_deleted-topic_|[A-Za-z0-9]+([\-\_][A-Za-z0-9]+)*)'
+
+# Characters that separate the segments of a path being matched.
+_SEPARATORS = r'[/~_\-\.]'
+_SEPARATOR_RE = re.compile(_SEPARATORS)
+
+TemplateCacheInfo = namedtuple(
+    'TemplateCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
 
 def _format(segments):
     template = ''
@@ -66,13 +93,22 @@ class ValidationException(Exception):
 class PathTemplate(object):
     """Represents a path template."""
 
-    segments = None
     segment_count = 0
 
     def __init__(self, data):
-        parser = _Parser()
-        self.segments = parser.parse(data)
-        self.segment_count = parser.segment_count
+        parsed = _template_cache.get(data)
+        self._parsed = parsed
+        self.segment_count = parsed.segment_count
+
+    @property
+    def segments(self):
+        """tuple: The parsed segments, as _Segment tuples."""
+        return self._parsed.segments
+
+    @property
+    def binding_names(self):
+        """tuple: The names of the variables, in order of appearance."""
+        return self._parsed.binding_names
 
     def __len__(self):
         return self.segment_count
@@ -80,37 +116,35 @@ class PathTemplate(object):
     def __repr__(self):
         return _format(self.segments)
 
-    def render(self, bindings):
+    def render(self, bindings, validate=False):
         """Renders a string from a path template using the provided bindings.
 
         Args:
             bindings (dict): A dictionary of var names to binding strings.
+            validate (bool): Whether to check that the rendered path matches
+                this template.
 
         Returns:
             str: The rendered instantiation of this path template.
 
         Raises:
-            ValidationError: If a key isn't provided or if a sub-template can't
-                be parsed.
+            ValidationError: If a key isn't provided, if a sub-template can't
+                be parsed, or if validate is set and the rendered path does
+                not match.
         """
-        out = []
-        binding = False
-        for segment in self.segments:
-            if segment.kind == _BINDING:
-                if segment.literal not in bindings:
-                    raise ValidationException(
-                        ('rendering error: value for key \'{}\' '
-                         'not provided').format(segment.literal))
-                out.extend(PathTemplate(bindings[segment.literal]).segments)
-                binding = True
-            elif segment.kind == _END_BINDING:
-                binding = False
-            else:
-                if binding:
-                    continue
-                out.append(segment)
-        path = _format(out)
-        self.match(path)
+        pieces = []
+        for is_binding, value in self._parsed.get_render_plan():
+            if not is_binding:
+                pieces.append(value)
+                continue
+            if value not in bindings:
+                raise ValidationException(
+                    ('rendering error: value for key \'{}\' '
+                     'not provided').format(value))
+            pieces.append(_render_binding_value(bindings[value]))
+        path = '/'.join(pieces)
+        if validate:
+            self.match(path)
         return path
 
     def match(self, path):
@@ -125,33 +159,143 @@ class PathTemplate(object):
         Raises:
             ValidationException: If path can't be matched to the template.
         """
-        this = self.segments
-        that = re.split(r'[/~_\-\.]', path)
+        return self._parsed.get_matcher().match(path)
+
+    def match_many(self, paths):
+        """Matches many fully qualified path template strings.
+
+        Args:
+            paths (Iterable[str]): Fully qualified path template strings.
+
+        Returns:
+            list: For each path, in order, a dict of var names to matched
+                binding values, or None if the path can't be matched to the
+                template.
+        """
+        matcher = self._parsed.get_matcher()
+        return [matcher.match_or_none(path) for path in paths]
+
+
+class _ParsedTemplate(object):
+    """The parsed form of a pattern, shared by all of its PathTemplates.
+
+    Segments are not kept as one object each. Their kinds are stored in a
+    byte array and their literals in a tuple of interned strings, which
+    patterns with the same collection and variable names share.
+    """
+
+    __slots__ = ('kinds', 'literals', 'binding_names', 'segment_count',
+                 '_segments', '_matcher', '_render_plan')
+
+    def __init__(self, segments, segment_count):
+        self.kinds = array('B', [segment.kind for segment in segments])
+        self.literals = tuple(_intern(segment.literal)
+                              for segment in segments)
+        self.binding_names = tuple(
+            literal for kind, literal in zip(self.kinds, self.literals)
+            if kind == _BINDING)
+        self.segment_count = segment_count
+        self._segments = None
+        self._matcher = None
+        self._render_plan = None
+
+    @property
+    def segments(self):
+        """Returns the segments as _Segment tuples, building them once."""
+        if self._segments is None:
+            self._segments = tuple(
+                _Segment(kind, literal)
+                for kind, literal in zip(self.kinds, self.literals))
+        return self._segments
+
+    def get_render_plan(self):
+        """Returns the render plan for this template, building it once.
+
+        The plan is a tuple of (is_binding, value) pairs: runs of literal
+        segments outside of bindings, already joined with '/', interleaved
+        with the names of the bindings to substitute. Rendering joins the
+        pieces with '/'.
+        """
+        if self._render_plan is None:
+            self._render_plan = _build_render_plan(self.kinds,
+                                                   self.literals)
+        return self._render_plan
+
+    def get_matcher(self):
+        """Returns the _Matcher for this template, compiling it once."""
+        if self._matcher is None:
+            self._matcher = _Matcher(self.kinds, self.literals,
+                                     self.segment_count)
+        return self._matcher
+
+
+class _Matcher(object):
+    """A path matcher compiled once from a template's segments.
+
+    Paths are matched with an anchored regular expression. When it does not
+    match, the path is matched again by walking the compiled terminals, which
+    yields the precise error message (and handles the rare paths that have
+    fewer segments than the template but still match a path wildcard).
+    """
+
+    __slots__ = ('terminals', 'segment_count', 'regex', 'groups')
 
+    def __init__(self, kinds, literals, segment_count):
+        terminals = []
         current_var = None
+        for kind, literal in zip(kinds, literals):
+            if kind == _BINDING:
+                current_var = literal
+            elif kind == _TERMINAL:
+                terminals.append((literal, current_var))
+        self.terminals = tuple(terminals)
+        self.segment_count = segment_count
+        self.groups = tuple((literal == '**', var)
+                            for literal, var in terminals
+                            if literal in ('*', '**'))
+        self.regex = _compile_match_regex(terminals)
+
+    def match(self, path):
+        match = self.regex.match(path) if self.regex else None
+        if match is None:
+            return self._match_terminals(path)
+        bindings = {}
+        for (path_wildcard, var), value in zip(self.groups, match.groups()):
+            if path_wildcard:
+                value = _SEPARATOR_RE.sub('/', value)
+            bindings[var] = value
+        return bindings
+
+    def match_or_none(self, path):
+        try:
+            return self.match(path)
+        except ValidationException:
+            return None
+
+    def _match_terminals(self, path):
+        this = self.terminals
+        that = _SEPARATOR_RE.split(path)
+
         bindings = {}
         segment_count = self.segment_count
         j = 0
-        for i in range(0, len(this)):
+        for literal, current_var in this:
             if j >= len(that):
                 break
-            if this[i].kind == _TERMINAL:
-                if this[i].literal == '*':
-                    bindings[current_var] = that[j]
-                    j += 1
-                elif this[i].literal == '**':
-                    until = j + len(that) - segment_count + 1
-                    segment_count += len(that) - segment_count
-                    bindings[current_var] = '/'.join(that[j:until])
-                    j = until
-                elif this[i].literal != that[j]:
-                    raise ValidationException(
-                        'mismatched literal: \'%s\' != \'%s\'' % (
-                            this[i].literal, that[j]))
-                else:
-                    j += 1
-            elif this[i].kind == _BINDING:
-                current_var = this[i].literal
+            if literal == '*':
+                bindings[current_var] = that[j]
+                j += 1
+            elif literal == '**':
+                until = j + len(that) - segment_count + 1
+                segment_count += len(that) - segment_count
+                bindings[current_var] = '/'.join(that[j:until])
+                j = until
+            elif literal != that[j]:
+                raise ValidationException(
+                    'mismatched literal: \'%s\' != \'%s\'' % (
+                        literal, that[j]))
+            else:
+                j += 1
         if j != len(that) or j != segment_count:
             raise ValidationException(
                 'match error: could not render from the path template: {}'
@@ -159,6 +303,157 @@ class PathTemplate(object):
         return bindings
 
 
+def _build_render_plan(kinds, literals):
+    plan = []
+    pending = []
+    binding = False
+    for kind, literal in zip(kinds, literals):
+        if kind == _BINDING:
+            if pending:
+                plan.append((False, '/'.join(pending)))
+                pending = []
+            plan.append((True, literal))
+            binding = True
+        elif kind == _END_BINDING:
+            binding = False
+        elif not binding:
+            pending.append(literal)
+    if pending:
+        plan.append((False, '/'.join(pending)))
+    return tuple(plan)
+
+
+def _render_binding_value(value):
+    """Returns value as it is rendered into a path.
+
+    A value is parsed as a template itself and formatted back, which is the
+    identity for the common case of literals separated by slashes. Other
+    values go through the parsed template cache.
+    """
+    if _SIMPLE_VALUE_RE.match(value):
+        return value
+    return _format(_template_cache.get(value).segments)
+
+
+def _compile_match_regex(terminals):
+    """Returns a regex matching the paths that match terminals.
+
+    Each terminal matches one separator-delimited segment of the path, except
+    for a path wildcard, which matches one or more. Returns None if a literal
+    contains a separator, since such a template never matches a path.
+    """
+    parts = []
+    for literal, _ in terminals:
+        if literal == '*':
+            parts.append(r'([^/~_\-\.]*)')
+        elif literal == '**':
+            parts.append('(.*)')
+        elif _SEPARATOR_RE.search(literal):
+            return None
+        else:
+            parts.append(re.escape(literal))
+    return re.compile(_SEPARATORS.join(parts) + r'\Z', re.DOTALL)
+
+
+class _TemplateCache(object):
+    """A bounded, process-wide cache of parsed path templates.
+
+    The lexer and parser tables are built once, on first use, and every
+    distinct pattern is parsed at most once while it stays in the cache.
+    The least recently used pattern is evicted when the cache is full.
+    Patterns that fail to parse are not cached.
+    """
+
+    def __init__(self, maxsize, backend):
+        self.maxsize = maxsize
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._parser = None
+        self._entries = OrderedDict()
+        # The parser keeps per-parse state, so parsing is serialized too.
+        self._lock = threading.Lock()
+
+    def get(self, data):
+        """Returns the _ParsedTemplate for data, parsing it on a miss."""
+        with self._lock:
+            parsed = self._entries.pop(data, None)
+            if parsed is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                if self._parser is None:
+                    self._parser = _PARSER_BACKENDS[self.backend]()
+                segments = self._parser.parse(data)
+                parsed = _ParsedTemplate(segments,
+                                         self._parser.segment_count)
+                if len(self._entries) >= self.maxsize:
+                    self._entries.popitem(last=False)
+            self._entries[data] = parsed
+            return parsed
+
+    def info(self):
+        with self._lock:
+            return TemplateCacheInfo(self.hits, self.misses, self.maxsize,
+                                     len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def set_backend(self, backend):
+        with self._lock:
+            self.backend = backend
+            self._parser = None
+        self.clear()
+
+
+def template_cache_info():
+    """Returns hit and miss counters for the parsed template cache.
+
+    Returns:
+        TemplateCacheInfo: The hits, misses, maximum size and current size
+            of the process-wide cache.
+    """
+    return _template_cache.info()
+
+
+def clear_template_cache():
+    """Empties the parsed template cache and resets its counters."""
+    _template_cache.clear()
+
+
+def set_parser_backend(backend):
+    """Selects the parser used for patterns that are not cached yet.
+
+    Args:
+        backend (str): 'linear' for the built-in single-pass parser, or
+            'ply' for the ply-based LALR parser. Both produce the same
+            segments and the same validation errors.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend not in _PARSER_BACKENDS:
+        raise ValueError('unknown path template parser backend: {}'
+                         .format(backend))
+    _template_cache.set_backend(backend)
+
+
+def _check_path_wildcards(segments):
+    # Validation step: checks that there are no nested bindings.
+    path_wildcard = False
+    for segment in segments:
+        if segment.kind == _TERMINAL and segment.literal == '**':
+            if path_wildcard:
+                raise ValidationException(
+                    'validation error: path template cannot contain more '
+                    'than one path wildcard')
+            path_wildcard = True
+
+
 # pylint: disable=C0103
 # pylint: disable=R0201
 class _Parser(object):
@@ -180,7 +475,7 @@ class _Parser(object):
     t_EQUALS = r'='
     t_WILDCARD = r'\*'
     t_PATH_WILDCARD = r'\*\*'
-    t_LITERAL = r'(_deleted-topic_|[A-Za-z0-9]+([\-\_][A-Za-z0-9]+)*)'
+    t_LITERAL = _LITERAL
 
     t_ignore = ' \t'
 
@@ -188,6 +483,8 @@ class _Parser(object):
     segment_count = 0
 
     def __init__(self):
+        # ply is only needed by this backend, so it is imported lazily.
+        from ply import lex, yacc
         self.lexer = lex.lex(module=self)
         self.parser = yacc.yacc(module=self, debug=False, write_tables=False)
 
@@ -203,15 +500,7 @@ class _Parser(object):
         self.segment_count = 0
 
         segments = self.parser.parse(data)
-        # Validation step: checks that there are no nested bindings.
-        path_wildcard = False
-        for segment in segments:
-            if segment.kind == _TERMINAL and segment.literal == '**':
-                if path_wildcard:
-                    raise ValidationException(
-                        'validation error: path template cannot contain more '
-                        'than one path wildcard')
-                path_wildcard = True
+        _check_path_wildcards(segments)
         return segments
 
     def p_template(self, p):
@@ -280,3 +569,171 @@ class _Parser(object):
         """Raises a lexer error."""
         raise ValidationException(
             'lexer error: illegal character \'%s\'' % t.value[0])
+
+
+# Parser states of _LinearParser.
+_START = 0
+_AFTER_LEADING_SLASH = 1
+_AFTER_SEPARATOR = 2
+_AFTER_SEGMENT = 3
+_AFTER_LEFT_BRACE = 4
+_AFTER_VARIABLE_NAME = 5
+_IN_BINDING = 6
+_AFTER_BINDING_TERMINAL = 7
+
+_LITERAL_RE = re.compile(_LITERAL)
+_SIMPLE_VALUE_RE = re.compile(r'{0}(/{0})*\Z'.format(_LITERAL))
+_WILDCARD_TOKENS = ('WILDCARD', 'PATH_WILDCARD')
+_TERMINAL_TOKENS = ('WILDCARD', 'PATH_WILDCARD', 'LITERAL')
+_PUNCTUATION_TOKENS = {
+    '/': 'FORWARD_SLASH',
+    '~': 'NON_SLASH_SEPARATOR',
+    '_': 'NON_SLASH_SEPARATOR',
+    '-': 'NON_SLASH_SEPARATOR',
+    '.': 'NON_SLASH_SEPARATOR',
+    '{': 'LEFT_BRACE',
+    '}': 'RIGHT_BRACE',
+    '=': 'EQUALS',
+}
+
+
+def _tokenize(data):
+    """Yields (type, value) tokens the way the _Parser lexer does."""
+    pos = 0
+    end = len(data)
+    while pos < end:
+        char = data[pos]
+        if char in ' \t':
+            pos += 1
+            continue
+        match = _LITERAL_RE.match(data, pos)
+        if match:
+            pos = match.end()
+            yield 'LITERAL', match.group()
+        elif char == '*':
+            if data.startswith('**', pos):
+                pos += 2
+                yield 'PATH_WILDCARD', '**'
+            else:
+                pos += 1
+                yield 'WILDCARD', '*'
+        elif char in _PUNCTUATION_TOKENS:
+            pos += 1
+            yield _PUNCTUATION_TOKENS[char], char
+        else:
+            raise ValidationException(
+                'lexer error: illegal character \'%s\'' % char)
+
+
+class _LinearParser(object):
+    """A single-pass parser for the path template grammar of _Parser.
+
+    The grammar is regular, so a small state machine over the token stream
+    accepts exactly the templates that the LALR parser accepts. Tokens are
+    consumed as they are scanned, which keeps lexer and parser errors in
+    the same order as ply reports them.
+    """
+
+    segment_count = 0
+
+    def parse(self, data):
+        """Returns a list of path template segments parsed from data.
+
+        Args:
+            data: A path template string.
+        Returns:
+            A list of _Segment.
+        """
+        self.segment_count = 0
+        self._segments = []
+        self._binding_var_count = 0
+        self._variable = None
+        state = _START
+        for token, value in _tokenize(data):
+            state = self._handlers[state](self, state, token, value)
+        if state != _AFTER_SEGMENT:
+            raise ValidationException('parser error: unexpected EOF')
+        segments = self._segments
+        _check_path_wildcards(segments)
+        return segments
+
+    def _bound_segment(self, state, token, value):
+        if token == 'LEFT_BRACE':
+            return _AFTER_LEFT_BRACE
+        if token == 'FORWARD_SLASH' and state == _START:
+            return _AFTER_LEADING_SLASH
+        if token == 'LITERAL':
+            self._segments.append(_Segment(_TERMINAL, value))
+        elif token in _WILDCARD_TOKENS:
+            self._segments.extend([
+                _Segment(_BINDING, '$%d' % self._binding_var_count),
+                _Segment(_TERMINAL, value),
+                _Segment(_END_BINDING, '')])
+            self._binding_var_count += 1
+        else:
+            _unexpected_token(token)
+        self.segment_count += 1
+        return _AFTER_SEGMENT
+
+    def _separator(self, state, token, value):
+        if token not in ('FORWARD_SLASH', 'NON_SLASH_SEPARATOR'):
+            _unexpected_token(token)
+        return _AFTER_SEPARATOR
+
+    def _variable_name(self, state, token, value):
+        if token != 'LITERAL':
+            _unexpected_token(token)
+        self._variable = value
+        return _AFTER_VARIABLE_NAME
+
+    def _variable_start(self, state, token, value):
+        if token == 'EQUALS':
+            self._segments.append(_Segment(_BINDING, self._variable))
+            return _IN_BINDING
+        if token != 'RIGHT_BRACE':
+            _unexpected_token(token)
+        self._segments.extend([
+            _Segment(_BINDING, self._variable),
+            _Segment(_TERMINAL, '*'),
+            _Segment(_END_BINDING, '')])
+        self.segment_count += 1
+        return _AFTER_SEGMENT
+
+    def _binding_terminal(self, state, token, value):
+        if token not in _TERMINAL_TOKENS:
+            _unexpected_token(token)
+        self._segments.append(_Segment(_TERMINAL, value))
+        self.segment_count += 1
+        return _AFTER_BINDING_TERMINAL
+
+    def _binding_separator(self, state, token, value):
+        if token == 'FORWARD_SLASH':
+            return _IN_BINDING
+        if token != 'RIGHT_BRACE':
+            _unexpected_token(token)
+        self._segments.append(_Segment(_END_BINDING, ''))
+        return _AFTER_SEGMENT
+
+    _handlers = {
+        _START: _bound_segment,
+        _AFTER_LEADING_SLASH: _bound_segment,
+        _AFTER_SEPARATOR: _bound_segment,
+        _AFTER_SEGMENT: _separator,
+        _AFTER_LEFT_BRACE: _variable_name,
+        _AFTER_VARIABLE_NAME: _variable_start,
+        _IN_BINDING: _binding_terminal,
+        _AFTER_BINDING_TERMINAL: _binding_separator,
+    }
+
+
+def _unexpected_token(token):
+    raise ValidationException(
+        'parser error: unexpected token \'%s\'' % token)
+
+
+_PARSER_BACKENDS = {
+    'linear': _LinearParser,
+    'ply': _Parser,
+}
+
+_template_cache = _TemplateCache(_TEMPLATE_CACHE_SIZE, _DEFAULT_PARSER_BACKEND)
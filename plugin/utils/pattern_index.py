@@ -0,0 +1,336 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+A segment trie over resource name patterns, used to find patterns that can
+match the same resource name.
+
+Patterns are split into '/'-separated segments. A segment is a literal, a
+single wildcard ('*' or a variable such as '{book}'), or a path wildcard
+('**' or '{book=**}'), which matches one or more segments. Segments that mix
+variables with other text, such as '{book}~{edition}', are treated as single
+wildcards, so the index may report overlaps for them that a stricter matcher
+would rule out.
+"""
+
+from collections import namedtuple
+
+PatternEntry = namedtuple('PatternEntry', ['pattern', 'owner', 'position'])
+
+_LITERAL = 0
+_WILDCARD = 1
+_PATH_WILDCARD = 2
+
+
+class _Node(object):
+
+    __slots__ = ('id', 'literals', 'wildcard', 'path_wildcard', 'loop',
+                 'entries')
+
+    def __init__(self, node_id, loop=False):
+        self.id = node_id
+        self.literals = {}
+        self.wildcard = None
+        self.path_wildcard = None
+        # A node reached through a path wildcard can absorb more segments.
+        self.loop = loop
+        self.entries = []
+
+    def wildcard_children(self):
+        """Yields the nodes reached by consuming any single segment."""
+        if self.wildcard is not None:
+            yield self.wildcard
+        if self.path_wildcard is not None:
+            yield self.path_wildcard
+        if self.loop:
+            yield self
+
+    def literal_children(self, literal):
+        """Yields the nodes reached by consuming the given literal."""
+        child = self.literals.get(literal)
+        if child is not None:
+            yield child
+        for child in self.wildcard_children():
+            yield child
+
+
+class PatternIndex(object):
+    """Indexes patterns to find overlapping and shadowed ones.
+
+    Both queries walk the trie rather than comparing every pair of
+    patterns, so their cost grows with the number of trie nodes that can
+    match the same segments, which is close to linear for real APIs.
+    """
+
+    def __init__(self):
+        self._nodes = [_Node(0)]
+        self._entries = []
+
+    def add(self, pattern, owner=None, position=0):
+        """Adds a pattern to the index.
+
+        Args:
+            pattern (str): A resource name pattern.
+            owner (str): The resource type the pattern belongs to.
+            position (int): The position of the pattern in its resource.
+
+        Returns:
+            PatternEntry: The entry that reports refer to.
+
+        Raises:
+            ValueError: If the pattern has unbalanced braces.
+        """
+        entry = PatternEntry(pattern, owner, position)
+        node = self._nodes[0]
+        for kind, literal in get_pattern_segments(pattern):
+            node = self._child(node, kind, literal)
+        node.entries.append(entry)
+        self._entries.append(entry)
+        return entry
+
+    def add_resource(self, resource):
+        """Adds every pattern of a google.api.ResourceDescriptor."""
+        for position, pattern in enumerate(resource.pattern):
+            self.add(pattern, resource.type, position)
+
+    def find_overlaps(self):
+        """Returns the pairs of patterns that can match the same name.
+
+        Returns:
+            list: (PatternEntry, PatternEntry) tuples, each ordered and
+                sorted by the order in which the patterns were added.
+        """
+        order = dict((id(e), i) for i, e in enumerate(self._entries))
+        overlaps = set()
+        for first, second in self._walk_overlapping_nodes():
+            if first is second:
+                entries = first.entries
+                pairs = [(a, b) for i, a in enumerate(entries)
+                         for b in entries[i + 1:]]
+            else:
+                pairs = [(a, b) for a in first.entries
+                         for b in second.entries]
+            for a, b in pairs:
+                a_index, b_index = order[id(a)], order[id(b)]
+                overlaps.add((min(a_index, b_index), max(a_index, b_index)))
+        return [(self._entries[a], self._entries[b])
+                for a, b in sorted(overlaps)]
+
+    def find_shadowed(self):
+        """Returns the patterns that can never be reached.
+
+        A pattern is shadowed when an earlier pattern of the same resource
+        matches every name that it matches, since generated classes try
+        patterns in declaration order.
+
+        Returns:
+            list: (shadowed, shadowing) PatternEntry tuples, where shadowing
+                is the first pattern of the resource that covers shadowed.
+        """
+        shadowed = []
+        for entry in self._entries:
+            covering = [other for other in self._find_covering(entry)
+                        if other.owner == entry.owner
+                        and other.position < entry.position]
+            if covering:
+                shadowed.append(
+                    (entry, min(covering, key=lambda e: e.position)))
+        return shadowed
+
+    def _child(self, node, kind, literal):
+        if kind == _LITERAL:
+            child = node.literals.get(literal)
+            if child is None:
+                child = node.literals[literal] = self._new_node()
+        elif kind == _WILDCARD:
+            child = node.wildcard
+            if child is None:
+                child = node.wildcard = self._new_node()
+        else:
+            child = node.path_wildcard
+            if child is None:
+                child = node.path_wildcard = self._new_node(loop=True)
+        return child
+
+    def _new_node(self, loop=False):
+        node = _Node(len(self._nodes), loop)
+        self._nodes.append(node)
+        return node
+
+    def _walk_overlapping_nodes(self):
+        """Yields each pair of nodes that the same segments can reach.
+
+        This walks the product of the trie with itself, visiting each
+        unordered pair of nodes at most once.
+        """
+        root = self._nodes[0]
+        seen = set([(0, 0)])
+        stack = [(root, root)]
+        while stack:
+            first, second = stack.pop()
+            if first.entries and second.entries:
+                yield first, second
+            for a, b in _common_moves(first, second):
+                key = (a.id, b.id) if a.id <= b.id else (b.id, a.id)
+                if key not in seen:
+                    seen.add(key)
+                    stack.append((a, b))
+
+    def _find_covering(self, entry):
+        """Returns the entries that match every name the entry matches.
+
+        This tracks the set of nodes that each name matched by the entry
+        can reach. A wildcard segment stands for a segment that no literal
+        edge accepts, which reaches the fewest nodes, and a path wildcard
+        branches into one set per number of segments that it absorbs.
+        """
+        branches = set([frozenset([0])])
+        for kind, literal in get_pattern_segments(entry.pattern):
+            next_branches = set()
+            for states in branches:
+                if kind == _LITERAL:
+                    next_branches.add(self._step(states, literal))
+                    continue
+                states = self._step(states)
+                while kind == _PATH_WILDCARD and states not in next_branches:
+                    next_branches.add(states)
+                    states = self._step(states)
+                next_branches.add(states)
+            branches = next_branches
+        covering = None
+        for states in branches:
+            entries = dict((id(other), other) for node_id in states
+                           for other in self._nodes[node_id].entries)
+            if covering is not None:
+                entries = dict((key, other) for key, other in entries.items()
+                               if key in covering)
+            covering = entries
+        return [other for other in covering.values() if other is not entry]
+
+    def _step(self, states, literal=None):
+        """Returns the nodes reached from states by consuming a segment."""
+        next_states = set()
+        for node_id in states:
+            node = self._nodes[node_id]
+            if literal is None:
+                children = node.wildcard_children()
+            else:
+                children = node.literal_children(literal)
+            next_states.update(child.id for child in children)
+        return frozenset(next_states)
+
+
+def _common_moves(first, second):
+    """Yields the pairs of children that consume the same segment."""
+    for literal, child in first.literals.items():
+        for other in second.literal_children(literal):
+            yield child, other
+    for child in first.wildcard_children():
+        for other in second.literals.values():
+            yield child, other
+        for other in second.wildcard_children():
+            yield child, other
+
+
+def get_pattern_segments(pattern):
+    """Returns the (kind, literal) segments of a resource name pattern.
+
+    Raises:
+        ValueError: If the pattern has unbalanced braces.
+    """
+    segments = []
+    for segment in _split_segments(pattern):
+        if segment.startswith('{') and segment.endswith('}') and \
+                segment.count('{') == 1:
+            name, _, value = segment[1:-1].partition('=')
+            if value:
+                segments.extend(get_pattern_segments(value))
+            else:
+                segments.append((_WILDCARD, None))
+        elif segment == '**':
+            segments.append((_PATH_WILDCARD, None))
+        elif segment == '*' or '{' in segment:
+            segments.append((_WILDCARD, None))
+        else:
+            segments.append((_LITERAL, segment))
+    return segments
+
+
+def _split_segments(pattern):
+    # Splits on the slashes that are not inside a variable.
+    segments = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(pattern):
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth < 0:
+                break
+        elif char == '/' and depth == 0:
+            segments.append(pattern[start:i])
+            start = i + 1
+    if depth != 0:
+        raise ValueError('unbalanced braces in pattern: {}'.format(pattern))
+    segments.append(pattern[start:])
+    return segments
+
+
+def find_conflicts(index):
+    """Returns the shadowed patterns of an index, and the patterns of
+    different resources that can match the same name.
+
+    Returns:
+        list: (kind, entry, other) tuples, where kind is 'shadowed' or
+            'overlap', and other is the PatternEntry that entry conflicts
+            with.
+    """
+    conflicts = [('shadowed', entry, other)
+                 for entry, other in index.find_shadowed()]
+    conflicts.extend(('overlap', entry, other)
+                     for entry, other in index.find_overlaps()
+                     if entry.owner != other.owner)
+    return conflicts
+
+
+def describe_conflict(kind, other):
+    """Returns the message of a conflict returned by find_conflicts."""
+    if kind == 'shadowed':
+        return 'never matched, {} of the same resource matches first'.format(
+            other.pattern)
+    return 'can match the same names as {} of {}'.format(other.pattern,
+                                                         other.owner)
+
+
+def index_resources(resources):
+    """Returns a PatternIndex of all patterns of the given resources."""
+    index = PatternIndex()
+    for resource in resources:
+        index.add_resource(resource)
+    return index
@@ -0,0 +1,172 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Parses the parameter that protoc passes to the plugin.
+
+The parameter is a comma-separated list. Items of the form ``name=value``
+with a known name are options, and the rest is the path of the GAPIC YAML
+file, so a parameter that is only a path keeps its meaning:
+
+    --java_resource_names_opt=library_gapic.yaml,render_workers=4
+"""
+
+import os
+
+from plugin.utils import profiling
+
+
+class PluginOptions(object):
+    """The options of one plugin invocation.
+
+    Attributes:
+        gapic_yaml (str): The path of the GAPIC YAML file, or None.
+        render_workers (int): The number of processes that render the
+            generated classes. 0 and 1 render them in the plugin process.
+        render_cache_dir (str): A directory in which rendered classes are
+            kept across invocations, or None.
+        render_cache_max_mb (int): The size that the render cache is
+            trimmed to, in megabytes.
+        yaml_cache_dir (str): A directory in which parsed GAPIC YAML files
+            are kept across invocations, or None.
+        response_cache_dir (str): A directory in which whole responses are
+            kept across invocations, or None.
+        response_cache_max_mb (int): The size that the response cache is
+            trimmed to, in megabytes.
+        pattern_conflicts (str): ``warn`` to report resource name patterns
+            that are shadowed or overlap with those of other resources on
+            stderr, ``error`` to fail on them, or None to not check.
+        profile (str): Where to write a report of the time taken by each
+            phase of the run, ``stderr`` or a file, or None.
+        profile_detail (str): What else to report for each phase, as
+            ``cprofile``, ``tracemalloc`` or ``cprofile+tracemalloc``.
+    """
+
+    def __init__(self, gapic_yaml=None, render_workers=0,
+                 render_cache_dir=None, render_cache_max_mb=512,
+                 yaml_cache_dir=None, response_cache_dir=None,
+                 response_cache_max_mb=512, pattern_conflicts=None,
+                 profile=None, profile_detail=None):
+        self.gapic_yaml = gapic_yaml
+        self.render_workers = render_workers
+        self.render_cache_dir = render_cache_dir
+        self.render_cache_max_mb = render_cache_max_mb
+        self.yaml_cache_dir = yaml_cache_dir
+        self.response_cache_dir = response_cache_dir
+        self.response_cache_max_mb = response_cache_max_mb
+        self.pattern_conflicts = pattern_conflicts
+        self.profile = profile
+        self.profile_detail = profile_detail
+
+    def resolve_paths(self, directory):
+        """Makes the relative paths of the options relative to directory."""
+        if self.gapic_yaml:
+            self.gapic_yaml = os.path.join(directory, self.gapic_yaml)
+        if self.render_cache_dir:
+            self.render_cache_dir = os.path.join(directory,
+                                                 self.render_cache_dir)
+        if self.yaml_cache_dir:
+            self.yaml_cache_dir = os.path.join(directory, self.yaml_cache_dir)
+        if self.response_cache_dir:
+            self.response_cache_dir = os.path.join(directory,
+                                                   self.response_cache_dir)
+        if self.profile and self.profile != 'stderr':
+            self.profile = os.path.join(directory, self.profile)
+
+    def to_parameter(self):
+        """Returns the plugin parameter that parses to these options."""
+        items = [self.gapic_yaml] if self.gapic_yaml else []
+        defaults = PluginOptions()
+        for name in sorted(_OPTION_PARSERS):
+            value = getattr(self, name)
+            if value != getattr(defaults, name):
+                items.append('{}={}'.format(name, value))
+        return ','.join(items)
+
+
+def _parse_count(name, value):
+    try:
+        count = int(value)
+    except ValueError:
+        count = -1
+    if count < 0:
+        raise ValueError(
+            '{} must be a non-negative integer, got {!r}'.format(name, value))
+    return count
+
+
+def _parse_path(name, value):
+    if not value:
+        raise ValueError('{} must not be empty'.format(name))
+    return value
+
+
+def _parse_pattern_conflicts(name, value):
+    if value not in ('warn', 'error'):
+        raise ValueError(
+            '{} must be warn or error, got {!r}'.format(name, value))
+    return value
+
+
+def _parse_profile_detail(name, value):
+    profiling.parse_details(value)
+    return value
+
+
+_OPTION_PARSERS = {
+    'render_workers': _parse_count,
+    'render_cache_dir': _parse_path,
+    'render_cache_max_mb': _parse_count,
+    'yaml_cache_dir': _parse_path,
+    'response_cache_dir': _parse_path,
+    'response_cache_max_mb': _parse_count,
+    'pattern_conflicts': _parse_pattern_conflicts,
+    'profile': _parse_path,
+    'profile_detail': _parse_profile_detail,
+}
+
+
+def parse_parameter(parameter):
+    """Returns the PluginOptions of a plugin parameter.
+
+    Args:
+        parameter (str): ``CodeGeneratorRequest.parameter``.
+
+    Raises:
+        ValueError: If an option has an invalid value.
+    """
+    options = {}
+    path_items = []
+    for item in parameter.split(',') if parameter else []:
+        name, sep, value = item.partition('=')
+        name = name.strip()
+        if sep and name in _OPTION_PARSERS:
+            options[name] = _OPTION_PARSERS[name](name, value.strip())
+        else:
+            path_items.append(item)
+    return PluginOptions(gapic_yaml=','.join(path_items) or None, **options)
@@ -0,0 +1,292 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Times the phases of a plugin run, for finding out why a run is slow.
+
+A Profiler is enabled by the ``profile`` plugin option, or by the
+JAVA_RESOURCE_NAMES_PROFILE environment variable, which also covers the
+parsing of the request. Its value is ``stderr`` or the path of a file that
+reports are appended to. The ``profile_detail`` option, or
+JAVA_RESOURCE_NAMES_PROFILE_DETAIL, adds ``cprofile`` statistics and
+``tracemalloc`` allocation statistics to each phase, joined with ``+``.
+
+Code marks its phases with ``with profiling.phase(name):``, which does
+nothing unless a Profiler is active in the thread. Phases may nest, and
+are reported with their time including and excluding nested phases.
+Reports are single lines of JSON, so that stdout stays the plugin response.
+"""
+
+import os
+import sys
+import threading
+import time
+
+PROFILE_ENV = 'JAVA_RESOURCE_NAMES_PROFILE'
+PROFILE_DETAIL_ENV = 'JAVA_RESOURCE_NAMES_PROFILE_DETAIL'
+DETAILS = ('cprofile', 'tracemalloc')
+
+# The functions and allocation sites reported for each phase.
+TOP_ENTRIES = 15
+
+_local = threading.local()
+
+
+class _NullPhase(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def parse_details(value):
+    """Returns the details named in a ``+``-separated string.
+
+    Raises:
+        ValueError: If a detail is unknown.
+    """
+    details = [d for d in value.split('+') if d] if value else []
+    for detail in details:
+        if detail not in DETAILS:
+            raise ValueError('unknown profile detail {!r}, expected one '
+                             'of {}'.format(detail, ', '.join(DETAILS)))
+    return details
+
+
+class _PhaseStats(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.seconds = 0.0
+        self.nested_seconds = 0.0
+        self.profile = None
+        self.allocated_bytes = 0
+        self.peak_bytes = 0
+        self.allocations = {}
+
+    def to_dict(self):
+        report = {'name': self.name,
+                  'count': self.count,
+                  'seconds': round(self.seconds, 6),
+                  'self_seconds': round(self.seconds - self.nested_seconds,
+                                        6)}
+        if self.profile is not None:
+            report['cprofile'] = _profile_entries(self.profile)
+        if self.allocations or self.allocated_bytes or self.peak_bytes:
+            top = sorted(self.allocations.items(),
+                         key=lambda item: -abs(item[1][0]))[:TOP_ENTRIES]
+            report['memory'] = {
+                'allocated_bytes': self.allocated_bytes,
+                'peak_bytes': self.peak_bytes,
+                'top': [{'location': location, 'size_diff': size,
+                         'count_diff': count}
+                        for location, (size, count) in top],
+            }
+        return report
+
+
+def _profile_entries(profile):
+    import pstats
+    stats = pstats.Stats(profile).stats
+    entries = sorted(stats.items(), key=lambda item: -item[1][3])
+    return [{'function': '{}:{}({})'.format(*function),
+             'calls': calls,
+             'seconds': round(total, 6),
+             'cumulative_seconds': round(cumulative, 6)}
+            for function, (_, calls, total, cumulative, _)
+            in entries[:TOP_ENTRIES]]
+
+
+class _Phase(object):
+    # Times one run of a phase, and pauses the profiler of the enclosing
+    # phase while it runs.
+
+    def __init__(self, profiler, stats):
+        self.profiler = profiler
+        self.stats = stats
+
+    def __enter__(self):
+        profiler = self.profiler
+        self.parent = profiler.stack[-1] if profiler.stack else None
+        if self.parent is not None and self.parent.stats.profile is not None:
+            self.parent.stats.profile.disable()
+        profiler.stack.append(self)
+        if profiler.tracemalloc:
+            self.snapshot = profiler.tracemalloc.take_snapshot()
+            self.memory = profiler.tracemalloc.get_traced_memory()[0]
+            if hasattr(profiler.tracemalloc, 'reset_peak'):
+                profiler.tracemalloc.reset_peak()
+        if 'cprofile' in profiler.details:
+            if self.stats.profile is None:
+                import cProfile
+                self.stats.profile = cProfile.Profile()
+            self.stats.profile.enable()
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.time() - self.start
+        profiler = self.profiler
+        stats = self.stats
+        if stats.profile is not None:
+            stats.profile.disable()
+        if profiler.tracemalloc:
+            self._record_memory(profiler.tracemalloc)
+        stats.count += 1
+        stats.seconds += seconds
+        profiler.stack.pop()
+        if self.parent is not None:
+            self.parent.stats.nested_seconds += seconds
+            if self.parent.stats.profile is not None:
+                self.parent.stats.profile.enable()
+        return False
+
+    def _record_memory(self, tracemalloc):
+        current, peak = tracemalloc.get_traced_memory()
+        self.stats.allocated_bytes += current - self.memory
+        self.stats.peak_bytes = max(self.stats.peak_bytes, peak - self.memory)
+        snapshot = tracemalloc.take_snapshot()
+        for diff in snapshot.compare_to(self.snapshot, 'lineno'):
+            if not diff.size_diff:
+                continue
+            frame = diff.traceback[0]
+            location = '{}:{}'.format(frame.filename, frame.lineno)
+            size, count = self.stats.allocations.get(location, (0, 0))
+            self.stats.allocations[location] = (size + diff.size_diff,
+                                                count + diff.count_diff)
+
+
+class Profiler(object):
+    """Collects the time, and optionally more, of the phases of a run.
+
+    Args:
+        destination (str): ``stderr``, or the file that write_report()
+            appends the report to.
+        details (list): The details to collect: ``cprofile`` and
+            ``tracemalloc``.
+    """
+
+    def __init__(self, destination, details=()):
+        self.destination = destination
+        self.details = list(details)
+        self.phases = []
+        self.stack = []
+        self._stats = {}
+        self.start = time.time()
+        self.tracemalloc = None
+        self._started_tracemalloc = False
+        if 'tracemalloc' in self.details:
+            import tracemalloc
+            self.tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+
+    def _get_stats(self, name):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = _PhaseStats(name)
+            self.phases.append(stats)
+        return stats
+
+    def phase(self, name):
+        """Returns a context manager that times a phase named name."""
+        return _Phase(self, self._get_stats(name))
+
+    def record(self, name, seconds):
+        """Records a phase that ran before the profiler was created."""
+        stats = self._get_stats(name)
+        stats.count += 1
+        stats.seconds += seconds
+
+    def report(self):
+        """Returns the report of the phases so far, as a dict."""
+        return {'pid': os.getpid(),
+                'seconds': round(time.time() - self.start, 6),
+                'details': self.details,
+                'phases': [stats.to_dict() for stats in self.phases]}
+
+    def write_report(self):
+        """Writes the report as a line of JSON to the destination."""
+        import json
+        if self._started_tracemalloc:
+            self.tracemalloc.stop()
+            self._started_tracemalloc = False
+        line = json.dumps(self.report(), sort_keys=True) + '\n'
+        if self.destination == 'stderr':
+            sys.stderr.write(line)
+            sys.stderr.flush()
+        else:
+            with open(self.destination, 'a') as f:
+                f.write(line)
+
+
+def from_environment(environ=None):
+    """Returns a Profiler if the environment enables one, or None."""
+    environ = os.environ if environ is None else environ
+    destination = environ.get(PROFILE_ENV)
+    if not destination:
+        return None
+    return Profiler(destination,
+                    parse_details(environ.get(PROFILE_DETAIL_ENV)))
+
+
+class _Activation(object):
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def __enter__(self):
+        self.previous = getattr(_local, 'profiler', None)
+        _local.profiler = self.profiler
+        return self.profiler
+
+    def __exit__(self, *exc_info):
+        _local.profiler = self.previous
+        return False
+
+
+def activate(profiler):
+    """Returns a context manager that makes profiler, which may be None,
+    the one that phase() reports to in this thread."""
+    return _Activation(profiler)
+
+
+def phase(name):
+    """Returns a context manager that times a phase of the active
+    profiler, or does nothing if no profiler is active."""
+    profiler = getattr(_local, 'profiler', None)
+    if profiler is None:
+        return _NULL_PHASE
+    return profiler.phase(name)
@@ -0,0 +1,111 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Caches whole plugin responses under a fingerprint of their request.
+
+The fingerprint covers only what the output depends on: the resource
+annotations and java_package options of the files to generate, the
+contents of the GAPIC YAML file, the plugin version and the templates.
+Requests that differ in anything else, such as source info or unrelated
+options, share a cache entry.
+
+Caches are kept per directory for the life of the process, so that the
+plugin server and the Bazel worker count hits and misses across requests.
+"""
+
+import hashlib
+import struct
+import threading
+
+from plugin import __version__
+from plugin.templates import registry
+from plugin.utils.disk_cache import DiskCache
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(directory, max_bytes):
+    """Returns the response cache of a directory, created once per
+    process."""
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = DiskCache(directory, max_bytes)
+        cache.max_bytes = max_bytes
+        return cache
+
+
+def stats():
+    """Returns the statistics of the response caches used by this process,
+    by directory."""
+    with _caches_lock:
+        caches = list(_caches.items())
+    return dict((directory, cache.stats()) for directory, cache in caches)
+
+
+def fingerprint(index, gapic_yaml_data=None):
+    """Returns the cache key of a request.
+
+    Args:
+        index (~.DescriptorIndex): The index of the request.
+        gapic_yaml_data (bytes): The contents of the GAPIC YAML file, or
+            None if the request has none.
+    """
+    digest = hashlib.sha256()
+
+    def update(part):
+        # Parts are prefixed with their length, so that moving bytes from
+        # one part to the next changes the fingerprint.
+        digest.update(struct.pack('>Q', len(part)))
+        digest.update(part)
+
+    update(__version__.encode('utf-8'))
+    update(registry.templates_hash().encode('utf-8'))
+    update(b'-' if gapic_yaml_data is None else b'+' + gapic_yaml_data)
+    for part in index.fingerprint_parts():
+        update(part)
+    return digest.hexdigest()
+
+
+class TeeWriter(object):
+    """Writes to a stream and to a pending cache entry.
+
+    Args:
+        dest: A binary file-like object.
+        entry (~.PendingEntry): The entry to store a copy in.
+    """
+
+    def __init__(self, dest, entry):
+        self.dest = dest
+        self.entry = entry
+
+    def write(self, data):
+        self.entry.write(data)
+        return self.dest.write(data)
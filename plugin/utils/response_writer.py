@@ -0,0 +1,85 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Writes a CodeGeneratorResponse to a stream one file at a time.
+
+Protobuf parsers accept the fields of a message in any order and append
+repeated fields in the order they appear, so each file can be encoded and
+written as soon as it is rendered, and the other fields written last. The
+bytes differ from CodeGeneratorResponse.SerializeToString(), but parse to
+the same message.
+"""
+
+# Tags of CodeGeneratorResponse and CodeGeneratorResponse.File fields.
+_RESPONSE_SUPPORTED_FEATURES = b'\x10'    # 2, varint
+_RESPONSE_FILE = b'\x7a'                  # 15, length-delimited
+_FILE_NAME = b'\x0a'                      # 1, length-delimited
+_FILE_CONTENT = b'\x7a'                   # 15, length-delimited
+
+
+def encode_varint(value):
+    """Returns the protobuf varint encoding of a non-negative integer."""
+    data = bytearray()
+    while value > 0x7f:
+        data.append(value & 0x7f | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def _length_delimited(tag, data):
+    return tag + encode_varint(len(data)) + data
+
+
+class ResponseWriter(object):
+    """Encodes the fields of a CodeGeneratorResponse as they are added.
+
+    Args:
+        stream: A binary file-like object.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.file_count = 0
+
+    def add_file(self, name, content):
+        """Writes a CodeGeneratorResponse.File with a name and content."""
+        name = name.encode('utf-8')
+        content = content.encode('utf-8')
+        header = _length_delimited(_FILE_NAME, name) + _FILE_CONTENT + \
+            encode_varint(len(content))
+        self.stream.write(_RESPONSE_FILE +
+                          encode_varint(len(header) + len(content)) + header)
+        self.stream.write(content)
+        self.file_count += 1
+
+    def set_supported_features(self, features):
+        """Writes the supported_features field of the response."""
+        self.stream.write(_RESPONSE_SUPPORTED_FEATURES +
+                          encode_varint(features))
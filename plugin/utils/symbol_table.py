@@ -30,8 +30,6 @@
 A utility class used to get and store unique symbols.
 """
 
-import copy
-
 
 class SymbolTable(object):
 
@@ -39,7 +37,7 @@ class SymbolTable(object):
     Initialize a case-sensitive SymbolTable with a set of symbols.
     """
     def __init__(self):
-        self.symbol_table = copy.deepcopy(java_reserved_symbols)
+        self.symbol_table = set(java_reserved_symbols)
 
     def getNewSymbol(self, desired_name):
 
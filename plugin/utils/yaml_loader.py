@@ -0,0 +1,100 @@
+# Copyright 2026 Google LLC
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met:
+#
+#         * Redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer.
+#         * Redistributions in binary form must reproduce the above
+# copyright notice, this list of conditions and the following disclaimer
+# in the documentation and/or other materials provided with the
+# distribution.
+#         * Neither the name of Google Inc. nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""
+Loads and dumps GAPIC YAML files, with libyaml when it is available.
+
+The parsed files can also be kept in a DiskCache, marshalled, under a key
+made of the hash of the file and the versions of PyYAML and of the marshal
+format, so that later invocations on an unchanged file skip parsing it.
+"""
+
+import hashlib
+import marshal
+import sys
+
+import yaml
+
+try:
+    SafeLoader = yaml.CSafeLoader
+    SafeDumper = yaml.CSafeDumper
+except AttributeError:  # PyYAML built without libyaml
+    SafeLoader = yaml.SafeLoader
+    SafeDumper = yaml.SafeDumper
+
+# Parsed GAPIC YAML files are small, so the cache is trimmed to a fixed size.
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def load(data):
+    """Parses YAML with the safe loader, using libyaml when available."""
+    return yaml.load(data, Loader=SafeLoader)
+
+
+def dump(data):
+    """Returns the YAML text of data, in block style."""
+    return yaml.dump(data, Dumper=SafeDumper, default_flow_style=False)
+
+
+def cache_key(data):
+    """Returns the cache key of the contents of a YAML file."""
+    digest = hashlib.sha256()
+    digest.update('{} {} {} {}.{}\0'.format(
+        yaml.__version__, SafeLoader.__name__, marshal.version,
+        *sys.version_info[:2]).encode('utf-8'))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def load_file(path, cache=None):
+    """Returns the parsed contents of a YAML file.
+
+    Args:
+        path (str): The path of the file.
+        cache (~.DiskCache): A cache of parsed files, or None.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if cache is None:
+        return load(data)
+    key = cache_key(data)
+    cached = cache.get_bytes(key)
+    if cached is not None:
+        try:
+            return marshal.loads(cached)
+        except (EOFError, ValueError, TypeError):
+            # A corrupt entry is parsed again and replaced.
+            pass
+    parsed = load(data)
+    try:
+        cache.put_bytes(key, marshal.dumps(parsed))
+    except ValueError:
+        # Values such as timestamps cannot be marshalled, and are not
+        # used by GAPIC YAML files.
+        pass
+    return parsed
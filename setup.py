@@ -30,6 +30,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import os
+import re
 import sys
 from setuptools import setup, find_packages
 
@@ -37,7 +38,8 @@ if sys.argv[-1] == 'publish':
     os.system('python setup.py sdist upload')
     sys.exit()
 
-version = '0.0.25'
+with open(os.path.join('plugin', '__init__.py')) as f:
+    version = re.search(r"__version__ = '(.*)'", f.read()).group(1)
 
 install_requires = [
     'chevron >= 0.13.1',
@@ -58,6 +60,11 @@ setup(
     entry_points="""[console_scripts]
         protoc-gen-java_resource_names=plugin.cli.gapic_plugin:entrypoint
         protoc-gen-gapic_v1=plugin.cli.dump_gapic_v1:entrypoint
+        java-resource-names-validate=plugin.cli.validate_patterns:entrypoint
+        java-resource-names-batch=plugin.cli.batch:entrypoint
+        java-resource-names-cache-stats=plugin.cli.cache_stats:entrypoint
+        java-resource-names-server=plugin.cli.plugin_server:entrypoint
+        protoc-gen-java_resource_names_client=plugin.cli.plugin_client:entrypoint
     """,
     package_data={'plugin.templates': ['*.mustache']},
     license='BSD-3-Clause',
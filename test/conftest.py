@@ -0,0 +1,71 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+
+import pytest
+import yaml
+from google.protobuf import descriptor_pb2
+from google.protobuf.compiler import plugin_pb2 as plugin
+
+from plugin.utils import gapic_utils
+
+PROTO_FILES = ('library_simple.proto', 'archive.proto')
+
+
+def _compile_descriptor_set(path, proto_files):
+    subprocess.check_call(
+        ['protoc', '-o', path, '--include_imports',
+         '--proto_path=test/testdata', '--proto_path=.',
+         '--proto_path=./googleapis'] + list(proto_files))
+    with open(path, 'rb') as f:
+        return descriptor_pb2.FileDescriptorSet.FromString(f.read())
+
+
+@pytest.fixture(scope='session')
+def build_request(tmpdir_factory):
+    """Returns a function that builds requests for the library test protos.
+
+    The function takes the plugin parameter and, optionally, the proto
+    files in test/testdata to generate, and returns a CodeGeneratorRequest.
+    Each list of proto files is compiled with protoc once per session.
+    """
+    descriptor_sets = {}
+
+    def build(parameter, proto_files=PROTO_FILES):
+        proto_files = tuple(proto_files)
+        if proto_files not in descriptor_sets:
+            path = tmpdir_factory.mktemp('desc').join('library.desc')
+            descriptor_sets[proto_files] = _compile_descriptor_set(
+                str(path), proto_files)
+        return plugin.CodeGeneratorRequest(
+            file_to_generate=proto_files, parameter=parameter,
+            proto_file=descriptor_sets[proto_files].file)
+    return build
+
+
+@pytest.fixture
+def load_template_resources():
+    """Returns a function that builds the models of library_gapic_v1.yaml.
+
+    Each call builds new resource name models, which the template tests
+    render.
+    """
+    def load():
+        with open('test/testdata/library_gapic_v1.yaml') as f:
+            gapic_yaml = yaml.load(f, Loader=yaml.SafeLoader)
+        return gapic_utils.collect_resource_name_types(
+            gapic_utils.create_gapic_config(gapic_yaml),
+            'com.google.example.library.v1')
+    return load
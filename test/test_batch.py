@@ -0,0 +1,112 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import zipfile
+
+import pytest
+from google.protobuf.compiler import plugin_pb2 as plugin
+
+from plugin.cli import batch
+from plugin.cli import gapic_plugin
+
+GAPIC_YAML = os.path.abspath(
+    os.path.join('test', 'testdata', 'library_gapic.yaml'))
+
+
+@pytest.fixture
+def requests(tmpdir, build_request):
+    tmpdir.join('library.pb').write_binary(build_request(
+        GAPIC_YAML + ',render_workers=2').SerializeToString())
+    tmpdir.mkdir('other').join('library.pb').write_binary(
+        build_request('missing_gapic.yaml').SerializeToString())
+    return tmpdir
+
+
+def test_read_manifest(tmpdir):
+    manifest = tmpdir.join('manifest.txt')
+    manifest.write('# comment\n\n'
+                   'a/request.pb\n'
+                   'b/request.pb  b/gapic.yaml  b\n'
+                   'c.pb - c_out\n')
+    entries = batch.read_manifest(str(manifest))
+    assert [(e.name, e.request, e.gapic_yaml) for e in entries] == [
+        ('request', str(tmpdir.join('a', 'request.pb')), None),
+        ('b', str(tmpdir.join('b', 'request.pb')),
+         str(tmpdir.join('b', 'gapic.yaml'))),
+        ('c_out', str(tmpdir.join('c.pb')), None),
+    ]
+    manifest.write('a.pb b.yaml c d\n')
+    with pytest.raises(ValueError):
+        batch.read_manifest(str(manifest))
+
+
+def test_check_names():
+    with pytest.raises(ValueError):
+        batch.check_names([batch.BatchEntry('library', 'a/library.pb'),
+                           batch.BatchEntry('library', 'b/library.pb')])
+
+
+def test_prepare_request():
+    data = plugin.CodeGeneratorRequest(
+        parameter='a.yaml,render_workers=4').SerializeToString()
+    assert batch.prepare_request(data) is data
+    parameter = plugin.CodeGeneratorRequest.FromString(
+        batch.prepare_request(data, 'b.yaml', in_pool=True)).parameter
+    assert parameter == 'b.yaml'
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch(requests, jobs):
+    manifest = requests.join('manifest.txt')
+    manifest.write('library.pb\n'
+                   'other/library.pb {} fixed\n'
+                   'other/library.pb - broken\n'.format(GAPIC_YAML))
+    output_dir = requests.join('out')
+    report = requests.join('report.json')
+    assert batch.main(['--manifest', str(manifest), '--jobs', str(jobs),
+                       '--output-dir', str(output_dir),
+                       '--report', str(report)]) == 1
+
+    results = json.loads(report.read())['results']
+    assert [(r['name'], r['ok']) for r in results] == [
+        ('library', True), ('fixed', True), ('broken', False)]
+    assert 'missing_gapic.yaml' in results[2]['error']
+    assert all(r['seconds'] >= 0 for r in results)
+
+    expected = plugin.CodeGeneratorResponse.FromString(gapic_plugin.main(
+        requests.join('library.pb').read_binary()))
+    assert len(expected.file) == 11
+    for name in ('library', 'fixed'):
+        for generated in expected.file:
+            assert output_dir.join(name, generated.name).read() == \
+                generated.content
+
+
+def test_batch_srcjar(requests):
+    output_dir = requests.join('out')
+    assert batch.main([str(requests.join('library.pb')), '--jobs', '1',
+                       '--layout', 'srcjar',
+                       '--output-dir', str(output_dir)]) == 0
+    with zipfile.ZipFile(str(output_dir.join('library.srcjar'))) as archive:
+        assert len(archive.namelist()) == 11
+
+
+def test_write_tree_outside_directory(tmpdir):
+    response = plugin.CodeGeneratorResponse()
+    response.file.add(name='../escaped.java', content='')
+    with pytest.raises(ValueError):
+        batch.write_tree(str(tmpdir.join('out')),
+                         response.SerializeToString())
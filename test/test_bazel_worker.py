@@ -0,0 +1,173 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Drives the persistent worker loop with recorded WorkRequests."""
+
+import io
+import json
+import os
+import shutil
+import zipfile
+
+import pytest
+from google.protobuf import descriptor_pb2
+from google.protobuf.compiler import plugin_pb2 as plugin
+
+from plugin.cli import bazel_worker
+from plugin.cli import gapic_plugin
+from plugin.utils.response_writer import encode_varint
+
+RECORDED_REQUESTS = os.path.abspath(os.path.join(
+    'test', 'testdata', 'worker', 'work_requests.json'))
+
+
+@pytest.fixture
+def sandbox(tmpdir, build_request):
+    request = build_request('')
+    proto_files = list(request.file_to_generate)
+    tmpdir.join('library.desc').write_binary(descriptor_pb2.FileDescriptorSet(
+        file=request.proto_file).SerializeToString())
+    shutil.copy(os.path.join('test', 'testdata', 'library_gapic.yaml'),
+                str(tmpdir))
+    tmpdir.join('library.flags').write('\n'.join(
+        ['--descriptor_set_in=library.desc'] +
+        ['--file_to_generate=' + f for f in proto_files] +
+        ['--parameter=library_gapic.yaml', '--output=flags.srcjar']))
+    args = bazel_worker._action_parser().parse_args(
+        ['--descriptor_set_in=library.desc', '--output=unused',
+         '--parameter=library_gapic.yaml'] +
+        ['--file_to_generate=' + f for f in proto_files])
+    tmpdir.join('library.request').write_binary(
+        bazel_worker.build_request(args, str(tmpdir)))
+    return tmpdir
+
+
+def _recorded_requests():
+    with open(RECORDED_REQUESTS) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _encode_work_request(message):
+    data = b''
+    for argument in message['arguments']:
+        argument = argument.encode('utf-8')
+        data += b'\x0a' + encode_varint(len(argument)) + argument
+    if message.get('requestId'):
+        data += b'\x18' + encode_varint(message['requestId'])
+    if message.get('sandboxDir'):
+        sandbox_dir = message['sandboxDir'].encode('utf-8')
+        data += b'\x32' + encode_varint(len(sandbox_dir)) + sandbox_dir
+    return encode_varint(len(data)) + data
+
+
+def _decode_work_responses(data):
+    stream = io.BytesIO(data)
+    responses = []
+    while True:
+        size = bazel_worker._read_varint(stream)
+        if size is None:
+            return responses
+        fields = dict(bazel_worker._iter_fields(stream.read(size)))
+        responses.append({'exitCode': fields.get(1, 0),
+                          'output': fields.get(2, b'').decode('utf-8'),
+                          'requestId': fields.get(3, 0)})
+
+
+def _check_responses(sandbox, responses):
+    expected = plugin.CodeGeneratorResponse.FromString(gapic_plugin.main(
+        sandbox.join('library.request').read_binary(), cwd=str(sandbox)))
+    expected_files = dict((f.name, f.content) for f in expected.file)
+    assert len(expected_files) == 11
+
+    assert [r['exitCode'] for r in responses] == [0, 0, 0, 1, 1]
+    for name in ('library.srcjar', 'flags.srcjar'):
+        with zipfile.ZipFile(str(sandbox.join(name))) as archive:
+            assert dict((n, archive.read(n).decode('utf-8'))
+                        for n in archive.namelist()) == expected_files
+    assert plugin.CodeGeneratorResponse.FromString(
+        sandbox.join('library.response').read_binary()) == expected
+    assert 'one of --request or --descriptor_set_in' in \
+        responses[3]['output']
+    assert 'missing.yaml' in responses[4]['output']
+
+
+def test_json_worker(sandbox, monkeypatch):
+    monkeypatch.chdir(sandbox)
+    stdin = io.BytesIO(b''.join(
+        json.dumps(m, indent=2).encode('utf-8') + b'\n'
+        for m in _recorded_requests()))
+    stdout = io.BytesIO()
+    bazel_worker.run_worker(stdin, stdout, 'json')
+    responses = [json.loads(line)
+                 for line in stdout.getvalue().decode('utf-8').splitlines()]
+    assert all('requestId' not in r for r in responses)
+    _check_responses(sandbox, responses)
+
+
+def test_proto_worker_multiplexed(sandbox):
+    messages = _recorded_requests()
+    for i, message in enumerate(messages):
+        message['requestId'] = i + 1
+        message['sandboxDir'] = str(sandbox)
+    stdin = io.BytesIO(b''.join(_encode_work_request(m) for m in messages))
+    stdout = io.BytesIO()
+    bazel_worker.run_worker(stdin, stdout, 'proto', max_concurrent=3)
+    responses = sorted(_decode_work_responses(stdout.getvalue()),
+                       key=lambda r: r['requestId'])
+    assert [r['requestId'] for r in responses] == [1, 2, 3, 4, 5]
+    _check_responses(sandbox, responses)
+
+
+def test_single_action(sandbox, monkeypatch):
+    monkeypatch.chdir(sandbox)
+    assert bazel_worker.main(['@library.flags']) == 0
+    assert sandbox.join('flags.srcjar').check()
+    assert bazel_worker.main(['--output=x.srcjar']) == 1
+
+
+def test_encode_work_response():
+    stdout = io.BytesIO()
+    bazel_worker.write_proto_response(stdout, -1, u'é', 7)
+    responses = _decode_work_responses(stdout.getvalue())
+    assert responses == [{'exitCode': 2 ** 64 - 1, 'output': u'é',
+                          'requestId': 7}]
+
+
+def test_descriptor_set_list(sandbox, build_request):
+    # archive.proto and its imports, then the library, which repeats them.
+    request = build_request('', ['archive.proto'])
+    sandbox.join('archive.desc').write_binary(
+        descriptor_pb2.FileDescriptorSet(
+            file=request.proto_file).SerializeToString())
+    args = bazel_worker._action_parser().parse_args(
+        ['--descriptor_set_in=archive.desc' + os.pathsep + 'library.desc',
+         '--file_to_generate=archive.proto', '--output=unused'])
+    names = [f.name for f in plugin.CodeGeneratorRequest.FromString(
+        bazel_worker.build_request(args, str(sandbox))).proto_file]
+    assert len(names) == len(set(names))
+    assert set(names) == set(f.name for f in build_request('').proto_file)
+
+
+def test_worker_requests_do_not_start_render_workers(sandbox, monkeypatch):
+    render_workers = []
+    monkeypatch.setattr(
+        gapic_plugin, '_generate',
+        lambda request, options, dest: render_workers.append(
+            options.render_workers))
+    sandbox.join('workers.request').write_binary(plugin.CodeGeneratorRequest(
+        parameter='library_gapic.yaml,render_workers=4').SerializeToString())
+    arguments = ['--request=workers.request', '--output=workers.response']
+    assert bazel_worker.run_action(arguments, str(sandbox)) == (0, '')
+    assert bazel_worker.run_action(arguments, str(sandbox),
+                                   in_worker=True) == (0, '')
+    assert render_workers == [4, 0]
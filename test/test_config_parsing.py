@@ -13,6 +13,8 @@
 # limitations under the License.
 from unittest import TestCase
 import os
+import shutil
+import tempfile
 
 from google.protobuf.compiler import plugin_pb2
 
@@ -39,6 +41,20 @@ class TestConfigParsing(TestCase):
             "deleted_book",
             gapic_config.fixed_collections['deleted_book'].java_entity_name)
 
+    def test_config_parsing_with_yaml_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        request = plugin_pb2.CodeGeneratorRequest(
+            parameter=GAPIC_CONFIG_PATH + ',yaml_cache_dir=' + cache_dir)
+        for _ in range(2):
+            gapic_config = gapic_utils.read_from_gapic_yaml(request)
+            self.assertEqual(
+                "_deleted-book_",
+                gapic_config.fixed_collections['deleted_book'].fixed_value)
+        # One entry directory, next to the size estimate of the cache.
+        self.assertEqual(1, len([name for name in os.listdir(cache_dir)
+                                 if name != '.size']))
+
     def test_identify_single_and_fixed_entities(self):
         project = {'name_pattern': 'projects/*', 'entity_name': 'project'}
         deleted_book = {'name_pattern': '_deleted-book_',
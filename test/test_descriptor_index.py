@@ -0,0 +1,102 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from google.protobuf.compiler import plugin_pb2
+
+from plugin.pb2 import resource_pb2
+from plugin.utils import gapic_utils
+from plugin.utils.descriptor_index import DescriptorIndex
+
+
+def _add_file(request, name, java_package, generate=True):
+    if generate:
+        request.file_to_generate.append(name)
+    proto_file = request.proto_file.add(name=name)
+    if java_package:
+        proto_file.options.java_package = java_package
+    return proto_file
+
+
+def _add_message(proto_file, name, resource_type=None, patterns=(),
+                 ref=None, child_ref=None):
+    message = proto_file.message_type.add(name=name)
+    if resource_type:
+        res = message.options.Extensions[resource_pb2.resource]
+        res.type = resource_type
+        res.pattern.extend(patterns)
+    field = message.field.add(name='parent')
+    if ref:
+        field.options.Extensions[resource_pb2.resource_reference].type = ref
+    if child_ref:
+        field.options.Extensions[
+            resource_pb2.resource_reference].child_type = child_ref
+    return message
+
+
+@pytest.fixture
+def request_with_resources():
+    request = plugin_pb2.CodeGeneratorRequest()
+    library = _add_file(request, 'library.proto', 'com.example.library')
+    library.options.Extensions[resource_pb2.resource_definition].add(
+        type='test/Shelf', pattern=['shelves/{shelf}'])
+    _add_message(library, 'Book', 'test/Book',
+                 ['shelves/{shelf}/books/{book}'], child_ref='test/Shelf')
+    _add_message(library, 'ListBooksRequest', ref='test/Shelf')
+    _add_message(library, 'Untyped', patterns=['untyped/{untyped}'])
+
+    other = _add_file(request, 'other.proto', 'com.example.other')
+    _add_message(other, 'Author', 'test/Author', [])
+
+    imported = _add_file(request, 'imported.proto', 'com.example.imported',
+                         generate=False)
+    _add_message(imported, 'Project', 'test/Project',
+                 ['projects/{project}'], ref='test/Project')
+    return request
+
+
+def test_index(request_with_resources):
+    index = DescriptorIndex(request_with_resources)
+    assert index.files_to_generate == set(['library.proto', 'other.proto'])
+    assert index.java_packages == set(['com.example.library',
+                                       'com.example.other'])
+    assert index.types_with_ref == set(['test/Shelf'])
+    assert index.types_with_child_references == set(['test/Shelf'])
+    assert [r.type for r in index.message_resources] == [
+        'test/Book', 'test/Author']
+
+    type_resource_map, pattern_resource_map = index.get_resources()
+    assert sorted(type_resource_map) == ['test/Book', 'test/Shelf']
+    assert sorted(pattern_resource_map) == [
+        'shelves/{shelf}', 'shelves/{shelf}/books/{book}']
+    assert gapic_utils.get_all_resources(
+        request_with_resources, index) == (type_resource_map,
+                                           pattern_resource_map)
+    assert gapic_utils.get_all_resource_references(
+        request_with_resources) == (set(['test/Shelf']),
+                                    set(['test/Shelf']))
+
+
+def test_duplicate_resource_raises_on_access(request_with_resources):
+    other = request_with_resources.proto_file[1]
+    other.options.Extensions[resource_pb2.resource_definition].add(
+        type='test/Book', pattern=['books/{book}'])
+
+    index = DescriptorIndex(request_with_resources)
+    assert index.java_packages
+    with pytest.raises(ValueError, match='same resource defined multiple'):
+        index.get_resources()
+    with pytest.raises(ValueError, match='same resource defined multiple'):
+        gapic_utils.get_all_resources(request_with_resources)
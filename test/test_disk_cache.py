@@ -0,0 +1,133 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import os
+
+from plugin.utils import disk_cache
+from plugin.utils.disk_cache import DiskCache
+
+KEY = 'ab' * 32
+
+
+def _put_many(args):
+    directory, text = args
+    cache = DiskCache(directory, 1 << 20)
+    for _ in range(50):
+        cache.put(KEY, text)
+        assert cache.get(KEY) in ('a' * 10000, 'b' * 10000)
+
+
+def test_get_put(tmpdir):
+    cache = DiskCache(str(tmpdir), 1 << 20)
+    assert cache.get(KEY) is None
+    cache.put(KEY, u'class A {}\r\n// é')
+    assert cache.get(KEY) == u'class A {}\r\n// é'
+    cache.put(KEY, 'class B {}')
+    assert cache.get(KEY) == 'class B {}'
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert os.listdir(str(tmpdir.join(KEY[:2]))) == [KEY[2:]]
+
+
+def test_get_put_bytes(tmpdir):
+    cache = DiskCache(str(tmpdir), 1 << 20)
+    assert cache.get_bytes(KEY) is None
+    cache.put_bytes(KEY, b'\x00\xff\r\n')
+    assert cache.get_bytes(KEY) == b'\x00\xff\r\n'
+
+
+def test_trim_removes_least_recently_used(tmpdir):
+    cache = DiskCache(str(tmpdir), 250)
+    keys = ['%064x' % i for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.put(key, 'x' * 100)
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    cache.get(keys[0])
+
+    assert cache.trim() == 2
+    assert [cache.get(key) is not None for key in keys] == \
+        [True, False, False, True]
+
+
+def test_trim_removes_stale_temporary_files(tmpdir):
+    cache = DiskCache(str(tmpdir), 1 << 20)
+    cache.put(KEY, 'text')
+    stale = tmpdir.join(KEY[:2], '.tmpstale')
+    stale.write('partial')
+    os.utime(str(stale), (1000, 1000))
+    fresh = tmpdir.join(KEY[:2], '.tmpfresh')
+    fresh.write('partial')
+
+    assert cache.trim() == 0
+    assert sorted(os.listdir(str(tmpdir.join(KEY[:2])))) == \
+        ['.tmpfresh', KEY[2:]]
+
+
+def test_maybe_trim_walks_only_when_full(tmpdir, monkeypatch):
+    cache = DiskCache(str(tmpdir), 250)
+    keys = ['%064x' % i for i in range(3)]
+    cache.put(keys[0], 'x' * 100)
+    # The first call measures the cache, since there is no estimate yet.
+    assert cache.maybe_trim() == 0
+    assert tmpdir.join('.size').read() == '100'
+
+    walks = []
+    walk = os.walk
+
+    def counting_walk(*args):
+        walks.append(args)
+        return walk(*args)
+
+    monkeypatch.setattr(disk_cache.os, 'walk', counting_walk)
+    cache.put(keys[1], 'x' * 100)
+    assert cache.maybe_trim() == 0
+    assert (walks, tmpdir.join('.size').read()) == ([], '200')
+    cache.put(keys[2], 'x' * 100)
+    assert cache.maybe_trim() == 1
+    assert (len(walks), tmpdir.join('.size').read()) == (1, '200')
+
+
+def test_open_entry(tmpdir):
+    cache = DiskCache(str(tmpdir), 1 << 20)
+    entry = cache.open_entry(KEY)
+    entry.write(b'class ')
+    entry.write(b'A {}')
+    assert cache.get_bytes(KEY) is None
+    entry.commit()
+    assert cache.get_bytes(KEY) == b'class A {}'
+
+    entry = cache.open_entry(KEY)
+    entry.write(b'partial')
+    entry.abort()
+    assert cache.get_bytes(KEY) == b'class A {}'
+    assert os.listdir(str(tmpdir.join(KEY[:2]))) == [KEY[2:]]
+
+
+def test_concurrent_writers(tmpdir):
+    pool = multiprocessing.Pool(4)
+    try:
+        pool.map(_put_many, [(str(tmpdir), c * 10000) for c in 'abab'])
+    finally:
+        pool.close()
+        pool.join()
+    assert os.listdir(str(tmpdir.join(KEY[:2]))) == [KEY[2:]]
+
+
+def test_stats(tmpdir):
+    cache = DiskCache(str(tmpdir), 1 << 20)
+    cache.get(KEY)
+    cache.put(KEY, 'class A {}')
+    cache.get(KEY)
+    assert cache.stats() == {'entries': 1, 'bytes': 10, 'hits': 1,
+                             'misses': 1}
@@ -0,0 +1,89 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+import yaml
+from google.protobuf.compiler import plugin_pb2 as plugin
+
+from plugin.cli import batch
+from plugin.cli import dump_gapic_v1
+from plugin.cli import gapic_plugin
+from plugin.utils import gapic_utils
+
+PROTO_FILES = ['common_resources.proto', 'library_simple.proto',
+               'archive.proto']
+GAPIC_YAML_V2 = os.path.join('test', 'testdata', 'library_gapic_v2.yaml')
+
+
+def _generated_files(request):
+    response = plugin.CodeGeneratorResponse.FromString(
+        gapic_plugin.main(request.SerializeToString()))
+    return dict((f.name, f.content) for f in response.file)
+
+
+@pytest.mark.parametrize('gapic_yaml,filename', [
+    ('', 'gapic.v1.yaml'),
+    ('library_gapic_v2.yaml', 'library_gapic.v1.yaml'),
+    ('api/library.yaml', 'api/library.v1.yaml'),
+    ('/abs/library_v2.yml', 'library.v1.yml'),
+])
+def test_output_filename(gapic_yaml, filename):
+    assert dump_gapic_v1.output_filename(gapic_yaml) == filename
+
+
+def test_dump_generates_same_classes(tmpdir, build_request):
+    request = build_request(GAPIC_YAML_V2, PROTO_FILES)
+    response = plugin.CodeGeneratorResponse.FromString(
+        dump_gapic_v1.main(request.SerializeToString()))
+    assert [f.name for f in response.file] == [
+        os.path.join('test', 'testdata', 'library_gapic.v1.yaml')]
+    gapic_v1 = yaml.safe_load(response.file[0].content)
+    assert gapic_v1['config_schema_version'] == '1.0.0'
+
+    v1_yaml = tmpdir.join('library_gapic.v1.yaml')
+    v1_yaml.write(response.file[0].content)
+    expected = _generated_files(request)
+    assert len(expected) == 9
+    assert _generated_files(build_request(str(v1_yaml), PROTO_FILES)) == \
+        expected
+
+
+def test_reconstruct_does_not_modify_config(build_request):
+    with open(GAPIC_YAML_V2) as f:
+        gapic_v2 = yaml.safe_load(f)
+    with open(GAPIC_YAML_V2) as f:
+        original = yaml.safe_load(f)
+    gapic_utils.reconstruct_gapic_yaml(
+        gapic_v2, build_request(GAPIC_YAML_V2, PROTO_FILES))
+    assert gapic_v2 == original
+
+
+def test_batch_conversion(tmpdir, build_request):
+    request = build_request('', PROTO_FILES)
+    manifest = tmpdir.join('manifest.txt')
+    for name in ('a', 'b'):
+        tmpdir.join(name + '.pb').write_binary(request.SerializeToString())
+        manifest.write('{}.pb {}\n'.format(name, os.path.abspath(
+            GAPIC_YAML_V2)), mode='a')
+    output_dir = tmpdir.join('out')
+    assert batch.main(['--plugin', 'gapic_v1', '--jobs', '2',
+                       '--manifest', str(manifest),
+                       '--output-dir', str(output_dir)]) == 0
+    expected = plugin.CodeGeneratorResponse.FromString(dump_gapic_v1.main(
+        build_request(GAPIC_YAML_V2, PROTO_FILES).SerializeToString()))
+    for name in ('a', 'b'):
+        assert output_dir.join(name, 'library_gapic.v1.yaml').read() == \
+            expected.file[0].content
@@ -11,8 +11,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import collections
+import random
 import subprocess
 
+import pytest
+
+from plugin.cli import gapic_plugin
 from plugin.pb2 import resource_pb2
 from plugin.utils import gapic_utils
 from plugin.templates import resource_name
@@ -175,6 +180,151 @@ def test_get_parent_resources_multi_pattern_fail():
         book, pattern_map, all_resources)) == 0
 
 
+def _backtracking_parent_resources(res, all_resources):  # noqa: C901
+    # The exhaustive search that ParentResourceIndex replaced.
+    def match(parent_patterns_map, matched, unmatched_count, i):
+        parent_patterns_map = dict(parent_patterns_map)
+        for pattern in all_resources[i].pattern:
+            if pattern not in parent_patterns_map:
+                return None
+            if not parent_patterns_map[pattern]:
+                unmatched_count -= 1
+                parent_patterns_map[pattern] = True
+        matched.append(all_resources[i])
+        if unmatched_count == 0:
+            return list(matched)
+        for j in range(i + 1, len(all_resources)):
+            answer = match(parent_patterns_map, matched, unmatched_count, j)
+            if answer is not None:
+                return answer
+        matched.pop()
+        return None
+
+    parent_patterns = gapic_utils.build_parent_patterns(res.pattern)
+    parent_patterns_map = {pattern: False for pattern in parent_patterns}
+    for i in range(len(all_resources)):
+        answer = match(parent_patterns_map, [], len(res.pattern), i)
+        if answer is not None:
+            return answer
+    return []
+
+
+def test_get_parent_resources_matches_backtracking():
+    rng = random.Random(20260108)
+    patterns = ['shelves/{shelf}', 'projects/{project}', 'projects/default',
+                'projects/{project}/shelves/{shelf}',
+                'shelves/{shelf}/books/{book}',
+                'projects/{project}/books/{book}',
+                'projects/{project}/shelves/{shelf}/books/{book}']
+    for _ in range(500):
+        all_resources = []
+        for i in range(rng.randint(1, 8)):
+            res = resource_pb2.ResourceDescriptor(type='test/R%d' % i)
+            res.pattern.extend(rng.choice(patterns)
+                               for _ in range(rng.randint(0, 3)))
+            all_resources.append(res)
+        index = gapic_utils.ParentResourceIndex(all_resources)
+        for res in all_resources:
+            expected = _backtracking_parent_resources(res, all_resources)
+            assert gapic_utils.get_parent_resources(
+                res, {}, all_resources) == expected
+            assert index.find_parents(res) == expected
+
+
+def test_gapic_config_oneof_index():
+    book = gapic_utils.CollectionConfig('book', 'books/{book}', 'book')
+    shelf = gapic_utils.CollectionConfig('shelf', 'shelves/{shelf}', 'shelf')
+    oneof = gapic_utils.CollectionOneof(
+        'book_oneof', [book], [], ['book'], [], False)
+    gapic_config = gapic_utils.GapicConfig(
+        {'book': book, 'shelf': shelf}, {}, {'book_oneof': oneof})
+    assert gapic_utils.get_oneof_for_resource(book, gapic_config) is oneof
+    assert gapic_utils.get_oneof_for_resource(shelf, gapic_config) is None
+
+    other = gapic_utils.CollectionOneof(
+        'other_oneof', [book], [], ['book'], [], False)
+    with pytest.raises(ValueError, match='multiple oneofs'):
+        gapic_utils.GapicConfig({'book': book}, {},
+                                {'book_oneof': oneof, 'other_oneof': other})
+
+
+def _model_state(models):
+    # The rendered state of the models.
+    return [(type(m), m.full_class_name, m.render_context()) for m in models]
+
+
+def test_collect_resource_name_types_model_cache():
+    with open('test/testdata/library_gapic_v1.yaml') as f:
+        gapic_yaml = yaml.load(f, Loader=yaml.SafeLoader)
+    gapic_config = gapic_utils.create_gapic_config(gapic_yaml)
+
+    model_cache = resource_name.ResourceModelCache()
+    for java_package in ['com.google.example.v1', 'com.google.other.v1']:
+        cached = gapic_utils.collect_resource_name_types(
+            gapic_config, java_package, model_cache)
+        fresh = gapic_utils.collect_resource_name_types(
+            gapic_config, java_package)
+        assert _model_state(cached) == _model_state(fresh)
+        assert all(r.package == java_package for r in cached)
+
+
+class _Model(object):
+
+    def __init__(self, config, java_package, *args):
+        self.args = args
+
+    def with_package(self, java_package):
+        return self
+
+
+def test_model_cache_keys_on_arguments():
+    model_cache = resource_name.ResourceModelCache()
+    config, first, second = object(), object(), object()
+    assert model_cache.get(_Model, config, 'a', first).args == (first,)
+    assert model_cache.get(_Model, config, 'b', second).args == (second,)
+    assert model_cache.get(_Model, config, 'c', first) is \
+        model_cache.get(_Model, config, 'd', first)
+
+
+def test_format_fields_are_bounded(monkeypatch):
+    monkeypatch.setattr(resource_name, 'FORMAT_FIELD_CACHE_SIZE', 2)
+    monkeypatch.setattr(resource_name, '_format_fields',
+                        collections.OrderedDict())
+    first = resource_name.get_format_field('shelf_id', 'shelf')
+    resource_name.get_format_field('book_id', 'book')
+    assert resource_name.get_format_field('shelf_id', 'shelf') is first
+    resource_name.get_format_field('page_id', 'page')
+    assert list(resource_name._format_fields) == [
+        ('shelf_id', 'shelf'), ('page_id', 'page')]
+
+
+def _conflicting_request():
+    request = plugin_pb2.CodeGeneratorRequest()
+    request.file_to_generate.append('library.proto')
+    proto_file = request.proto_file.add(name='library.proto')
+    definitions = proto_file.options.Extensions[
+        resource_pb2.resource_definition]
+    definitions.add(type='test/Book',
+                    pattern=['shelves/{shelf}/books/{book=**}',
+                             'shelves/{shelf}/books/{book}'])
+    definitions.add(type='test/Shelf', pattern=['shelves/{shelf}'])
+    definitions.add(type='test/DefaultBook',
+                    pattern=['shelves/default/books/{book}'])
+    return request
+
+
+def test_build_pattern_index():
+    index = gapic_utils.build_pattern_index(_conflicting_request())
+    assert [(a.owner, b.owner) for a, b in index.find_overlaps()] == [
+        ('test/Book', 'test/Book'),
+        ('test/Book', 'test/DefaultBook'),
+        ('test/Book', 'test/DefaultBook'),
+    ]
+    assert [(a.pattern, b.pattern) for a, b in index.find_shadowed()] == [
+        ('shelves/{shelf}/books/{book}', 'shelves/{shelf}/books/{book=**}'),
+    ]
+
+
 def test_update_collections_with_deprecated_collections():
     book = resource_pb2.ResourceDescriptor()
     book.type = 'test/Book'
@@ -343,3 +493,34 @@ def test_library_gapic_v2():
     assert [r for r in resource_name_artifacts if
             type(r) is resource_name.ParentResourceName
             and r.class_name == 'BookName']
+
+
+def test_check_pattern_conflicts(capsys):
+    conflicts = gapic_utils.check_pattern_conflicts(_conflicting_request())
+    assert conflicts == [
+        'shelves/{shelf}/books/{book} of test/Book: never matched, '
+        'shelves/{shelf}/books/{book=**} of the same resource matches first',
+        'shelves/{shelf}/books/{book=**} of test/Book: can match the same '
+        'names as shelves/default/books/{book} of test/DefaultBook',
+        'shelves/{shelf}/books/{book} of test/Book: can match the same '
+        'names as shelves/default/books/{book} of test/DefaultBook',
+    ]
+    assert capsys.readouterr()[1] == ''.join(
+        'warning: {}\n'.format(c) for c in conflicts)
+
+    with pytest.raises(ValueError) as excinfo:
+        gapic_utils.check_pattern_conflicts(_conflicting_request(),
+                                            fail=True)
+    assert conflicts[0] in str(excinfo.value)
+    assert capsys.readouterr()[1] == ''
+
+
+def test_plugin_checks_pattern_conflicts(capsys):
+    request = _conflicting_request()
+    request.proto_file[0].options.java_package = 'com.google.example'
+    request.parameter = 'pattern_conflicts=error'
+    with pytest.raises(ValueError):
+        gapic_plugin.main(request.SerializeToString())
+    request.parameter = 'pattern_conflicts=warn'
+    assert gapic_plugin.main(request.SerializeToString())
+    assert capsys.readouterr()[1].count('warning: ') == 3
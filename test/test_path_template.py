@@ -11,10 +11,16 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import random
+import re
 import unittest
 from unittest import TestCase
 
+import pytest
+
+from plugin.utils import path_template
 from plugin.utils.path_template import PathTemplate
+from plugin.utils.path_template import ValidationException
 """
         "foos/{foo}/bars/{bar}~{car}~{cdr}",
         "foos/{foo}/bars/{bar}.{car}_{cdr}",
@@ -68,5 +74,264 @@ class PathTemplateTest(TestCase):
     self.assertEqual(bindings["param_index"], "0")
 
 
+class TemplateCacheTest(TestCase):
+
+  def setUp(self):
+    path_template.clear_template_cache()
+
+  def test_pattern_parsed_once(self):
+    first = PathTemplate("shelves/{shelf}/books/{book}")
+    second = PathTemplate("shelves/{shelf}/books/{book}")
+    self.assertIs(first.segments, second.segments)
+    self.assertEqual(len(first), 4)
+    info = path_template.template_cache_info()
+    self.assertEqual(info.hits, 1)
+    self.assertEqual(info.misses, 1)
+    self.assertEqual(info.currsize, 1)
+
+  def test_parse_errors_not_cached(self):
+    for _ in range(2):
+      with self.assertRaises(ValidationException):
+        PathTemplate("shelves/{shelf")
+    info = path_template.template_cache_info()
+    self.assertEqual(info.hits, 0)
+    self.assertEqual(info.misses, 2)
+    self.assertEqual(info.currsize, 0)
+
+  def test_cache_is_bounded(self):
+    maxsize = path_template.template_cache_info().maxsize
+    for i in range(maxsize + 1):
+      PathTemplate("shelves/shelf%d/books/{book}" % i)
+    info = path_template.template_cache_info()
+    self.assertEqual(info.currsize, maxsize)
+    # The least recently used pattern was evicted.
+    PathTemplate("shelves/shelf0/books/{book}")
+    self.assertEqual(path_template.template_cache_info().misses, maxsize + 2)
+
+
+class CompactTemplateTest(TestCase):
+
+  def test_binding_names(self):
+    template = PathTemplate("shelves/{shelf}/books/{book=**}/*")
+    self.assertEqual(template.binding_names, ("shelf", "book", "$0"))
+    self.assertEqual(PathTemplate("_deleted-topic_").binding_names, ())
+
+  def test_literals_are_interned(self):
+    first = PathTemplate("shelves/{shelf}/books/{book}")._parsed
+    second = PathTemplate("archives/{archive}/books/{book}")._parsed
+    self.assertIs(first.literals[4], second.literals[4])
+    self.assertIs(first.binding_names[1], second.binding_names[1])
+
+  def test_unicode_pattern(self):
+    # Python 2 cannot intern the unicode patterns of protos and YAML.
+    template = PathTemplate(u'shelves/{shelf}/books/{book}')
+    self.assertEqual(template.match(u'shelves/s1/books/b1'),
+                     {u'shelf': u's1', u'book': u'b1'})
+    self.assertEqual(template.render({u'shelf': u's1', u'book': u'b1'}),
+                     u'shelves/s1/books/b1')
+    self.assertEqual(template._parsed.binding_names, (u'shelf', u'book'))
+
+  def test_segments_match_parser(self):
+    pattern = "foos/{foo}/bars/{bar=*/baz/**}"
+    parser = path_template._LinearParser()
+    self.assertEqual(list(PathTemplate(pattern).segments),
+                     parser.parse(pattern))
+
+
+def reference_match(template, path):
+  """The segment-walking match that the compiled matcher replaced."""
+  this = template.segments
+  that = re.split(r'[/~_\-\.]', path)
+
+  current_var = None
+  bindings = {}
+  segment_count = template.segment_count
+  j = 0
+  for i in range(0, len(this)):
+    if j >= len(that):
+      break
+    if this[i].kind == path_template._TERMINAL:
+      if this[i].literal == '*':
+        bindings[current_var] = that[j]
+        j += 1
+      elif this[i].literal == '**':
+        until = j + len(that) - segment_count + 1
+        segment_count += len(that) - segment_count
+        bindings[current_var] = '/'.join(that[j:until])
+        j = until
+      elif this[i].literal != that[j]:
+        raise ValidationException(
+            'mismatched literal: \'%s\' != \'%s\'' % (
+                this[i].literal, that[j]))
+      else:
+        j += 1
+    elif this[i].kind == path_template._BINDING:
+      current_var = this[i].literal
+  if j != len(that) or j != segment_count:
+    raise ValidationException(
+        'match error: could not render from the path template: {}'
+        .format(path))
+  return bindings
+
+
+def match_outcome(match, template, path):
+  try:
+    return 'ok', list(match(template, path).items())
+  except ValidationException as e:
+    return 'error', str(e)
+
+
+class MatcherTest(TestCase):
+
+  TEMPLATES = [
+      "foos/{foo}/bars/{bar}",
+      "foos/{name=*/bars}/{bar}",
+      "foos/{foo}/bars/{bar}~{car}~{cdr}",
+      "foos/{foo}/bars/{bar}_{car}.{cdr}",
+      "shelves/{shelf}/books/{book=**}",
+      "archives/{archive}/{path=**}/books/{book}",
+      "{path=**}/bars/{bar}",
+      "projects/*/topics/**",
+      "foos/{a}/{a}",
+      "a-b/{foo}",
+      "_deleted-topic_",
+  ]
+
+  TOKENS = ["foos", "bars", "shelves", "books", "archives", "projects",
+            "topics", "x", "y1", "", "a", "b"]
+
+  def random_path(self, rng):
+    path = rng.choice(self.TOKENS)
+    for _ in range(rng.randint(0, 7)):
+      path += rng.choice("/////~_-.") + rng.choice(self.TOKENS)
+    return path
+
+  def guided_path(self, rng, pattern):
+    """Fills in the pattern's variables, sometimes with several segments."""
+    values = self.TOKENS + ["x/y", "p~q", "m/n/o"]
+    path = re.sub(r"\{[^}]*\}|\*\*|\*",
+                  lambda _: rng.choice(values), pattern)
+    if rng.random() < 0.3:
+      path = path[:rng.randint(0, len(path))]
+    return path
+
+  def test_match_same_as_reference(self):
+    rng = random.Random(20260102)
+    for pattern in self.TEMPLATES:
+      template = PathTemplate(pattern)
+      for _ in range(2000):
+        path = rng.choice([self.random_path(rng),
+                           self.guided_path(rng, pattern)])
+        self.assertEqual(
+            match_outcome(PathTemplate.match, template, path),
+            match_outcome(reference_match, template, path),
+            "mismatch for %s against %s" % (path, pattern))
+
+  def test_path_wildcard_edge_cases(self):
+    for pattern, path in [("shelves/{shelf}/{rest=**}/{book}", "shelves/s/b"),
+                          ("a/{x=**}/b", "a/b"),
+                          ("{a}/{b=**}/{c}/{d}", "p/q"),
+                          ("a/**/b", "a/x~y.z/b")]:
+      template = PathTemplate(pattern)
+      self.assertEqual(match_outcome(PathTemplate.match, template, path),
+                       match_outcome(reference_match, template, path))
+
+  def test_path_wildcard_binding(self):
+    template = PathTemplate("shelves/{shelf}/books/{book=**}")
+    bindings = template.match("shelves/s1/books/a/b.c")
+    self.assertEqual(bindings, {"shelf": "s1", "book": "a/b/c"})
+
+  def test_mismatched_literal(self):
+    template = PathTemplate("foos/{foo}/bars/{bar}")
+    with pytest.raises(ValidationException, match="mismatched literal"):
+      template.match("foos/foo1/bazs/somebar")
+    with pytest.raises(ValidationException, match="match error"):
+      template.match("foos/foo1/bars/somebar/extra")
+
+  def test_match_many(self):
+    template = PathTemplate("shelves/{shelf}/books/{book}")
+    results = template.match_many(["shelves/s1/books/b1",
+                                   "shelves/s1",
+                                   "shelves/s2/books/b2"])
+    self.assertEqual(results, [{"shelf": "s1", "book": "b1"},
+                               None,
+                               {"shelf": "s2", "book": "b2"}])
+
+
+def reference_render(template, bindings):
+  """The segment-splicing render that the render plan replaced."""
+  out = []
+  binding = False
+  for segment in template.segments:
+    if segment.kind == path_template._BINDING:
+      if segment.literal not in bindings:
+        raise ValidationException(
+            ('rendering error: value for key \'{}\' '
+             'not provided').format(segment.literal))
+      out.extend(PathTemplate(bindings[segment.literal]).segments)
+      binding = True
+    elif segment.kind == path_template._END_BINDING:
+      binding = False
+    else:
+      if binding:
+        continue
+      out.append(segment)
+  path = path_template._format(out)
+  template.match(path)
+  return path
+
+
+def render_outcome(render, template, bindings):
+  try:
+    return 'ok', render(template, bindings)
+  except ValidationException as e:
+    return 'error', str(e)
+
+
+class RenderTest(TestCase):
+
+  TEMPLATES = [
+      "shelves/{shelf}/books/{book}",
+      "/shelves/{shelf}/books/{book}",
+      "shelves/{shelf}/books/{book=**}",
+      "foos/{name=*/bars}/{bar}",
+      "foos/{foo}/bars/{bar}~{car}",
+      "projects/*/topics/**",
+      "_deleted-topic_",
+  ]
+
+  VALUES = ["s1", "a-b_c", "x/y", "x/y/z", "_deleted-topic_", "*", "**",
+            "a~b", " a", "a/", "", "#", "{v}", "{v=x/*}", "a/**/b"]
+
+  def test_render_same_as_reference(self):
+    rng = random.Random(20260103)
+    for pattern in self.TEMPLATES:
+      template = PathTemplate(pattern)
+      names = [s.literal for s in template.segments
+               if s.kind == path_template._BINDING]
+      for _ in range(500):
+        bindings = dict((name, rng.choice(self.VALUES)) for name in names
+                        if rng.random() < 0.95)
+        self.assertEqual(
+            render_outcome(
+                lambda t, b: t.render(b, validate=True), template, bindings),
+            render_outcome(reference_render, template, bindings),
+            "mismatch for %s with %s" % (pattern, bindings))
+
+  def test_render(self):
+    template = PathTemplate("shelves/{shelf}/books/{book}")
+    self.assertEqual(template.render({"shelf": "s1", "book": "b1"}),
+                     "shelves/s1/books/b1")
+    with pytest.raises(ValidationException, match="rendering error"):
+      template.render({"shelf": "s1"})
+
+  def test_validation_is_opt_in(self):
+    template = PathTemplate("shelves/{shelf}/books/{book}")
+    bindings = {"shelf": "s1", "book": "b1/b2"}
+    self.assertEqual(template.render(bindings), "shelves/s1/books/b1/b2")
+    with pytest.raises(ValidationException, match="match error"):
+      template.render(bindings, validate=True)
+
+
 if __name__ == "__main__":
   unittest.main()
@@ -0,0 +1,141 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Differential tests of the linear path template parser against ply."""
+
+import random
+
+import pytest
+
+from plugin.utils import path_template
+
+VALID_PATTERNS = [
+    'projects/{project}',
+    '/projects/{project}',
+    'projects/{project}/locations/{location}/books/{book}',
+    'shelves/{shelf}/books/{book=**}',
+    'archives/{archive_id}/books/{book_id=**}',
+    'foos/{name=*/bars}/{bar}',
+    'foos/{foo}/bars/{bar}~{car}~{cdr}',
+    'foos/{foo}/bars/{bar}.{car}_{cdr}',
+    'foos/{foo}/bars/{bar}-{car}.{cdr}~{zoo}',
+    'foos/{foo}/bars/{bar_name}-{car-n}-{cdr_a}_{far-away}~{boo}',
+    'customers/{customer_id}/adParameters/{ad_group_id}~{criterion_id}',
+    'projects/*/topics/*',
+    'projects/*/topics/**',
+    '{a=foo/*/bar/**}',
+    '_deleted-topic_',
+    'a-b_c/d',
+    'projects / {project}',
+    '\tprojects/{project}',
+    '*',
+    '**',
+]
+
+INVALID_PATTERNS = [
+    '',
+    ' ',
+    '/',
+    '//',
+    'a//b',
+    'a/',
+    'a-',
+    'a b',
+    'a#b',
+    'projects/{project',
+    'projects/project}',
+    'projects/{}',
+    'projects/{=*}',
+    'projects/{a=}',
+    'projects/{a=b~c}',
+    'projects/{a={b}}',
+    'projects/{a}{b}',
+    '{a=**/b/**}',
+    '**/**',
+    '***',
+    '_deleted-topic_x',
+    '_deleted-book_',
+    'projects/{project}/',
+    'projects/é',
+]
+
+# Characters that exercise every token type and lexer error path.
+FUZZ_ALPHABET = 'ab0_-~./{}=* \t#'
+
+# Token-sized fragments, which reach deeper into the grammar than
+# single characters do.
+FUZZ_FRAGMENTS = ['shelves', 'book_id', 'a-b', '/', '/', '{', '}', '=',
+                  '*', '**', '~', '.', '-', '_', ' ', '_deleted-topic_']
+
+
+def _outcome(parser, data):
+    try:
+        segments = parser.parse(data)
+    except path_template.ValidationException as e:
+        return 'error', str(e)
+    return 'ok', list(segments), parser.segment_count
+
+
+def _fuzz_corpus(alphabet, count, seed):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        length = rng.randint(0, 12)
+        corpus.append(''.join(rng.choice(alphabet) for _ in range(length)))
+    return corpus
+
+
+@pytest.fixture(scope='module')
+def parsers():
+    return path_template._Parser(), path_template._LinearParser()
+
+
+@pytest.mark.parametrize('pattern', VALID_PATTERNS)
+def test_valid_patterns(parsers, pattern):
+    ply_parser, linear_parser = parsers
+    expected = _outcome(ply_parser, pattern)
+    assert expected[0] == 'ok'
+    assert _outcome(linear_parser, pattern) == expected
+
+
+@pytest.mark.parametrize('pattern', INVALID_PATTERNS)
+def test_invalid_patterns(parsers, pattern):
+    ply_parser, linear_parser = parsers
+    expected = _outcome(ply_parser, pattern)
+    assert expected[0] == 'error'
+    assert _outcome(linear_parser, pattern) == expected
+
+
+@pytest.mark.parametrize('alphabet', [FUZZ_ALPHABET, FUZZ_FRAGMENTS])
+def test_fuzz_corpus(parsers, alphabet):
+    ply_parser, linear_parser = parsers
+    for data in _fuzz_corpus(alphabet, 5000, seed=20260101):
+        assert _outcome(linear_parser, data) == _outcome(ply_parser, data), \
+            'backends disagree on {!r}'.format(data)
+
+
+def test_set_parser_backend():
+    try:
+        path_template.set_parser_backend('ply')
+        ply_segments = path_template.PathTemplate('shelves/{shelf}').segments
+        path_template.set_parser_backend('linear')
+        linear_segments = \
+            path_template.PathTemplate('shelves/{shelf}').segments
+        assert ply_segments == linear_segments
+        assert path_template.template_cache_info().misses == 1
+    finally:
+        path_template.set_parser_backend(
+            path_template._DEFAULT_PARSER_BACKEND)
+
+    with pytest.raises(ValueError):
+        path_template.set_parser_backend('yacc')
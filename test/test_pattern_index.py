@@ -0,0 +1,134 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import random
+import re
+
+import pytest
+
+from plugin.pb2 import resource_pb2
+from plugin.utils import pattern_index
+
+
+def _patterns(pairs):
+    return [(a.pattern, b.pattern) for a, b in pairs]
+
+
+def test_overlaps():
+    index = pattern_index.PatternIndex()
+    index.add('projects/{project}/books/{book}', 'a')
+    index.add('projects/{project}/shelves/{shelf}', 'b')
+    index.add('projects/default/books/{book}', 'c')
+    index.add('projects/{project}/books/{book=**}', 'd')
+    index.add('projects/{project}', 'e')
+    assert _patterns(index.find_overlaps()) == [
+        ('projects/{project}/books/{book}', 'projects/default/books/{book}'),
+        ('projects/{project}/books/{book}',
+         'projects/{project}/books/{book=**}'),
+        ('projects/default/books/{book}',
+         'projects/{project}/books/{book=**}'),
+    ]
+
+
+def test_identical_patterns_overlap():
+    index = pattern_index.PatternIndex()
+    first = index.add('shelves/{shelf}', 'a')
+    second = index.add('shelves/{shelf_id}', 'b')
+    assert index.find_overlaps() == [(first, second)]
+
+
+def test_composite_segments_are_wildcards():
+    index = pattern_index.PatternIndex()
+    index.add('foos/{foo}/bars/{bar}~{car}', 'a')
+    index.add('foos/{foo}/bars/{bar}', 'b')
+    index.add('foos/{foo=*/bars}/{bar}', 'c')
+    assert len(index.find_overlaps()) == 3
+
+
+def test_shadowed():
+    resource = resource_pb2.ResourceDescriptor(
+        type='library.googleapis.com/Book',
+        pattern=['shelves/{shelf}/books/{book=**}',
+                 'shelves/{shelf}/books/{book}',
+                 'shelves/{shelf}',
+                 'shelves/{shelf}/books/{book}/editions/{edition}'])
+    index = pattern_index.index_resources([resource])
+    shadowed = index.find_shadowed()
+    assert [(a.position, b.position) for a, b in shadowed] == [(1, 0), (3, 0)]
+
+
+def test_not_shadowed_across_resources_or_in_order():
+    index = pattern_index.PatternIndex()
+    index.add('shelves/{shelf}/books/{book=**}', 'a', 0)
+    index.add('shelves/{shelf}/books/{book}', 'b', 0)
+    index.add('shelves/{shelf}/books/{book}', 'c', 0)
+    index.add('shelves/{shelf}/books/{book=**}', 'c', 1)
+    assert index.find_shadowed() == []
+
+
+def test_unbalanced_braces():
+    with pytest.raises(ValueError):
+        pattern_index.PatternIndex().add('shelves/{shelf', 'a')
+
+
+# Small patterns over a tiny alphabet, checked against brute-force matching
+# of every path up to a length that is long enough to witness any overlap.
+SEGMENTS = ['a', 'b', '*', '**']
+PATH_SEGMENTS = ['a', 'b', 'z']
+
+
+def _regex(pattern):
+    parts = []
+    for segment in pattern.split('/'):
+        if segment == '**':
+            parts.append('[^/]+(/[^/]+)*')
+        elif segment == '*':
+            parts.append('[^/]+')
+        else:
+            parts.append(re.escape(segment))
+    return re.compile('/'.join(parts) + r'\Z')
+
+
+def _matched_paths(pattern, paths):
+    regex = _regex(pattern)
+    return frozenset(p for p in paths if regex.match(p))
+
+
+def test_against_brute_force():
+    rng = random.Random(20260105)
+    paths = ['/'.join(p) for length in range(1, 6)
+             for p in itertools.product(PATH_SEGMENTS, repeat=length)]
+    for _ in range(50):
+        index = pattern_index.PatternIndex()
+        entries = []
+        for position in range(6):
+            pattern = '/'.join(rng.choice(SEGMENTS)
+                               for _ in range(rng.randint(1, 2)))
+            entries.append(index.add(pattern, 'r', position))
+        matched = [_matched_paths(e.pattern, paths) for e in entries]
+
+        expected_overlaps = [
+            (entries[i], entries[j])
+            for i, j in itertools.combinations(range(len(entries)), 2)
+            if matched[i] & matched[j]]
+        assert index.find_overlaps() == expected_overlaps
+
+        expected_shadowed = []
+        for j, entry in enumerate(entries):
+            covering = [entries[i] for i in range(j)
+                        if matched[j] <= matched[i]]
+            if covering:
+                expected_shadowed.append((entry, covering[0]))
+        assert index.find_shadowed() == expected_shadowed
@@ -0,0 +1,75 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+from plugin.utils import plugin_options
+
+
+@pytest.mark.parametrize('parameter,gapic_yaml,render_workers', [
+    ('', None, 0),
+    ('test/testdata/library_gapic.yaml', 'test/testdata/library_gapic.yaml',
+     0),
+    ('library_gapic.yaml,render_workers=4', 'library_gapic.yaml', 4),
+    ('render_workers=2', None, 2),
+    (' render_workers = 3 ,a,b.yaml', 'a,b.yaml', 3),
+    ('dir/key=value.yaml', 'dir/key=value.yaml', 0),
+])
+def test_parse_parameter(parameter, gapic_yaml, render_workers):
+    options = plugin_options.parse_parameter(parameter)
+    assert options.gapic_yaml == gapic_yaml
+    assert options.render_workers == render_workers
+
+
+def test_parse_parameter_render_cache():
+    options = plugin_options.parse_parameter(
+        'a.yaml,render_cache_dir=/tmp/cache,render_cache_max_mb=64')
+    assert options.gapic_yaml == 'a.yaml'
+    assert options.render_cache_dir == '/tmp/cache'
+    assert options.render_cache_max_mb == 64
+    assert plugin_options.parse_parameter('').render_cache_dir is None
+
+
+def test_parse_parameter_yaml_cache():
+    options = plugin_options.parse_parameter('a.yaml,yaml_cache_dir=cache')
+    assert options.gapic_yaml == 'a.yaml'
+    assert options.yaml_cache_dir == 'cache'
+    options.resolve_paths('/work')
+    assert options.yaml_cache_dir == os.path.join('/work', 'cache')
+
+
+@pytest.mark.parametrize('parameter', [
+    'render_workers=many',
+    'render_workers=-1',
+    'a.yaml,render_workers=',
+    'render_cache_dir=',
+    'pattern_conflicts=ignore',
+])
+def test_parse_parameter_invalid(parameter):
+    with pytest.raises(ValueError):
+        plugin_options.parse_parameter(parameter)
+
+
+@pytest.mark.parametrize('parameter', [
+    '',
+    'library_gapic.yaml',
+    'a,b.yaml,render_workers=4',
+    'render_cache_dir=/tmp/cache,render_cache_max_mb=64',
+])
+def test_to_parameter(parameter):
+    options = plugin_options.parse_parameter(parameter)
+    round_trip = plugin_options.parse_parameter(options.to_parameter())
+    assert vars(round_trip) == vars(options)
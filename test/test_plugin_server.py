@@ -0,0 +1,163 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import signal
+import threading
+import time
+
+import pytest
+from google.protobuf.compiler import plugin_pb2
+
+from plugin.cli import gapic_plugin
+from plugin.cli import plugin_client
+from plugin.cli import plugin_server
+
+
+@pytest.fixture(scope='module')
+def request_data(build_request):
+    return build_request(
+        'test/testdata/library_gapic.yaml').SerializeToString()
+
+
+@pytest.fixture
+def server(tmpdir):
+    server = plugin_server.PluginServer(str(tmpdir.join('s.sock')),
+                                        max_concurrent=2, idle_timeout=0)
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    yield server
+    server.stop()
+    thread.join()
+
+
+def test_server(server, request_data):
+    expected = gapic_plugin.main(request_data)
+    results = []
+
+    def send():
+        results.append(plugin_client.send_request(
+            server.socket_path, request_data, os.getcwd()))
+
+    threads = [threading.Thread(target=send) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [(plugin_client.STATUS_OK, expected)] * 6
+
+
+def test_server_resolves_paths_in_client_directory(server, request_data,
+                                                   monkeypatch):
+    expected = gapic_plugin.main(request_data)
+    cwd = os.getcwd()
+    monkeypatch.chdir('test')
+    assert plugin_client.send_request(
+        server.socket_path, request_data, cwd) == \
+        (plugin_client.STATUS_OK, expected)
+
+
+def test_server_error(server):
+    request = plugin_pb2.CodeGeneratorRequest(parameter='missing.yaml')
+    status, payload = plugin_client.send_request(
+        server.socket_path, request.SerializeToString(), os.getcwd())
+    assert status == plugin_client.STATUS_ERROR
+    assert b'java package not defined' in payload
+
+
+def test_server_refuses_socket_in_use(server):
+    with pytest.raises(RuntimeError):
+        plugin_server.PluginServer(server.socket_path)
+
+
+def test_server_idle_timeout(tmpdir):
+    server = plugin_server.PluginServer(str(tmpdir.join('s.sock')),
+                                        idle_timeout=0.1)
+    assert server.serve() == plugin_server.IDLE
+    assert not os.path.exists(server.socket_path)
+
+
+def test_client_falls_back_without_server(tmpdir, request_data):
+    output = io.BytesIO()
+    assert plugin_client.main(request_data, output,
+                              str(tmpdir.join('none.sock'))) == 0
+    assert output.getvalue() == gapic_plugin.main(request_data)
+
+
+def test_client_uses_server(server, request_data, monkeypatch):
+    main = gapic_plugin.main
+    calls = []
+
+    def record_main(data, dest=None, cwd=None):
+        # Only the server passes the client's directory.
+        calls.append(cwd)
+        return main(data, dest, cwd)
+
+    monkeypatch.setattr(gapic_plugin, 'main', record_main)
+    output = io.BytesIO()
+    assert plugin_client.main(request_data, output, server.socket_path) == 0
+    assert calls and set(calls) == set([os.getcwd()])
+    response = plugin_pb2.CodeGeneratorResponse.FromString(
+        output.getvalue())
+    assert len(response.file) == 11
+
+
+def test_sigterm_waits_for_running_request(tmpdir, monkeypatch):
+    # Python 2.7 to 3.6 do not join request threads in server_close().
+    monkeypatch.setattr(plugin_server.PluginServer, 'block_on_close', False,
+                        raising=False)
+    socket_path = str(tmpdir.join('s.sock'))
+    started = threading.Event()
+    signalled = threading.Event()
+    finished = threading.Event()
+
+    def slow_main(data, dest=None, cwd=None):
+        started.set()
+        signalled.wait(10)
+        time.sleep(0.2)
+        finished.set()
+        return b'response'
+
+    def terminate():
+        started.wait(10)
+        os.kill(os.getpid(), signal.SIGTERM)
+        signalled.set()
+
+    results = []
+
+    def send():
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+        results.append(plugin_client.send_request(socket_path, b'', '/'))
+
+    monkeypatch.setattr(gapic_plugin, 'main', slow_main)
+    handlers = [(s, signal.getsignal(s))
+                for s in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)]
+    threads = [threading.Thread(target=send),
+               threading.Thread(target=terminate)]
+    for thread in threads:
+        thread.start()
+    try:
+        assert plugin_server.main(['--socket', socket_path,
+                                   '--idle-timeout', '0']) == 0
+        assert finished.is_set()
+    finally:
+        for signum, handler in handlers:
+            signal.signal(signum, handler)
+        signalled.set()
+        for thread in threads:
+            thread.join()
+    assert results == [(plugin_client.STATUS_OK, b'response')]
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,100 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import time
+
+import pytest
+
+from plugin.cli import gapic_plugin
+from plugin.utils import plugin_options
+from plugin.utils import profiling
+
+GAPIC_YAML = os.path.abspath(
+    os.path.join('test', 'testdata', 'library_gapic.yaml'))
+PHASES = ['parse_request', 'resolve_java_packages', 'response_cache',
+          'load_yaml', 'scan_resources', 'build_models',
+          'render:resource_name.mustache', 'serialize']
+
+
+def _check_phase_names(phases):
+    names = [p['name'] for p in phases]
+    assert names[:len(PHASES) - 2] == PHASES[:-2]
+    assert set(PHASES) <= set(names)
+    assert all(n.startswith('render:') for n in set(names) - set(PHASES))
+
+
+def test_nested_phases():
+    profiler = profiling.Profiler('stderr')
+    with profiling.activate(profiler):
+        for _ in range(2):
+            with profiling.phase('outer'):
+                with profiling.phase('inner'):
+                    time.sleep(0.01)
+    assert profiling.phase('outer') is profiling.phase('inner')
+    outer, inner = profiler.report()['phases']
+    assert (outer['name'], outer['count']) == ('outer', 2)
+    assert (inner['name'], inner['count']) == ('inner', 2)
+    assert inner['seconds'] >= 0.02
+    assert outer['self_seconds'] == pytest.approx(
+        outer['seconds'] - inner['seconds'], abs=1e-5)
+
+
+def test_details():
+    profiler = profiling.Profiler('stderr', ['cprofile', 'tracemalloc'])
+    with profiling.activate(profiler):
+        with profiling.phase('allocate'):
+            data = [str(i) for i in range(10000)]
+    profiler.write_report()
+    phase, = profiler.report()['phases']
+    assert any('<listcomp>' in entry['function'] or
+               'test_details' in entry['function']
+               for entry in phase['cprofile'])
+    assert phase['memory']['allocated_bytes'] > 0
+    assert phase['memory']['top']
+    assert data
+
+
+@pytest.mark.parametrize('value', ['cprofile+heap', 'all'])
+def test_invalid_details(value):
+    with pytest.raises(ValueError):
+        profiling.parse_details(value)
+    with pytest.raises(ValueError):
+        plugin_options.parse_parameter('profile_detail=' + value)
+
+
+def test_profile_option(tmpdir, build_request):
+    report = tmpdir.join('profile.jsonl')
+    expected = gapic_plugin.main(
+        build_request(GAPIC_YAML).SerializeToString())
+    for _ in range(2):
+        assert gapic_plugin.main(build_request(
+            GAPIC_YAML + ',profile=' + str(report)).SerializeToString()) == \
+            expected
+    lines = report.read().splitlines()
+    assert len(lines) == 2
+    phases = json.loads(lines[0])['phases']
+    _check_phase_names(phases)
+    assert phases[PHASES.index('render:resource_name.mustache')]['count'] > 1
+
+
+def test_profile_environment(build_request, monkeypatch, capsys):
+    monkeypatch.setenv(profiling.PROFILE_ENV, 'stderr')
+    monkeypatch.setenv(profiling.PROFILE_DETAIL_ENV, 'cprofile')
+    gapic_plugin.main(build_request(GAPIC_YAML).SerializeToString())
+    report = json.loads(capsys.readouterr()[1])
+    assert report['details'] == ['cprofile']
+    _check_phase_names(report['phases'])
+    assert all('cprofile' in p for p in report['phases'])
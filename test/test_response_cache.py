@@ -0,0 +1,143 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+
+import pytest
+from google.protobuf.compiler import plugin_pb2 as plugin
+
+from plugin.cli import cache_stats
+from plugin.cli import gapic_plugin
+from plugin.pb2 import resource_pb2
+from plugin.utils import response_cache
+from plugin.utils.descriptor_index import DescriptorIndex
+
+GAPIC_YAML = os.path.abspath(
+    os.path.join('test', 'testdata', 'library_gapic.yaml'))
+
+
+def _request():
+    request = plugin.CodeGeneratorRequest(file_to_generate=['library.proto'])
+    proto_file = request.proto_file.add(name='library.proto')
+    proto_file.options.java_package = 'com.google.example.library'
+    proto_file.options.Extensions[resource_pb2.resource_definition].add(
+        type='library.googleapis.com/Shelf', pattern=['shelves/{shelf}'])
+    message = proto_file.message_type.add(name='Book')
+    message.options.Extensions[resource_pb2.resource].type = \
+        'library.googleapis.com/Book'
+    field = message.field.add(name='shelf', number=1)
+    field.options.Extensions[resource_pb2.resource_reference].type = \
+        'library.googleapis.com/Shelf'
+    request.proto_file.add(name='other.proto')
+    return request
+
+
+def _fingerprint(request, gapic_yaml_data=None):
+    return response_cache.fingerprint(DescriptorIndex(request),
+                                      gapic_yaml_data)
+
+
+def _ignored_source_info(request):
+    location = request.proto_file[0].source_code_info.location.add()
+    location.leading_comments = 'A library.'
+
+
+def _ignored_other_file(request):
+    request.proto_file[1].options.java_package = 'com.google.other'
+
+
+def _ignored_parameter(request):
+    request.parameter = 'render_workers=4'
+
+
+def _changed_java_package(request):
+    request.proto_file[0].options.java_package = 'com.google.other'
+
+
+def _changed_resource(request):
+    request.proto_file[0].message_type[0].options.Extensions[
+        resource_pb2.resource].pattern.append('shelves/{shelf}/books/{book}')
+
+
+def _changed_reference(request):
+    request.proto_file[0].message_type[0].field[0].options.Extensions[
+        resource_pb2.resource_reference].child_type = 'library/Shelf'
+
+
+def _changed_files_to_generate(request):
+    request.file_to_generate.append('other.proto')
+
+
+@pytest.mark.parametrize('change,changes_fingerprint', [
+    (_ignored_source_info, False),
+    (_ignored_other_file, False),
+    (_ignored_parameter, False),
+    (_changed_java_package, True),
+    (_changed_resource, True),
+    (_changed_reference, True),
+    (_changed_files_to_generate, True),
+])
+def test_fingerprint(change, changes_fingerprint):
+    request = _request()
+    change(request)
+    assert (_fingerprint(request) != _fingerprint(_request())) == \
+        changes_fingerprint
+
+
+def test_fingerprint_covers_gapic_yaml():
+    request = _request()
+    assert len(set([_fingerprint(request), _fingerprint(request, b''),
+                    _fingerprint(request, b'a: 1')])) == 3
+
+
+@pytest.fixture
+def request_data(tmpdir, build_request):
+    return build_request(GAPIC_YAML + ',response_cache_dir=' + str(
+        tmpdir.join('responses'))).SerializeToString()
+
+
+def test_main_caches_response(tmpdir, request_data):
+    cache_dir = str(tmpdir.join('responses'))
+    response = gapic_plugin.main(request_data)
+    assert len(plugin.CodeGeneratorResponse.FromString(response).file) == 11
+    assert gapic_plugin.main(request_data) == response
+    stats = response_cache.stats()[cache_dir]
+    assert stats['entries'] == 1
+    assert stats['bytes'] == len(response)
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+
+def test_cache_stats(tmpdir, request_data, capsys):
+    cache_dir = str(tmpdir.join('responses'))
+    gapic_plugin.main(request_data)
+    assert cache_stats.main([cache_dir]) == 0
+    assert json.loads(capsys.readouterr()[0])[cache_dir]['entries'] == 1
+    assert cache_stats.main(['--max-mb', '0', cache_dir]) == 0
+    assert json.loads(capsys.readouterr()[0])[cache_dir] == {
+        'bytes': 0, 'entries': 0, 'removed': 1}
+
+
+def test_failed_response_is_not_cached(tmpdir, monkeypatch, request_data):
+    cache_dir = str(tmpdir.join('responses'))
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('render failed')
+
+    monkeypatch.setattr(gapic_plugin, 'generate_resource_name_types', fail)
+    with pytest.raises(RuntimeError):
+        gapic_plugin.main(request_data)
+    assert response_cache.stats()[cache_dir]['entries'] == 0
+    assert [name for _, _, names in os.walk(cache_dir) for name in names
+            if name.startswith('.tmp')] == []
@@ -0,0 +1,52 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+
+import pytest
+from google.protobuf.compiler import plugin_pb2 as plugin
+
+from plugin.utils import response_writer
+
+
+@pytest.mark.parametrize('value', [0, 1, 127, 128, 300, 2 ** 32, 2 ** 63])
+def test_encode_varint(value):
+    response = plugin.CodeGeneratorResponse(supported_features=value)
+    assert response.SerializeToString() == \
+        b'\x10' + response_writer.encode_varint(value)
+
+
+def test_response_writer():
+    files = [
+        ('com/example/Empty.java', ''),
+        ('com/example/Small.java', 'class Small {}\n'),
+        ('com/example/Large.java', 'x' * 100000),
+        ('com/example/Unicode.java', u'// é中\n'),
+    ]
+    stream = io.BytesIO()
+    writer = response_writer.ResponseWriter(stream)
+    for name, content in files:
+        writer.add_file(name, content)
+    writer.set_supported_features(
+        plugin.CodeGeneratorResponse.FEATURE_PROTO3_OPTIONAL)
+    assert writer.file_count == len(files)
+
+    expected = plugin.CodeGeneratorResponse(
+        supported_features=plugin.CodeGeneratorResponse
+        .FEATURE_PROTO3_OPTIONAL)
+    for name, content in files:
+        expected.file.add(name=name, content=content)
+    actual = plugin.CodeGeneratorResponse()
+    actual.ParseFromString(stream.getvalue())
+    assert actual == expected
@@ -0,0 +1,66 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Checks which modules the plugin imports, in a fresh interpreter."""
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules that only some requests or options need.
+LAZY_MODULES = ['yaml', 'chevron', 'ply', 'multiprocessing', 'json',
+                'tempfile', 'plugin.utils.disk_cache',
+                'plugin.utils.response_cache']
+
+_SCRIPT = '''
+import sys
+from google.protobuf.compiler import plugin_pb2
+
+request = plugin_pb2.CodeGeneratorRequest(
+    file_to_generate=['a.proto'], parameter=sys.argv[1])
+proto_file = request.proto_file.add(name='a.proto', package='a')
+proto_file.options.java_package = 'com.example.a'
+
+loaded = set(sys.modules)
+from plugin.cli import gapic_plugin
+gapic_plugin.main(request.SerializeToString())
+print(' '.join(sorted(m for m in {} if m in sys.modules and m not in loaded)))
+'''.format(LAZY_MODULES)
+
+
+def _imported_lazy_modules(parameter):
+    output = subprocess.check_output(
+        [sys.executable, '-c', _SCRIPT, parameter])
+    return output.decode('utf-8').split()
+
+
+def test_request_without_options_imports_no_lazy_modules():
+    assert _imported_lazy_modules('') == []
+
+
+def test_gapic_yaml_imports_yaml(tmpdir):
+    gapic_yaml = tmpdir.join('gapic.yaml')
+    gapic_yaml.write('type: com.google.api.codegen.ConfigProto\n'
+                     'config_schema_version: 2.0.0\n')
+    assert _imported_lazy_modules(str(gapic_yaml)) == ['yaml']
+
+
+@pytest.mark.parametrize('parameter,module', [
+    ('render_workers=2', 'multiprocessing'),
+    ('render_cache_dir={tmpdir}', 'plugin.utils.disk_cache'),
+    ('response_cache_dir={tmpdir}', 'plugin.utils.response_cache'),
+])
+def test_options_import_their_modules(tmpdir, parameter, module):
+    parameter = parameter.format(tmpdir=tmpdir)
+    assert module in _imported_lazy_modules(parameter)
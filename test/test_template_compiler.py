@@ -0,0 +1,292 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Differential tests of the compiled templates against chevron."""
+
+import io
+import os
+import random
+
+import chevron
+import pytest
+
+from plugin.cli import gapic_plugin
+from plugin.templates import compiled_templates
+from plugin.templates import compiler
+from plugin.templates import registry
+from plugin.templates import runtime
+from plugin.utils import casing_utils
+from plugin.utils import gapic_utils
+
+KEYS = ['a', 'b', 'c', 'a.b', 'b.c', '.']
+SCHEMA = {
+    'a': str,
+    'b': [{'a': bool, 'c': str}],
+    'c': {'a': str, 'b': bool, 'c': [{'b': str}]},
+}
+TEST_DIR = os.path.join('test', 'testdata')
+BASELINE_CONFIGS = [
+    ('gapic', 'library_gapic.yaml', ['library_simple.proto', 'archive.proto']),
+    ('protoannotation', 'library_gapic_v2.yaml',
+     ['common_resources.proto', 'library_simple.proto', 'archive.proto']),
+]
+BASELINES = sorted(
+    os.path.join(baseline_dir, name)
+    for baseline_dir, _, _ in BASELINE_CONFIGS
+    for name in os.listdir(os.path.join(TEST_DIR, baseline_dir))
+    if name.endswith('.baseline'))
+
+
+class _Object(object):
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _compile(text, schema=None):
+    namespace = {
+        'FallbackRequired': runtime.FallbackRequired,
+        'escape': runtime.escape,
+        'get_key': runtime.get_key,
+        'no_escape': runtime.no_escape,
+        'section': runtime.section,
+        'variable': runtime.variable,
+    }
+    exec(compiler.compile_template('test.mustache', text, schema),
+         namespace)
+    return namespace['render_test']
+
+
+def _random_template(rng, sections=()):
+    # Inverted sections never reuse the key of an enclosing section, which
+    # the compiler rejects.
+    depth = len(sections)
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        choice = rng.randint(0, 5 if depth < 3 else 2)
+        if choice == 0:
+            parts.append(rng.choice(['x', ' & ', '\n', '<"y">', '']))
+        elif choice == 1:
+            parts.append('{{%s}}' % rng.choice(KEYS))
+        elif choice == 2:
+            parts.append('{{{%s}}}' % rng.choice(KEYS))
+        else:
+            tag = '^' if choice == 5 else '#'
+            key = rng.choice([k for k in KEYS[:-1]
+                              if tag == '#' or k not in sections])
+            parts.append('{{%s%s}}%s{{/%s}}' % (
+                tag, key, _random_template(rng, sections + (key,)), key))
+    return ''.join(parts)
+
+
+def _random_value(rng, depth=0):
+    choice = rng.randint(0, 9 if depth < 3 else 5)
+    if choice == 0:
+        return rng.choice([0, 1, 2.5])
+    if choice == 1:
+        return rng.choice([True, False, None])
+    if choice in (2, 3):
+        return rng.choice(['', 'text', '<a & "b">'])
+    if choice in (4, 5):
+        return rng.choice([[], {}])
+    if choice in (6, 7):
+        return [_random_value(rng, depth + 1)
+                for _ in range(rng.randint(1, 3))]
+    values = dict((key, _random_value(rng, depth + 1))
+                  for key in KEYS[:3] if rng.random() < 0.6)
+    return values if choice == 8 else _Object(**values)
+
+
+def _random_context(rng, schema):
+    context = {}
+    for key, value_type in schema.items():
+        if value_type is str:
+            context[key] = rng.choice(['', 'text', '<a & "b">'])
+        elif value_type is bool:
+            context[key] = rng.choice([True, False])
+        elif isinstance(value_type, list):
+            context[key] = [_random_context(rng, value_type[0])
+                            for _ in range(rng.randint(0, 3))]
+        else:
+            context[key] = _random_context(rng, value_type)
+    return context
+
+
+def _check_schema(value, value_type):
+    if isinstance(value_type, list):
+        assert isinstance(value, list)
+        for item in value:
+            _check_schema(item, value_type[0])
+    elif isinstance(value_type, dict):
+        assert type(value) is dict
+        assert sorted(value) == sorted(value_type)
+        for key, item in value.items():
+            _check_schema(item, value_type[key])
+    else:
+        assert type(value) is value_type
+
+
+@pytest.fixture(scope='module')
+def baseline_resources(build_request):
+    """Maps each baseline file to the model of the class generated for it."""
+    resources = {}
+    for baseline_dir, gapic_yaml, proto_files in BASELINE_CONFIGS:
+        request = build_request(os.path.join(TEST_DIR, gapic_yaml),
+                                proto_files)
+        gapic_config = gapic_utils.read_from_gapic_yaml(request)
+        for java_package in gapic_plugin.resolve_java_package_names(request):
+            for resource in gapic_utils.collect_resource_name_types(
+                    gapic_config, java_package):
+                class_name = os.path.basename(resource.filename())[:-5]
+                baseline = 'java_{}.baseline'.format(
+                    casing_utils.to_snake(class_name))
+                resources[os.path.join(baseline_dir, baseline)] = resource
+    return resources
+
+
+def test_compiled_templates_up_to_date():
+    with io.open(compiler.COMPILED_MODULE, 'r', encoding='utf-8') as f:
+        assert f.read() == compiler.generate_module(), \
+            'run python -m plugin.templates.compiler'
+
+
+def test_compiled_templates_match_chevron(load_template_resources):
+    resources = load_template_resources()
+    template_registry = registry.TemplateRegistry()
+    rendered = set()
+    for resource in resources:
+        name = os.path.basename(resource.template_path())
+        with open(resource.template_path()) as f:
+            expected = chevron.render(f, resource)
+        assert compiled_templates.RENDERERS[name](
+            resource.render_context()) == expected
+        # Compiled templates leave data other than dicts to chevron.
+        with pytest.raises(runtime.FallbackRequired):
+            compiled_templates.RENDERERS[name](resource)
+        assert template_registry.render(resource.template_path(),
+                                        resource) == expected
+        rendered.add(name)
+    assert len(rendered) >= 4
+
+
+def test_context_schemas_match_render_contexts(baseline_resources):
+    for resource in baseline_resources.values():
+        name = os.path.basename(resource.template_path())
+        _check_schema(resource.render_context(),
+                      compiler.CONTEXT_SCHEMAS[name])
+    assert set(compiler.CONTEXT_SCHEMAS) == set(compiled_templates.RENDERERS)
+
+
+@pytest.mark.parametrize('baseline', BASELINES)
+def test_compiled_templates_match_baseline(baseline_resources, baseline):
+    resource = baseline_resources.get(baseline)
+    if resource is None:
+        pytest.skip('no class is generated for ' + baseline)
+    name = os.path.basename(resource.template_path())
+    with io.open(os.path.join(TEST_DIR, baseline), encoding='utf-8') as f:
+        expected = f.read()
+    assert compiled_templates.RENDERERS[name](
+        resource.render_context()) == expected
+
+
+def test_random_templates_match_chevron():
+    rng = random.Random(20260113)
+    for _ in range(2000):
+        text = _random_template(rng)
+        render = _compile(text)
+        for _ in range(5):
+            data = dict((key, _random_value(rng)) for key in KEYS[:3]
+                        if rng.random() < 0.8)
+            assert render(data) == chevron.render(text, data), \
+                'compiled template differs for {!r} with {!r}'.format(
+                    text, data)
+
+
+def test_random_templates_with_schema_match_chevron():
+    rng = random.Random(20261017)
+    for _ in range(2000):
+        text = _random_template(rng)
+        render = _compile(text, SCHEMA)
+        for _ in range(5):
+            data = _random_context(rng, SCHEMA)
+            assert render(data) == chevron.render(text, data), \
+                'compiled template differs for {!r} with {!r}'.format(
+                    text, data)
+
+
+def test_compile_known_keys_to_direct_lookups():
+    source = compiler.compile_template(
+        'test.mustache',
+        '{{#b}}{{c}}{{a}}{{^a}}{{d}}{{/a}}{{/b}}{{#c.c}}{{{b}}}{{/c.c}}',
+        SCHEMA)
+    assert "for scope1 in data['b']:" in source
+    assert "append(escape(scope1['c']))" in source
+    assert "append(escape(scope1['a']))" in source
+    assert "if not scope1['a']:" in source
+    assert "for scope1 in data['c']['c']:" in source
+    assert "append(scope1['b'])" in source
+    # d is in no schema, so it is looked up through the scopes.
+    assert "variable([True, scope1, data], 'd', ('d',))" in source
+
+
+@pytest.mark.parametrize('text', [
+    '{{> partial}}',
+    '{{=<% %>=}}',
+    '{{#a}}{{^a}}x{{/a}}{{/a}}',
+])
+def test_compile_unsupported_template(text):
+    with pytest.raises(ValueError):
+        compiler.compile_template('test.mustache', text)
+
+
+def test_registry_uses_compiled_templates(monkeypatch,
+                                          load_template_resources):
+    template_registry = registry.TemplateRegistry()
+    resource = load_template_resources()[0]
+    name = os.path.basename(resource.template_path())
+    calls = []
+
+    def render_compiled(data):
+        calls.append(data)
+        return 'compiled'
+
+    monkeypatch.setitem(compiled_templates.RENDERERS, name, render_compiled)
+    assert template_registry.render(resource.template_path(), resource) == \
+        'compiled'
+    assert calls == [resource]
+
+    template_registry = registry.TemplateRegistry(use_compiled=False)
+    assert template_registry.render(resource.template_path(), resource) != \
+        'compiled'
+
+
+def test_registry_falls_back_for_stale_template(tmpdir, monkeypatch):
+    name = 'resource_name_fixed.mustache'
+    path = tmpdir.join(name)
+    path.write('changed {{class_name}}')
+    monkeypatch.setitem(compiled_templates.RENDERERS, name, None)
+    template_registry = registry.TemplateRegistry(str(tmpdir))
+    assert template_registry.get_compiled(str(path)) is None
+    assert template_registry.render(str(path), {'class_name': 'Book'}) == \
+        'changed Book'
+
+
+def test_registry_falls_back_for_lambda(tmpdir):
+    text = '{{#wrap}}{{name}}{{/wrap}}'
+    name = 'lambda_test.mustache'
+    path = tmpdir.join(name)
+    path.write(text)
+    template_registry = registry.TemplateRegistry(str(tmpdir))
+    template_registry._compiled[str(path)] = _compile(text)
+    data = {'name': 'Book', 'wrap': lambda text, render: render(text) + '!'}
+    assert template_registry.render(str(path), data) == 'Book!'
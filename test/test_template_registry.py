@@ -0,0 +1,97 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+
+import chevron
+
+from plugin.templates import registry
+from plugin.utils.disk_cache import DiskCache
+
+
+def test_preload():
+    template_registry = registry.TemplateRegistry()
+    template_registry.preload()
+    assert [path[len(registry.TEMPLATE_DIR) + 1:]
+            for path in template_registry.loaded_templates()] == [
+        'deprecated_parent_resource_name.mustache',
+        'multi_pattern_resource_name.mustache',
+        'resource_name.mustache',
+        'resource_name_factory.mustache',
+        'resource_name_fixed.mustache',
+        'untyped_resource_name.mustache',
+    ]
+
+
+def test_render_matches_chevron(monkeypatch, load_template_resources):
+    template_registry = registry.TemplateRegistry()
+    resources = load_template_resources()
+    expected = []
+    for resource in resources:
+        with open(resource.template_path()) as f:
+            expected.append(chevron.render(f, resource))
+    template_registry.preload()
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError('template read again')
+
+    monkeypatch.setattr(registry.io, 'open', fail_open)
+    for _ in range(2):
+        assert [template_registry.render(r.template_path(), r)
+                for r in resources] == expected
+
+
+def test_render_all_in_pool(load_template_resources):
+    resources = load_template_resources()
+    pool = multiprocessing.Pool(2)
+    try:
+        assert list(registry.render_all(resources, pool)) == \
+            [registry.render(r) for r in resources]
+    finally:
+        pool.close()
+        pool.join()
+
+
+def test_render_context(load_template_resources):
+    for resource in load_template_resources():
+        context = resource.render_context()
+        assert context is resource.render_context()
+        with open(resource.template_path()) as f:
+            template = f.read()
+        assert chevron.render(template, context) == \
+            chevron.render(template, resource)
+
+
+def test_render_all_with_cache(tmpdir, monkeypatch, load_template_resources):
+    resources = load_template_resources()
+    expected = [registry.render(r) for r in resources]
+    cache = DiskCache(str(tmpdir), 1 << 20)
+    assert list(registry.render_all(resources, cache=cache)) == expected
+    assert (cache.hits, cache.misses) == (0, len(resources))
+
+    def fail_render(resource):
+        raise AssertionError('rendered a cached model')
+
+    monkeypatch.setattr(registry, 'render', fail_render)
+    assert list(registry.render_all(resources, cache=cache)) == expected
+    assert cache.hits == len(resources)
+
+
+def test_render_key(load_template_resources):
+    resources = load_template_resources()
+    keys = [registry.render_key(r) for r in resources]
+    assert len(set(keys)) == len(resources)
+    assert keys == [registry.render_key(r) for r in load_template_resources()]
+    moved = resources[0].with_package('com.google.example.other')
+    assert registry.render_key(moved) != keys[0]
@@ -0,0 +1,152 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from google.protobuf import descriptor_pb2
+
+from plugin.cli import validate_patterns
+from plugin.pb2 import resource_pb2
+
+
+def _write_descriptor_set(path, resources, child_types=()):
+    file_set = descriptor_pb2.FileDescriptorSet()
+    proto_file = file_set.file.add(name='library.proto')
+    definitions = proto_file.options.Extensions[
+        resource_pb2.resource_definition]
+    for resource_type, patterns in resources:
+        definitions.add(type=resource_type, pattern=patterns)
+    message = proto_file.message_type.add(name='ListRequest')
+    for number, child_type in enumerate(child_types, 1):
+        field = message.field.add(name='parent%d' % number, number=number)
+        field.options.Extensions[
+            resource_pb2.resource_reference].child_type = child_type
+    path.write_binary(file_set.SerializeToString())
+
+
+@pytest.fixture
+def inputs(tmpdir):
+    _write_descriptor_set(tmpdir.join('good.desc'), [
+        ('test/Shelf', ['shelves/{shelf}']),
+        ('test/Book', ['shelves/{shelf}/books/{book}']),
+    ])
+    _write_descriptor_set(tmpdir.mkdir('nested').join('bad.desc'), [
+        ('test/Shelf', ['shelves/{shelf']),
+        ('test/Book', ['shelves/{shelf}/books/{book}{edition}',
+                       'shelves/{shelf}/books/{book=shelves/*}']),
+        ('test/Page', ['archives/{archive}/pages/{page}']),
+    ], child_types=['test/Page'])
+    tmpdir.join('gapic.yaml').write(
+        'collections:\n'
+        '  - name_pattern: projects/{project}\n'
+        '    entity_name: project\n'
+        'interfaces:\n'
+        '  - collections:\n'
+        '      - name_pattern: projects/{project/topics\n'
+        '        entity_name: topic\n')
+    tmpdir.join('notes.txt').write('not an input')
+    return tmpdir
+
+
+def test_find_inputs(inputs):
+    paths = validate_patterns.find_inputs([str(inputs)])
+    assert [p[len(str(inputs)) + 1:] for p in paths] == [
+        'gapic.yaml', 'good.desc', 'nested/bad.desc']
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_validate_files(inputs, jobs):
+    paths = validate_patterns.find_inputs([str(inputs)])
+    pattern_count, problems = validate_patterns.validate_files(
+        paths, jobs=jobs, chunk_size=1)
+    assert pattern_count == 8
+    assert [(p['kind'], p['resource'], p['pattern'])
+            for p in problems] == [
+        ('parse', 'topic', 'projects/{project/topics'),
+        ('parse', 'test/Shelf', 'shelves/{shelf'),
+        ('parse', 'test/Book', 'shelves/{shelf}/books/{book}{edition}'),
+        ('braces', 'test/Book', 'shelves/{shelf}/books/{book=shelves/*}'),
+        ('parent', 'test/Page', None),
+    ]
+
+
+def test_load_failure(tmpdir):
+    tmpdir.join('broken.desc').write_binary(b'\xff\xff')
+    _, problems = validate_patterns.validate_file(
+        str(tmpdir.join('broken.desc')))
+    assert [p['kind'] for p in problems] == ['load']
+
+
+def test_parents_covered_for_child_types_only(tmpdir):
+    resources = [
+        ('test/Page', ['archives/{archive}/pages/{page}']),
+        ('test/Note', ['notebooks/{notebook}/notes/{note}']),
+        ('test/Notebook', ['notebooks/{notebook}']),
+    ]
+    _write_descriptor_set(tmpdir.join('library.desc'), resources)
+    assert validate_patterns.validate_file(
+        str(tmpdir.join('library.desc'))) == (3, [])
+
+    _write_descriptor_set(tmpdir.join('library.desc'), resources,
+                          child_types=['test/Page', 'test/Note'])
+    _, problems = validate_patterns.validate_file(
+        str(tmpdir.join('library.desc')))
+    assert [(p['kind'], p['resource']) for p in problems] == [
+        ('parent', 'test/Page')]
+
+
+def test_derived_parents_checked_for_all_patterns(tmpdir):
+    _write_descriptor_set(tmpdir.join('library.desc'), [
+        ('test/Book', ['shelves/{shelf=a/*}/books/{book}']),
+    ])
+    _, problems = validate_patterns.validate_file(
+        str(tmpdir.join('library.desc')))
+    assert [(p['kind'], p['resource']) for p in problems] == [
+        ('parent', 'test/Book')]
+    assert 'invalid parent pattern' in problems[0]['message']
+
+
+def test_overlaps(tmpdir):
+    _write_descriptor_set(tmpdir.join('overlap.desc'), [
+        ('test/Shelf', ['shelves/{shelf}']),
+        ('test/Book', ['shelves/{shelf}/books/{book=**}',
+                       'shelves/{shelf}/books/{book}']),
+        ('test/DefaultBook', ['shelves/default/books/{book}']),
+    ])
+    _, problems = validate_patterns.validate_file(
+        str(tmpdir.join('overlap.desc')), overlaps=True)
+    assert [(p['kind'], p['pattern']) for p in problems] == [
+        ('shadowed', 'shelves/{shelf}/books/{book}'),
+        ('overlap', 'shelves/{shelf}/books/{book=**}'),
+        ('overlap', 'shelves/{shelf}/books/{book}'),
+    ]
+
+
+def test_main_json_report(inputs, capsys):
+    assert validate_patterns.main(
+        ['--jobs', '1', '--format', 'json', str(inputs.join('good.desc'))]
+    ) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report == {'files': 1, 'patterns': 2, 'problems': []}
+
+
+def test_main_text_report(inputs, capsys):
+    assert validate_patterns.main(['--jobs', '2', str(inputs)]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[-1] == '5 problem(s) in 8 pattern(s) from 3 file(s)'
+    assert lines[0].endswith(
+        'gapic.yaml: parse: topic projects/{project/topics: '
+        'parser error: unexpected token \'FORWARD_SLASH\'')
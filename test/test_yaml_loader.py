@@ -0,0 +1,65 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import glob
+import os
+
+import pytest
+import yaml
+
+from plugin.utils import yaml_loader
+from plugin.utils.disk_cache import DiskCache
+
+GAPIC_YAMLS = sorted(glob.glob(os.path.join('test', 'testdata', '*.yaml')))
+
+
+@pytest.mark.parametrize('path', GAPIC_YAMLS)
+def test_load_file_matches_pure_python_loader(path):
+    with open(path) as f:
+        expected = yaml.load(f, Loader=yaml.SafeLoader)
+    assert yaml_loader.load_file(path) == expected
+
+
+def test_load_file_cached(tmpdir):
+    path = GAPIC_YAMLS[0]
+    cache = DiskCache(str(tmpdir.join('cache')), yaml_loader.CACHE_MAX_BYTES)
+    parsed = yaml_loader.load_file(path)
+    assert yaml_loader.load_file(path, cache) == parsed
+    assert yaml_loader.load_file(path, cache) == parsed
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_load_file_replaces_corrupt_entry(tmpdir):
+    path = tmpdir.join('gapic.yaml')
+    path.write('collections:\n  - entity_name: shelf\n')
+    cache = DiskCache(str(tmpdir.join('cache')), yaml_loader.CACHE_MAX_BYTES)
+    key = yaml_loader.cache_key(path.read_binary())
+    cache.put_bytes(key, b'\xff')
+    expected = {'collections': [{'entity_name': 'shelf'}]}
+    assert yaml_loader.load_file(str(path), cache) == expected
+    assert yaml_loader.load_file(str(path), cache) == expected
+    assert cache.get_bytes(key) != b'\xff'
+
+
+def test_load_file_skips_unmarshallable_values(tmpdir):
+    path = tmpdir.join('gapic.yaml')
+    path.write('updated: 2026-01-01 10:00:00\n')
+    cache = DiskCache(str(tmpdir.join('cache')), yaml_loader.CACHE_MAX_BYTES)
+    assert yaml_loader.load_file(str(path), cache)['updated'].year == 2026
+    assert cache.get_bytes(yaml_loader.cache_key(path.read_binary())) is None
+
+
+def test_cache_key_depends_on_contents():
+    assert yaml_loader.cache_key(b'a: 1') == yaml_loader.cache_key(b'a: 1')
+    assert yaml_loader.cache_key(b'a: 1') != yaml_loader.cache_key(b'a: 2')